@@ -0,0 +1,39 @@
+"""trigram search indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm only exists on PostgreSQL; other dialects use the LIKE fallback in app/db/search.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.execute('CREATE INDEX ix_inventory_items_name_trgm ON inventory_items USING gin (name gin_trgm_ops)')
+    op.execute('CREATE INDEX ix_inventory_items_brand_trgm ON inventory_items USING gin (brand gin_trgm_ops)')
+    op.execute('CREATE INDEX ix_inventory_items_name_lower ON inventory_items (lower(name) text_pattern_ops)')
+    op.execute('CREATE INDEX ix_products_name_trgm ON products USING gin (name gin_trgm_ops)')
+    op.execute('CREATE INDEX ix_products_name_lower ON products (lower(name) text_pattern_ops)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_products_name_lower', table_name='products')
+    op.drop_index('ix_products_name_trgm', table_name='products')
+    op.drop_index('ix_inventory_items_name_lower', table_name='inventory_items')
+    op.drop_index('ix_inventory_items_brand_trgm', table_name='inventory_items')
+    op.drop_index('ix_inventory_items_name_trgm', table_name='inventory_items')
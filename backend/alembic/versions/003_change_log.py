@@ -0,0 +1,37 @@
+"""change log for delta sync
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-02-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'change_log',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_change_log_household_id_id', 'change_log', ['household_id', 'id'], unique=False)
+    op.create_index('ix_change_log_entity', 'change_log', ['entity_type', 'entity_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_entity', table_name='change_log')
+    op.drop_index('ix_change_log_household_id_id', table_name='change_log')
+    op.drop_table('change_log')
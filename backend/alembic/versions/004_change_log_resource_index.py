@@ -0,0 +1,23 @@
+"""change log per-resource version index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves MAX(id) per (household, resource) lookups for ETags
+    op.create_index('ix_change_log_household_entity', 'change_log', ['household_id', 'entity_type', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_household_entity', table_name='change_log')
@@ -0,0 +1,25 @@
+"""undo history index and grouped actions
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-02-22 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_actions', sa.Column('is_group', sa.Boolean(), server_default=sa.text('false'), nullable=True))
+    op.create_index('ix_user_actions_user_id_created_at', 'user_actions', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_actions_user_id_created_at', table_name='user_actions')
+    op.drop_column('user_actions', 'is_group')
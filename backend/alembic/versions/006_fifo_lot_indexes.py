@@ -0,0 +1,35 @@
+"""fifo lot lookup indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-02-26 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_inventory_items_household_name_expiration',
+        'inventory_items',
+        ['household_id', sa.text('lower(name)'), 'expiration_date'],
+        unique=False
+    )
+    op.create_index(
+        'ix_inventory_items_household_barcode_expiration',
+        'inventory_items',
+        ['household_id', 'barcode', 'expiration_date'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_items_household_barcode_expiration', table_name='inventory_items')
+    op.drop_index('ix_inventory_items_household_name_expiration', table_name='inventory_items')
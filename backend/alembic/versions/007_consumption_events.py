@@ -0,0 +1,49 @@
+"""consumption events and consumed item state
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-03-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('inventory_items', sa.Column('is_consumed', sa.Boolean(), server_default=sa.text('false'), nullable=True))
+    op.add_column('inventory_items', sa.Column('consumed_date', sa.DateTime(timezone=True), nullable=True))
+
+    # itemcategory and unittype already exist (001)
+    op.create_table(
+        'consumption_events',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('barcode', sa.String(), nullable=True),
+        sa.Column('category', postgresql.ENUM(name='itemcategory', create_type=False), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('unit', postgresql.ENUM(name='unittype', create_type=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_consumption_events_household_created_at', 'consumption_events', ['household_id', 'created_at'], unique=False)
+    op.create_index('ix_consumption_events_item_id', 'consumption_events', ['item_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_consumption_events_item_id', table_name='consumption_events')
+    op.drop_index('ix_consumption_events_household_created_at', table_name='consumption_events')
+    op.drop_table('consumption_events')
+    op.drop_column('inventory_items', 'consumed_date')
+    op.drop_column('inventory_items', 'is_consumed')
@@ -0,0 +1,78 @@
+"""inventory item history (cold tier) and live-stock index
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-03-05 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # itemcategory and unittype already exist (001)
+    op.create_table(
+        'inventory_item_history',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('retired_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('category', postgresql.ENUM(name='itemcategory', create_type=False), nullable=False),
+        sa.Column('barcode', sa.String(), nullable=True),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('unit', postgresql.ENUM(name='unittype', create_type=False), nullable=False),
+        sa.Column('original_quantity', sa.Float(), nullable=True),
+        sa.Column('purchase_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expiration_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('opened_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('location_id', sa.Integer(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=True),
+        sa.Column('currency', sa.String(), nullable=True),
+        sa.Column('is_opened', sa.Boolean(), nullable=True),
+        sa.Column('is_wasted', sa.Boolean(), nullable=True),
+        sa.Column('waste_reason', sa.String(), nullable=True),
+        sa.Column('wasted_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('is_consumed', sa.Boolean(), nullable=True),
+        sa.Column('consumed_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('brand', sa.String(), nullable=True),
+        sa.Column('store', sa.String(), nullable=True),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('added_by', sa.Integer(), nullable=True),
+        sa.Column('receipt_id', sa.Integer(), nullable=True),
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id', 'retired_at'),
+        postgresql_partition_by='RANGE (retired_at)'
+    )
+    op.create_index('ix_inventory_item_history_household_retired_at', 'inventory_item_history', ['household_id', 'retired_at'], unique=False)
+    op.create_index('ix_inventory_item_history_household_purchase_date', 'inventory_item_history', ['household_id', 'purchase_date'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Catch-all for years without a partition (see app/db/archive.py)
+        op.execute('CREATE TABLE inventory_item_history_default PARTITION OF inventory_item_history DEFAULT')
+
+    op.create_index(
+        'ix_inventory_items_live',
+        'inventory_items',
+        ['household_id', 'expiration_date'],
+        unique=False,
+        postgresql_where=sa.text('is_wasted = false AND is_consumed = false'),
+        sqlite_where=sa.text('is_wasted = 0 AND is_consumed = 0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_items_live', table_name='inventory_items')
+    op.drop_index('ix_inventory_item_history_household_purchase_date', table_name='inventory_item_history')
+    op.drop_index('ix_inventory_item_history_household_retired_at', table_name='inventory_item_history')
+    # Drops the partitions with it on PostgreSQL
+    op.drop_table('inventory_item_history')
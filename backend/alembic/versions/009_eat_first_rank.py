@@ -0,0 +1,106 @@
+"""eat first rank on inventory items
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-03-08 00:00:00.000000
+
+"""
+from datetime import datetime, timedelta, timezone
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Frozen copy of app/services/eat_first.py as of this revision, so later
+# changes to the app cannot change what this migration writes.
+# Category member name -> (days unopened without expiration date, days once opened)
+SHELF_LIFE_DAYS = {
+    'PRODUCE': (7, 5),
+    'DAIRY': (10, 7),
+    'MEAT': (4, 3),
+    'SEAFOOD': (2, 2),
+    'BAKERY': (5, 4),
+    'FROZEN': (180, 90),
+    'CANNED': (730, 4),
+    'DRY_GOODS': (365, 90),
+    'BEVERAGES': (180, 7),
+    'SNACKS': (90, 14),
+    'CONDIMENTS': (180, 60),
+    'SPICES': (730, 365),
+    'OTHER': (30, 14),
+}
+
+
+def _utc(value):
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _eat_by(category, expiration_date, purchase_date, opened_date):
+    shelf_life, opened_shelf_life = SHELF_LIFE_DAYS[category]
+    expiration_date, purchase_date, opened_date = _utc(expiration_date), _utc(purchase_date), _utc(opened_date)
+
+    if expiration_date is None:
+        expiration_date = (purchase_date or datetime.utcnow()) + timedelta(days=shelf_life)
+    if opened_date is not None:
+        return min(expiration_date, opened_date + timedelta(days=opened_shelf_life))
+    return expiration_date
+
+
+def upgrade() -> None:
+    op.add_column('inventory_items', sa.Column('eat_by', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill live items; new writes maintain the column (app/db/eat_first.py)
+    bind = op.get_bind()
+    items = sa.table(
+        'inventory_items',
+        sa.column('id', sa.Integer()),
+        sa.column('category', sa.String()),
+        sa.column('expiration_date', sa.DateTime(timezone=True)),
+        sa.column('purchase_date', sa.DateTime(timezone=True)),
+        sa.column('opened_date', sa.DateTime(timezone=True)),
+        sa.column('eat_by', sa.DateTime(timezone=True)),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(items.c.id, items.c.category, items.c.expiration_date, items.c.purchase_date, items.c.opened_date)
+            .where(items.c.id > last_id)
+            .order_by(items.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            items.update().where(items.c.id == sa.bindparam('item_id')),
+            [
+                {
+                    'item_id': row.id,
+                    # Enum columns store member names (e.g. DAIRY)
+                    'eat_by': _eat_by(row.category, row.expiration_date, row.purchase_date, row.opened_date),
+                }
+                for row in rows
+            ]
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_inventory_items_eat_first',
+        'inventory_items',
+        ['household_id', 'eat_by', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_wasted = false AND is_consumed = false'),
+        sqlite_where=sa.text('is_wasted = 0 AND is_consumed = 0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_items_eat_first', table_name='inventory_items')
+    op.drop_column('inventory_items', 'eat_by')
@@ -0,0 +1,25 @@
+"""product density and each-weight for unit conversion
+
+Revision ID: 010
+Revises: 009
+Create Date: 2024-03-12 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('density_g_per_ml', sa.Float(), nullable=True))
+    op.add_column('products', sa.Column('each_weight_g', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'each_weight_g')
+    op.drop_column('products', 'density_g_per_ml')
@@ -0,0 +1,40 @@
+"""daily analytics rollups
+
+Revision ID: 012
+Revises: 011
+Create Date: 2024-03-18 00:00:00.000000
+
+Existing data is not rolled up here; run `python -m app.jobs.rebuild_rollups`
+after upgrading.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # itemcategory already exists (001)
+    op.create_table(
+        'daily_rollups',
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', postgresql.ENUM(name='itemcategory', create_type=False), nullable=False),
+        sa.Column('spend', sa.Float(), server_default=sa.text('0'), nullable=False),
+        sa.Column('items_added', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('waste_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('waste_value', sa.Float(), server_default=sa.text('0'), nullable=False),
+        sa.Column('consumed_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ),
+        sa.PrimaryKeyConstraint('household_id', 'day', 'category')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_rollups')
@@ -0,0 +1,23 @@
+"""household time zone
+
+Revision ID: 013
+Revises: 012
+Create Date: 2024-03-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('households', sa.Column('timezone', sa.String(), server_default='UTC', nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('households', 'timezone')
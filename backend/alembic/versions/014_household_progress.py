@@ -0,0 +1,39 @@
+"""household streak and badge progress
+
+Revision ID: 014
+Revises: 013
+Create Date: 2024-03-22 00:00:00.000000
+
+Existing history is not replayed here; run `python -m app.jobs.replay_progress`
+after `python -m app.jobs.rebuild_rollups`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'household_progress',
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('first_day', sa.Date(), nullable=True),
+        sa.Column('last_waste_day', sa.Date(), nullable=True),
+        sa.Column('longest_streak', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('items_added', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('items_consumed', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('items_wasted', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('badges', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ),
+        sa.PrimaryKeyConstraint('household_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('household_progress')
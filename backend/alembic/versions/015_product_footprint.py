@@ -0,0 +1,25 @@
+"""product environmental footprint
+
+Revision ID: 015
+Revises: 014
+Create Date: 2024-03-25 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('co2e_kg_per_kg', sa.Float(), nullable=True))
+    op.add_column('products', sa.Column('water_l_per_kg', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'water_l_per_kg')
+    op.drop_column('products', 'co2e_kg_per_kg')
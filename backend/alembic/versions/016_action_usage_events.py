@@ -0,0 +1,23 @@
+"""link undo actions to their usage events
+
+Revision ID: 016
+Revises: 015
+Create Date: 2024-03-28 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_actions', sa.Column('usage_event_ids', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user_actions', 'usage_event_ids')
@@ -0,0 +1,25 @@
+"""mark undone actions cleared from the redo stack
+
+Revision ID: 017
+Revises: 016
+Create Date: 2024-03-29 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_actions', sa.Column('is_superseded', sa.Boolean(), server_default=sa.text('false'), nullable=True))
+    # Which undone actions were still redoable is not recorded; start every redo stack empty
+    op.execute("UPDATE user_actions SET is_superseded = true WHERE is_undone = true")
+
+
+def downgrade() -> None:
+    op.drop_column('user_actions', 'is_superseded')
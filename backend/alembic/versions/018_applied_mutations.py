@@ -0,0 +1,33 @@
+"""applied offline mutations for idempotent sync pushes
+
+Revision ID: 018
+Revises: 017
+Create Date: 2024-04-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'applied_mutations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('household_id', 'client_id', name='uq_applied_mutations_household_client')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('applied_mutations')
@@ -0,0 +1,26 @@
+"""mark household progress for replay instead of replaying on write
+
+Revision ID: 019
+Revises: 018
+Create Date: 2024-04-02 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '019'
+down_revision = '018'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'household_progress',
+        sa.Column('needs_replay', sa.Boolean(), server_default=sa.text('false'), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('household_progress', 'needs_replay')
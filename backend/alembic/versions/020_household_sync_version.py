@@ -0,0 +1,49 @@
+"""per-household sync versions for the change log
+
+Revision ID: 020
+Revises: 019
+Create Date: 2024-04-03 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '020'
+down_revision = '019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('households', sa.Column('sync_version', sa.BigInteger(), server_default=sa.text('0'), nullable=False))
+    op.add_column('change_log', sa.Column('version', sa.BigInteger(), nullable=True))
+
+    # Existing ids are unique and increasing within a household, so clients'
+    # cursors stay valid; new versions continue after each household's last id
+    op.execute("UPDATE change_log SET version = id")
+    op.execute(
+        "UPDATE households SET sync_version = "
+        "(SELECT COALESCE(MAX(id), 0) FROM change_log WHERE change_log.household_id = households.id)"
+    )
+    op.alter_column('change_log', 'version', nullable=False)
+
+    op.drop_index('ix_change_log_household_id_id', table_name='change_log')
+    op.drop_index('ix_change_log_household_entity', table_name='change_log')
+    op.drop_index('ix_change_log_entity', table_name='change_log')
+    op.create_index('ix_change_log_household_version', 'change_log', ['household_id', 'version'], unique=True)
+    op.create_index(
+        'ix_change_log_household_entity_version', 'change_log', ['household_id', 'entity_type', 'version'], unique=False
+    )
+    op.create_index('ix_change_log_entity_version', 'change_log', ['entity_type', 'entity_id', 'version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_entity_version', table_name='change_log')
+    op.drop_index('ix_change_log_household_entity_version', table_name='change_log')
+    op.drop_index('ix_change_log_household_version', table_name='change_log')
+    op.create_index('ix_change_log_entity', 'change_log', ['entity_type', 'entity_id', 'id'], unique=False)
+    op.create_index('ix_change_log_household_entity', 'change_log', ['household_id', 'entity_type', 'id'], unique=False)
+    op.create_index('ix_change_log_household_id_id', 'change_log', ['household_id', 'id'], unique=False)
+    op.drop_column('change_log', 'version')
+    op.drop_column('households', 'sync_version')
@@ -0,0 +1,23 @@
+"""revision counter for lock-free household progress writes
+
+Revision ID: 021
+Revises: 020
+Create Date: 2024-04-04 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '021'
+down_revision = '020'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('household_progress', sa.Column('revision', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('household_progress', 'revision')
@@ -0,0 +1,42 @@
+"""indexes for the incremental Parquet export
+
+Revision ID: 022
+Revises: 021
+Create Date: 2024-04-05 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '022'
+down_revision = '021'
+branch_labels = None
+depends_on = None
+
+# (index, table, column)
+_INDEXES = [
+    ('ix_inventory_items_updated_at', 'inventory_items', 'updated_at'),
+    ('ix_inventory_items_created_at', 'inventory_items', 'created_at'),
+    ('ix_inventory_item_history_archived_at', 'inventory_item_history', 'archived_at'),
+    ('ix_receipts_updated_at', 'receipts', 'updated_at'),
+    ('ix_receipts_created_at', 'receipts', 'created_at'),
+    ('ix_receipt_line_items_created_at', 'receipt_line_items', 'created_at'),
+    ('ix_consumption_events_created_at', 'consumption_events', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    for name, table, column in _INDEXES:
+        op.create_index(name, table, [column], unique=False)
+    op.create_index(
+        'ix_change_log_deleted_at', 'change_log', ['created_at'], unique=False,
+        postgresql_where=sa.text("operation = 'delete'"),
+        sqlite_where=sa.text("operation = 'delete'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_deleted_at', table_name='change_log')
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,32 @@
+import functools
+import json
+from datetime import datetime
+from app.core.cache import cached_value
+
+
+def cached_response(endpoint: str, time_sensitive: bool = False):
+    """
+    Cache a household-scoped GET endpoint's result (see app/core/cache.py).
+
+    The key combines the household, the endpoint, its query parameters and
+    the current UTC day, or hour for time-sensitive endpoints, since ranges
+    and expiry windows are relative to now. Inventory and receipt writes
+    invalidate the household's entries. The endpoint must take `db` and
+    `current_user` keyword arguments and return JSON-serializable data.
+    """
+    bucket_format = "%Y%m%d%H" if time_sensitive else "%Y%m%d"
+
+    def decorator(endpoint_func):
+        @functools.wraps(endpoint_func)
+        def wrapper(*args, **kwargs):
+            household_id = kwargs["current_user"].household_id
+            params = {name: value for name, value in kwargs.items() if name not in ("db", "current_user")}
+            key = ":".join([
+                endpoint,
+                datetime.utcnow().strftime(bucket_format),
+                json.dumps(params, sort_keys=True, default=str)
+            ])
+            return cached_value(household_id, key, lambda: endpoint_func(*args, **kwargs))
+        return wrapper
+
+    return decorator
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.db.undo import UndoConflict, undo_last, redo_last, action_entity_ids
+from app.api.deps import get_current_active_user
+from app.models.user import User
+from app.models.inventory import UserAction
+from app.schemas.action import UserActionResponse
+
+router = APIRouter()
+
+
+def _action_response(action: UserAction) -> dict:
+    return {
+        "id": action.id,
+        "action_type": action.action_type,
+        "entity_type": action.entity_type,
+        "entity_ids": action_entity_ids(action),
+        "is_undone": action.is_undone,
+        "created_at": action.created_at,
+    }
+
+
+@router.post("/undo", response_model=UserActionResponse)
+def undo_action(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Undo the current user's most recent action."""
+    try:
+        action = undo_last(db, current_user.id)
+    except UndoConflict as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if action is None:
+        raise HTTPException(status_code=404, detail="Nothing to undo")
+
+    return _action_response(action)
+
+
+@router.post("/redo", response_model=UserActionResponse)
+def redo_action(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Redo the current user's most recently undone action."""
+    try:
+        action = redo_last(db, current_user.id)
+    except UndoConflict as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if action is None:
+        raise HTTPException(status_code=404, detail="Nothing to redo")
+
+    return _action_response(action)
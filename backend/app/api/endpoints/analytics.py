@@ -1,69 +1,98 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from sqlalchemy import func, literal, null, select, union_all
+from datetime import date, datetime, time, timedelta, timezone
 from app.db.session import get_db
+from app.db.archive import all_inventory_items
+from app.db.rollups import rollup_range
+from app.db.timeline import TimelineInterval, spending_by_category, spending_timeline
+from app.db.progress import get_progress
+from app.db.impact import household_impact
+from app.services.achievements import badge_progress, current_streak
 from app.api.deps import get_current_active_user
-from app.models.user import User
+from app.api.etag import conditional_get
+from app.api.cache import cached_response
+from app.core.cache import cache_stats, get_cache
+from app.models.user import User, StorageLocation
 from app.models.inventory import InventoryItem, ItemCategory
+from app.models.analytics import DailyRollup
 
 router = APIRouter()
 
 
 @router.get("/waste-stats")
+@cached_response("waste-stats")
 def get_waste_statistics(
     days: int = 30,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get waste statistics for the household."""
-    start_date = datetime.utcnow() - timedelta(days=days)
+    """
+    Get waste statistics for the household.
 
-    # Total wasted items
-    wasted_items = db.query(InventoryItem).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == True,
-        InventoryItem.wasted_date >= start_date
-    ).all()
+    Totals and the per-category breakdown come from the daily rollups; the
+    most wasted names and the reasons are not rolled up and come from the
+    wasted rows (live and archived). All four breakdowns are fetched in one
+    statement, as UNION ALL branches told apart by a `kind` column.
+    """
+    start_day = (datetime.utcnow() - timedelta(days=days)).date()
+    rollups = rollup_range(current_user.household_id, start_day)
 
-    total_wasted = len(wasted_items)
-    total_value = sum(item.price or 0 for item in wasted_items)
+    # Live and archived items, from the same day boundary as the rollups
+    items = all_inventory_items.c
+    wasted = select(items.id, items.name, items.waste_reason).where(
+        items.household_id == current_user.household_id,
+        items.is_wasted == True,
+        items.wasted_date >= datetime.combine(start_day, time.min)
+    ).cte("wasted")
+    w = wasted.c
 
-    # Waste by category
-    waste_by_category = db.query(
-        InventoryItem.category,
-        func.count(InventoryItem.id).label("count"),
-        func.sum(InventoryItem.price).label("total_value")
-    ).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == True,
-        InventoryItem.wasted_date >= start_date
-    ).group_by(InventoryItem.category).all()
-
-    # Most wasted items
-    most_wasted = db.query(
-        InventoryItem.name,
-        func.count(InventoryItem.id).label("count")
-    ).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == True,
-        InventoryItem.wasted_date >= start_date
-    ).group_by(InventoryItem.name).order_by(func.count(InventoryItem.id).desc()).limit(10).all()
-
-    # Waste reasons
-    waste_reasons = db.query(
-        InventoryItem.waste_reason,
-        func.count(InventoryItem.id).label("count")
-    ).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == True,
-        InventoryItem.wasted_date >= start_date,
-        InventoryItem.waste_reason != None
-    ).group_by(InventoryItem.waste_reason).all()
+    def branch(kind, count, category=None, name=None, reason=None, total_value=None):
+        return select(
+            literal(kind).label("kind"),
+            (category if category is not None else null()).label("category"),
+            (name if name is not None else null()).label("name"),
+            (reason if reason is not None else null()).label("reason"),
+            count.label("count"),
+            (total_value if total_value is not None else null()).label("total_value")
+        )
+
+    # Most wasted items, limited inside a subquery so it can be a union branch
+    top_names = branch("name", func.count(w.id), name=w.name).group_by(w.name).order_by(
+        func.count(w.id).desc()
+    ).limit(10).subquery()
+
+    wasted_count = func.sum(DailyRollup.waste_count)
+    rows = db.execute(union_all(
+        # First branch sets the result types (category as ItemCategory)
+        branch(
+            "category", wasted_count,
+            category=DailyRollup.category, total_value=func.sum(DailyRollup.waste_value)
+        ).where(rollups).group_by(DailyRollup.category).having(wasted_count > 0),
+        branch(
+            "total", func.coalesce(wasted_count, 0),
+            total_value=func.coalesce(func.sum(DailyRollup.waste_value), 0)
+        ).where(rollups),
+        select(top_names),
+        branch("reason", func.count(w.id), reason=w.waste_reason).where(
+            w.waste_reason != None
+        ).group_by(w.waste_reason)
+    )).all()
+
+    total_wasted, total_value = next((row.count, row.total_value) for row in rows if row.kind == "total")
+    waste_by_category = [(row.category, row.count, row.total_value) for row in rows if row.kind == "category"]
+    most_wasted = sorted(
+        ((row.name, row.count) for row in rows if row.kind == "name"),
+        key=lambda pair: pair[1],
+        reverse=True
+    )
+    waste_reasons = [(row.reason, row.count) for row in rows if row.kind == "reason"]
 
     return {
         "total_wasted_items": total_wasted,
-        "total_value_wasted": round(total_value, 2),
+        "total_value_wasted": round(float(total_value), 2),
         "waste_by_category": [
             {
                 "category": cat,
@@ -84,38 +113,32 @@ def get_waste_statistics(
 
 
 @router.get("/spending")
+@cached_response("spending", time_sensitive=True)
 def get_spending_stats(
     days: int = 30,
+    interval: TimelineInterval = TimelineInterval.DAY,
+    by_category: bool = False,
+    tz: Optional[str] = Query(None, description="IANA time zone; defaults to the household's"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get spending statistics."""
-    start_date = datetime.utcnow() - timedelta(days=days)
+    """
+    Get spending statistics.
 
-    # Total spending
-    total_spent = db.query(func.sum(InventoryItem.price)).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.purchase_date >= start_date
-    ).scalar() or 0
+    Totals and the timeline are computed from the same purchases, so they
+    always agree. The timeline is bucketed by day, week or month in the
+    household's time zone and gap-filled, ready to chart; the UTC-day
+    rollups cannot be split by local day, so they are not used here.
+    """
+    try:
+        household = current_user.household
+        zone = ZoneInfo(tz or (household.timezone if household else None) or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail="Unknown time zone")
 
-    # Spending by category
-    spending_by_category = db.query(
-        InventoryItem.category,
-        func.sum(InventoryItem.price).label("total"),
-        func.count(InventoryItem.id).label("count")
-    ).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.purchase_date >= start_date
-    ).group_by(InventoryItem.category).all()
-
-    # Spending over time (daily)
-    spending_timeline = db.query(
-        func.date(InventoryItem.purchase_date).label("date"),
-        func.sum(InventoryItem.price).label("total")
-    ).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.purchase_date >= start_date
-    ).group_by(func.date(InventoryItem.purchase_date)).order_by(func.date(InventoryItem.purchase_date)).all()
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    by_category_totals = spending_by_category(db, current_user.household_id, start)
+    total_spent = sum(total or 0 for _, total, _ in by_category_totals)
 
     return {
         "total_spent": round(float(total_spent), 2),
@@ -125,60 +148,124 @@ def get_spending_stats(
                 "total": round(float(total or 0), 2),
                 "count": count
             }
-            for cat, total, count in spending_by_category
+            for cat, total, count in by_category_totals
         ],
-        "spending_timeline": [
-            {
-                "date": date.isoformat(),
-                "total": round(float(total or 0), 2)
-            }
-            for date, total in spending_timeline
-        ]
+        "spending_timeline": spending_timeline(
+            db, current_user.household_id, start, zone, interval, by_category
+        )
     }
 
 
-@router.get("/inventory-summary")
+@router.get("/inventory-summary", dependencies=[Depends(conditional_get("inventory_item", time_sensitive=True))])
+@cached_response("inventory-summary", time_sensitive=True)
 def get_inventory_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get current inventory summary."""
-    # Total items
-    total_items = db.query(func.count(InventoryItem.id)).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == False
-    ).scalar()
+    """
+    Get current inventory summary.
 
-    # Items by category
-    items_by_category = db.query(
-        InventoryItem.category,
-        func.count(InventoryItem.id).label("count")
-    ).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == False
-    ).group_by(InventoryItem.category).all()
+    One aggregate over the household's live items, grouped by category and
+    storage location, with expiring-soon and expired as FILTERed counts.
+    The handful of groups are summed into the totals here.
+    """
+    now = datetime.utcnow()
 
-    # Expiring soon (7 days)
-    expiring_soon = db.query(func.count(InventoryItem.id)).filter(
+    groups = db.query(
+        InventoryItem.category,
+        InventoryItem.location_id,
+        StorageLocation.name,
+        func.count(InventoryItem.id),
+        func.count(InventoryItem.id).filter(
+            InventoryItem.expiration_date >= now,
+            InventoryItem.expiration_date <= now + timedelta(days=7)
+        ),
+        func.count(InventoryItem.id).filter(InventoryItem.expiration_date < now)
+    ).outerjoin(StorageLocation, InventoryItem.location_id == StorageLocation.id).filter(
         InventoryItem.household_id == current_user.household_id,
         InventoryItem.is_wasted == False,
-        InventoryItem.expiration_date <= datetime.utcnow() + timedelta(days=7),
-        InventoryItem.expiration_date >= datetime.utcnow()
-    ).scalar()
+        InventoryItem.is_consumed == False
+    ).group_by(InventoryItem.category, InventoryItem.location_id, StorageLocation.name).all()
 
-    # Expired
-    expired = db.query(func.count(InventoryItem.id)).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == False,
-        InventoryItem.expiration_date < datetime.utcnow()
-    ).scalar()
+    by_category = {}
+    by_location = {}
+    for category, location_id, location_name, count, expiring, expired in groups:
+        by_category[category] = by_category.get(category, 0) + count
+        location = by_location.setdefault(location_id, {
+            "location_id": location_id,
+            "location": location_name,
+            "count": 0,
+            "expiring_soon": 0,
+            "expired": 0
+        })
+        location["count"] += count
+        location["expiring_soon"] += expiring
+        location["expired"] += expired
 
     return {
-        "total_items": total_items,
+        "total_items": sum(location["count"] for location in by_location.values()),
         "items_by_category": [
             {"category": cat, "count": count}
-            for cat, count in items_by_category
+            for cat, count in by_category.items()
         ],
-        "expiring_soon": expiring_soon,
-        "expired": expired
+        "items_by_location": list(by_location.values()),
+        "expiring_soon": sum(location["expiring_soon"] for location in by_location.values()),
+        "expired": sum(location["expired"] for location in by_location.values())
     }
+
+
+@router.get("/progress")
+def get_progress_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the household's no-waste streak and achievement badges."""
+    progress = get_progress(db, current_user.household_id)
+    today = datetime.utcnow().date()  # Rollup days are UTC
+    streak = current_streak(progress, today)
+
+    return {
+        "current_streak": streak,
+        "longest_streak": max(progress["longest_streak"], streak),
+        "last_waste_day": progress["last_waste_day"],
+        "items_added": progress["items_added"],
+        "items_consumed": progress["items_consumed"],
+        "items_wasted": progress["items_wasted"],
+        "badges": badge_progress(progress, today)
+    }
+
+
+@router.get("/impact")
+@cached_response("impact")
+def get_impact_stats(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get money, CO2e and water saved by using food up, and lost to waste.
+
+    Covers `start` through `end` (UTC days), by default the last 30 days.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    impact = household_impact(db, current_user.household_id, start, end)
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "money_saved": impact["consumed"]["value"],
+        "co2e_saved_kg": impact["consumed"]["co2e_kg"],
+        "water_saved_l": impact["consumed"]["water_l"],
+        **impact
+    }
+
+
+@router.get("/cache-stats")
+def get_cache_stats(current_user: User = Depends(get_current_active_user)):
+    """Hit ratio and latency of this process's analytics cache."""
+    return {"backend": get_cache().name, **cache_stats.snapshot()}
@@ -0,0 +1,94 @@
+from functools import partial
+from typing import Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from app.api.deps import get_current_active_user
+from app.api.streaming import ExportFormat, export_response, nest_rows, stream_rows
+from app.db.archive import all_inventory_items
+from app.models.user import User
+from app.models.inventory import InventoryItem
+from app.models.receipt import Receipt, ReceiptLineItem
+
+router = APIRouter()
+
+INVENTORY_COLUMNS = [
+    "id", "name", "category", "brand", "barcode", "quantity", "unit", "original_quantity",
+    "purchase_date", "expiration_date", "opened_date", "location_id", "price", "currency",
+    "is_opened", "store", "notes",
+]
+
+RECEIPT_COLUMNS = [
+    "id", "merchant_name", "purchase_date", "total_amount", "tax_amount", "currency", "payment_method",
+]
+
+LINE_ITEM_COLUMNS = [
+    "description", "quantity", "unit_price", "total_price", "category",
+]
+
+WASTE_COLUMNS = [
+    "id", "name", "category", "brand", "quantity", "unit", "price", "currency",
+    "purchase_date", "expiration_date", "wasted_date", "waste_reason", "is_archived",
+]
+
+
+@router.get("/inventory")
+def export_inventory(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download current inventory as CSV or NDJSON, streamed row by row."""
+    statement = select(*[InventoryItem.__table__.c[name] for name in INVENTORY_COLUMNS]).where(
+        InventoryItem.household_id == current_user.household_id,
+        InventoryItem.is_wasted == False,
+        InventoryItem.is_consumed == False
+    ).order_by(InventoryItem.id)
+
+    return export_response(stream_rows(statement), INVENTORY_COLUMNS, export_format, "inventory")
+
+
+@router.get("/receipts")
+def export_receipts(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Download receipts with their line items.
+
+    CSV has one row per line item, receipt columns repeated. NDJSON has
+    one receipt per line with a nested `line_items` list.
+    """
+    line_item_columns = [ReceiptLineItem.__table__.c[name].label(f"line_{name}") for name in LINE_ITEM_COLUMNS]
+    statement = select(
+        *[Receipt.__table__.c[name] for name in RECEIPT_COLUMNS],
+        *line_item_columns
+    ).outerjoin(ReceiptLineItem, ReceiptLineItem.receipt_id == Receipt.id).where(
+        Receipt.household_id == current_user.household_id
+    ).order_by(Receipt.id, ReceiptLineItem.id)
+
+    return export_response(
+        stream_rows(statement),
+        RECEIPT_COLUMNS + [column.name for column in line_item_columns],
+        export_format,
+        "receipts",
+        nest=partial(nest_rows, key="id", child_name="line_items", child_prefix="line_")
+    )
+
+
+@router.get("/waste-history")
+def export_waste_history(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    since: Optional[datetime] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download wasted items, live and archived, oldest first."""
+    items = all_inventory_items.c
+    statement = select(*[items[name] for name in WASTE_COLUMNS]).where(
+        items.household_id == current_user.household_id,
+        items.is_wasted == True
+    )
+    if since:
+        statement = statement.where(items.wasted_date >= since)
+    statement = statement.order_by(items.wasted_date, items.id)
+
+    return export_response(stream_rows(statement), WASTE_COLUMNS, export_format, "waste-history")
@@ -1,30 +1,96 @@
+import os
+import shutil
+import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from app.db.session import get_db
+from app.db.search import apply_text_search, text_search
+from app.db.undo import full_snapshot
+from app.db.unit_of_work import record_action, unit_of_work
+from app.db.bulk import insert_inventory_items, update_inventory_items
+from app.db.eat_first import eat_first_query
+from app.db.consumption import (
+    InsufficientQuantityError,
+    consume_product,
+    decrement_quantities,
+    decrement_quantity,
+    mark_consumed,
+    product_total
+)
+from app.api.pagination import SortKey, keyset_paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.etag import conditional_get
+from app.services.eat_first import days_left
 from app.api.deps import get_current_active_user
+from app.core.config import settings
+from app.jobs.import_inventory import run as run_import
 from app.models.user import User
-from app.models.inventory import InventoryItem, Product, UserAction, ItemCategory
+from app.models.import_job import ImportJob
+from app.models.inventory import InventoryItem, Product, ItemCategory, UnitType
 from app.schemas.inventory import (
     InventoryItemCreate,
     InventoryItemUpdate,
     InventoryItemResponse,
     BulkInventoryAdd,
     PartialUsage,
+    ConsumeProduct,
+    ConsumeProductResponse,
+    EatFirstItem,
+    ProductTotal,
     InventoryItemWaste,
-    ProductResponse
+    ProductResponse,
+    BatchOperationType,
+    InventoryBatchRequest,
+    InventoryBatchResponse,
+    ImportJobResponse
 )
-import json
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
+INVENTORY_SORT = [
+    SortKey(InventoryItem.expiration_date, nullable=True),
+    SortKey(InventoryItem.id),
+]
+
+
+def _use_failure(item: InventoryItem) -> HTTPException:
+    """The error for a use that matched no row in decrement_quantity."""
+    if item.is_consumed or item.is_wasted:
+        return HTTPException(status_code=400, detail="Item is already used up or wasted")
+    return HTTPException(status_code=400, detail="Cannot use more than available quantity")
+
+
+def _use_quantity(db: Session, item: InventoryItem, quantity_used: float, user_id: int):
+    """Subtract used quantity atomically, marking the item consumed once it is used up."""
+    remaining = decrement_quantity(db, item, quantity_used, user_id)
+    if remaining is None:
+        raise _use_failure(item)
+
+    if remaining <= 0:
+        mark_consumed(item)
+
+
+def _mark_wasted(item: InventoryItem, waste_reason: str):
+    item.is_wasted = True
+    item.waste_reason = waste_reason
+    item.wasted_date = datetime.now(timezone.utc)
+
+
+def _apply_update(item: InventoryItem, update_data: dict):
+    for field, value in update_data.items():
+        setattr(item, field, value)
+
 
-@router.get("/", response_model=List[InventoryItemResponse])
+@router.get(
+    "/",
+    response_model=Page[InventoryItemResponse],
+    dependencies=[Depends(conditional_get("inventory_item", time_sensitive=True))]
+)
 def get_inventory(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     location_id: Optional[int] = None,
     category: Optional[ItemCategory] = None,
     expiring_soon: bool = False,
@@ -32,10 +98,17 @@ def get_inventory(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get inventory items with optional filters."""
+    """
+    Get inventory items with optional filters, soonest expiring first.
+
+    Pages are keyed on (expiration_date, id); pass `next_cursor` back as
+    `cursor` to continue. Search results are ranked by relevance and keyed
+    on (rank, id) instead, so their cursors only continue the same search.
+    """
     query = db.query(InventoryItem).filter(
         InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == False
+        InventoryItem.is_wasted == False,
+        InventoryItem.is_consumed == False
     )
 
     if location_id:
@@ -44,14 +117,6 @@ def get_inventory(
     if category:
         query = query.filter(InventoryItem.category == category)
 
-    if search:
-        query = query.filter(
-            or_(
-                InventoryItem.name.ilike(f"%{search}%"),
-                InventoryItem.brand.ilike(f"%{search}%")
-            )
-        )
-
     if expiring_soon:
         # Items expiring within 7 days
         expiry_threshold = datetime.utcnow() + timedelta(days=7)
@@ -60,8 +125,17 @@ def get_inventory(
             InventoryItem.expiration_date >= datetime.utcnow()
         )
 
-    items = query.order_by(InventoryItem.expiration_date.asc()).offset(skip).limit(limit).all()
-    return items
+    sort = INVENTORY_SORT
+    if search and search.strip():
+        # Most relevant matches first
+        query, ranking = text_search(query, [InventoryItem.name, InventoryItem.brand], search)
+        sort = [
+            *(SortKey(expression.label(f"search_rank_{i}"), descending) for i, (expression, descending) in enumerate(ranking)),
+            SortKey(InventoryItem.id)
+        ]
+
+    items, next_cursor = keyset_paginate(query, sort, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.post("/", response_model=InventoryItemResponse, status_code=201)
@@ -78,21 +152,8 @@ def create_inventory_item(
         original_quantity=item_in.quantity
     )
 
-    db.add(item)
-    db.commit()
-    db.refresh(item)
-
-    # Record action for undo
-    action = UserAction(
-        user_id=current_user.id,
-        action_type="add_item",
-        entity_type="inventory_item",
-        entity_id=item.id,
-        old_state=None,
-        new_state=json.dumps(item_in.model_dump(), default=str)
-    )
-    db.add(action)
-    db.commit()
+    with unit_of_work(db, current_user.id, "add_item"):
+        db.add(item)
 
     return item
 
@@ -103,37 +164,276 @@ def bulk_add_inventory(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Bulk add items to inventory (from receipt processing)."""
-    created_items = []
-
-    for item_in in bulk_in.items:
-        item = InventoryItem(
+    """
+    Bulk add items to inventory (from receipt processing).
+
+    Items are written with a single multi-row INSERT ... RETURNING, and one
+    grouped undo entry holds the created rows.
+    """
+    rows = [
+        {
             **item_in.model_dump(),
-            household_id=current_user.household_id,
-            added_by=current_user.id,
-            original_quantity=item_in.quantity
-        )
-        db.add(item)
-        created_items.append(item)
+            "household_id": current_user.household_id,
+            "added_by": current_user.id,
+            "original_quantity": item_in.quantity
+        }
+        for item_in in bulk_in.items
+    ]
+
+    with unit_of_work(db, current_user.id, "bulk_add_items", grouped=True):
+        created_items = insert_inventory_items(db, rows)
+        for item in created_items:
+            record_action(db, "inventory_item", item.id, None, full_snapshot(item))
 
-    db.commit()
+    return created_items
 
-    for item in created_items:
-        db.refresh(item)
 
-    # Record bulk action
-    action = UserAction(
+@router.post("/import", response_model=ImportJobResponse, status_code=202)
+def import_inventory(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Import inventory items from a CSV file.
+
+    The header row names InventoryItemCreate fields (name, category,
+    quantity, unit, ...). The file is streamed to disk and imported in the
+    background; poll GET /inventory/import/{job_id} for progress and
+    per-row errors. Imported items are not added to the undo history.
+    """
+    if not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="File must be a CSV")
+
+    os.makedirs(settings.IMPORTS_DIR, exist_ok=True)
+    file_path = os.path.join(settings.IMPORTS_DIR, f"{uuid.uuid4()}.csv")
+
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f)
+        size = f.tell()
+    if size > settings.MAX_IMPORT_SIZE:
+        os.remove(file_path)
+        raise HTTPException(status_code=413, detail="File too large")
+
+    job = ImportJob(
         user_id=current_user.id,
-        action_type="bulk_add_items",
-        entity_type="inventory_item",
-        entity_id=created_items[0].id if created_items else 0,
-        old_state=None,
-        new_state=json.dumps([i.model_dump() for i in bulk_in.items], default=str)
+        household_id=current_user.household_id,
+        filename=file.filename,
+        file_path=file_path,
+        status="pending"
     )
-    db.add(action)
+    db.add(job)
     db.commit()
+    db.refresh(job)
 
-    return created_items
+    background_tasks.add_task(run_import, job.id)
+
+    return job
+
+
+@router.get("/import/{job_id}", response_model=ImportJobResponse)
+def get_import(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get progress and row errors of an import."""
+    job = db.query(ImportJob).filter(
+        ImportJob.id == job_id,
+        ImportJob.user_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+
+    return job
+
+
+def _write_pending_changes(db: Session):
+    """Write all changed, not deleted inventory items with one UPDATE (see update_inventory_items)."""
+    update_inventory_items(db, [obj for obj in db.dirty if isinstance(obj, InventoryItem)])
+
+
+class _PendingUses:
+    """Batch "use" operations collected for one decrement_quantities statement."""
+
+    def __init__(self, db: Session, user_id: int):
+        self.db = db
+        self.user_id = user_id
+        self.ops = []  # (item, quantity_used, result)
+
+    def __contains__(self, item: InventoryItem) -> bool:
+        return any(pending is item for pending, _, _ in self.ops)
+
+    def add(self, item: InventoryItem, quantity_used: float, result: dict):
+        if item in self:
+            # One decrement per item and statement; later uses see the earlier ones
+            self.apply()
+        self.ops.append((item, quantity_used, result))
+
+    def apply(self):
+        """Run the collected uses, after any pending ORM changes to the same items."""
+        if not self.ops:
+            return
+        if any(item in self.db.dirty for item, _, _ in self.ops):
+            _write_pending_changes(self.db)
+
+        remaining = decrement_quantities(
+            self.db, [(item, quantity_used) for item, quantity_used, _ in self.ops], self.user_id
+        )
+        for (item, _, result), left in zip(self.ops, remaining):
+            if left is None:
+                error = _use_failure(item)
+                result.update(status_code=error.status_code, detail=error.detail)
+                result.pop("item", None)
+            elif left <= 0:
+                mark_consumed(item)
+        self.ops = []
+
+
+@router.post("/batch", response_model=InventoryBatchResponse)
+def batch_inventory_operations(
+    batch_in: InventoryBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Apply many use/waste/update/move/delete operations in one transaction.
+
+    Each operation behaves like its single-item endpoint and gets its own
+    result; a failing operation is reported and skipped without aborting
+    the rest. All applied changes share one grouped undo entry.
+
+    Uses are decremented together with one conditional UPDATE (a new one
+    only when an item is used again or changed in between), all other
+    changes are written with one CASE UPDATE and deletes with one DELETE,
+    so the statement count does not grow with the batch size.
+    """
+    item_ids = {op.item_id for op in batch_in.operations}
+    items = {
+        item.id: item
+        for item in db.query(InventoryItem).filter(
+            InventoryItem.id.in_(item_ids),
+            InventoryItem.household_id == current_user.household_id
+        )
+    }
+
+    results = []
+    with unit_of_work(db, current_user.id, "batch_update", grouped=True):
+        uses = _PendingUses(db, current_user.id)
+        for op in batch_in.operations:
+            item = items.get(op.item_id)
+            result = {"op": op.op, "item_id": op.item_id, "status_code": 200}
+            try:
+                if item is not None and item in uses and op.op != BatchOperationType.USE:
+                    # Later operations on an item see its earlier uses
+                    uses.apply()
+                if item is None or item in db.deleted:
+                    raise HTTPException(status_code=404, detail="Item not found")
+
+                if op.op == BatchOperationType.USE:
+                    if op.quantity_used is None:
+                        raise HTTPException(status_code=422, detail="quantity_used is required")
+                    uses.add(item, op.quantity_used, result)
+                elif op.op == BatchOperationType.WASTE:
+                    if not op.waste_reason:
+                        raise HTTPException(status_code=422, detail="waste_reason is required")
+                    _mark_wasted(item, op.waste_reason)
+                elif op.op == BatchOperationType.UPDATE:
+                    _apply_update(item, op.changes.model_dump(exclude_unset=True) if op.changes else {})
+                elif op.op == BatchOperationType.MOVE:
+                    _apply_update(item, {"location_id": op.location_id})
+                elif op.op == BatchOperationType.DELETE:
+                    db.delete(item)
+                    result["status_code"] = 204
+
+                if result["status_code"] == 200:
+                    result["item"] = item
+            except HTTPException as e:
+                result.update(status_code=e.status_code, detail=e.detail)
+            results.append(result)
+        uses.apply()
+        # Deletes go out in the closing flush
+        _write_pending_changes(db)
+
+    return {"results": results}
+
+
+@router.get("/total", response_model=ProductTotal)
+def get_product_total(
+    unit: UnitType,
+    barcode: Optional[str] = None,
+    name: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get how much of a product the household has across all lots, in one unit."""
+    if not barcode and not (name and name.strip()):
+        raise HTTPException(status_code=422, detail="barcode or name is required")
+
+    total, lots, unconverted = product_total(db, current_user.household_id, unit, barcode=barcode, name=name)
+    return {"quantity": round(total, 6), "unit": unit, "lots": lots, "unconverted_lots": unconverted}
+
+
+@router.post("/consume", response_model=ConsumeProductResponse)
+def consume_by_product(
+    consumption: ConsumeProduct,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Use a quantity of a product across its lots, soonest-expiring first."""
+    try:
+        with unit_of_work(db, current_user.id, "consume_product", grouped=True):
+            used = consume_product(
+                db,
+                current_user.household_id,
+                consumption.quantity,
+                consumption.unit,
+                barcode=consumption.barcode,
+                name=consumption.name,
+                user_id=current_user.id
+            )
+    except InsufficientQuantityError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "lots": [
+            {
+                "item_id": lot.id,
+                "quantity_used": quantity_used,
+                "unit": lot.unit,
+                "remaining_quantity": lot.quantity,
+                "depleted": depleted,
+            }
+            for lot, quantity_used, depleted in used
+        ]
+    }
+
+
+@router.get(
+    "/eat-first",
+    response_model=List[EatFirstItem],
+    dependencies=[Depends(conditional_get("inventory_item", time_sensitive=True))]
+)
+def get_eat_first(
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the items to eat first, soonest eat-by date first.
+
+    The eat-by date combines expiration, opened date and category shelf
+    life, and is kept up to date on every write (see app/db/eat_first.py).
+    """
+    items = eat_first_query(db, current_user.household_id).limit(limit).all()
+
+    now = datetime.now(timezone.utc)
+    return [
+        {**InventoryItemResponse.model_validate(item).model_dump(), "days_left": days_left(item.eat_by, now)}
+        for item in items
+    ]
 
 
 @router.get("/{item_id}", response_model=InventoryItemResponse)
@@ -170,33 +470,8 @@ def update_inventory_item(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    # Store old state
-    old_state = {
-        "name": item.name,
-        "quantity": item.quantity,
-        "expiration_date": item.expiration_date,
-        "location_id": item.location_id
-    }
-
-    # Update fields
-    update_data = item_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(item, field, value)
-
-    db.commit()
-    db.refresh(item)
-
-    # Record action
-    action = UserAction(
-        user_id=current_user.id,
-        action_type="update_item",
-        entity_type="inventory_item",
-        entity_id=item.id,
-        old_state=json.dumps(old_state, default=str),
-        new_state=json.dumps(update_data, default=str)
-    )
-    db.add(action)
-    db.commit()
+    with unit_of_work(db, current_user.id, "update_item"):
+        _apply_update(item, item_in.model_dump(exclude_unset=True))
 
     return item
 
@@ -217,35 +492,9 @@ def use_partial_quantity(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    if usage.quantity_used > item.quantity:
-        raise HTTPException(status_code=400, detail="Cannot use more than available quantity")
-
-    old_quantity = item.quantity
-    item.quantity -= usage.quantity_used
-
-    if item.quantity == 0:
-        db.delete(item)
-    else:
-        if not item.is_opened:
-            item.is_opened = True
-            item.opened_date = datetime.utcnow()
-
-    db.commit()
-
-    if item.quantity > 0:
-        db.refresh(item)
-
-    # Record action
-    action = UserAction(
-        user_id=current_user.id,
-        action_type="use_partial",
-        entity_type="inventory_item",
-        entity_id=item.id,
-        old_state=json.dumps({"quantity": old_quantity}, default=str),
-        new_state=json.dumps({"quantity": item.quantity, "used": usage.quantity_used}, default=str)
-    )
-    db.add(action)
-    db.commit()
+    # Grouped, so a decrement to zero and the consumed flag undo as one action
+    with unit_of_work(db, current_user.id, "use_partial", grouped=True):
+        _use_quantity(db, item, usage.quantity_used, current_user.id)
 
     return item
 
@@ -265,28 +514,8 @@ def delete_inventory_item(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    # Store for undo
-    old_state = {
-        "name": item.name,
-        "quantity": item.quantity,
-        "unit": item.unit,
-        "category": item.category
-    }
-
-    db.delete(item)
-    db.commit()
-
-    # Record action
-    action = UserAction(
-        user_id=current_user.id,
-        action_type="delete_item",
-        entity_type="inventory_item",
-        entity_id=item_id,
-        old_state=json.dumps(old_state, default=str),
-        new_state=None
-    )
-    db.add(action)
-    db.commit()
+    with unit_of_work(db, current_user.id, "delete_item"):
+        db.delete(item)
 
 
 @router.post("/{item_id}/waste", response_model=InventoryItemResponse)
@@ -305,12 +534,8 @@ def mark_as_wasted(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    item.is_wasted = True
-    item.waste_reason = waste_data.waste_reason
-    item.wasted_date = datetime.utcnow()
-
-    db.commit()
-    db.refresh(item)
+    with unit_of_work(db, current_user.id, "waste_item"):
+        _mark_wasted(item, waste_data.waste_reason)
 
     return item
 
@@ -318,13 +543,12 @@ def mark_as_wasted(
 @router.get("/products/search", response_model=List[ProductResponse])
 def search_products(
     q: str = Query(..., min_length=2),
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Search products for autocomplete."""
-    products = db.query(Product).filter(
-        Product.name.ilike(f"%{q}%")
-    ).limit(limit).all()
+    """Search products for autocomplete, best matches first."""
+    query = apply_text_search(db.query(Product), [Product.name], q)
+    products = query.limit(limit).all()
 
     return products
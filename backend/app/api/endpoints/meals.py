@@ -1,17 +1,31 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from datetime import datetime, timedelta
 from app.db.session import get_db
+from app.db.eat_first import eat_first_query
 from app.api.deps import get_current_active_user
 from app.models.user import User
 from app.models.meal import Recipe, MealPlan, AIMealSuggestion
-from app.models.inventory import InventoryItem
 from app.services.ai_service import AIService
+from app.schemas.meal import RecipeResponse, MealPlanResponse
+from app.schemas.pagination import Page
+from app.api.pagination import SortKey, keyset_paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.etag import conditional_get
 
 router = APIRouter()
 ai_service = AIService()
 
+RECIPE_SORT = [
+    SortKey(Recipe.name),
+    SortKey(Recipe.id),
+]
+
+MEAL_PLAN_SORT = [
+    SortKey(MealPlan.planned_date),
+    SortKey(MealPlan.id),
+]
+
 
 @router.post("/suggest")
 async def get_meal_suggestions(
@@ -20,11 +34,8 @@ async def get_meal_suggestions(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get AI-powered meal suggestions based on current inventory."""
-    # Get current inventory
-    inventory_items = db.query(InventoryItem).filter(
-        InventoryItem.household_id == current_user.household_id,
-        InventoryItem.is_wasted == False
-    ).all()
+    # Get current inventory, items to eat first at the top
+    inventory_items = eat_first_query(db, current_user.household_id).all()
 
     if not inventory_items:
         raise HTTPException(status_code=400, detail="No inventory items found")
@@ -63,17 +74,17 @@ async def get_meal_suggestions(
     }
 
 
-@router.get("/recipes", response_model=List[dict])
+@router.get("/recipes", response_model=Page[RecipeResponse])
 def get_recipes(
-    skip: int = 0,
-    limit: int = 50,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     search: Optional[str] = None,
     meal_type: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get recipes."""
-    query = db.query(Recipe).filter(
+    """Get recipes ordered by name, keyed on (name, id)."""
+    query = db.query(Recipe).options(selectinload(Recipe.ingredients)).filter(
         (Recipe.household_id == current_user.household_id) | (Recipe.household_id == None)
     )
 
@@ -83,31 +94,38 @@ def get_recipes(
     if meal_type:
         query = query.filter(Recipe.meal_type == meal_type)
 
-    recipes = query.offset(skip).limit(limit).all()
-    return recipes
+    recipes, next_cursor = keyset_paginate(query, RECIPE_SORT, cursor, limit)
+    return {"items": recipes, "next_cursor": next_cursor}
 
 
-@router.get("/plan", response_model=List[dict])
+@router.get(
+    "/plan",
+    response_model=Page[MealPlanResponse],
+    dependencies=[Depends(conditional_get("meal_plan", time_sensitive=True))]
+)
 def get_meal_plan(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get meal plan for a date range."""
+    """Get meal plan for a date range, keyed on (planned_date, id)."""
     if not start_date:
         start_date = datetime.utcnow()
 
     if not end_date:
         end_date = start_date + timedelta(days=7)
 
-    meal_plans = db.query(MealPlan).filter(
+    query = db.query(MealPlan).options(joinedload(MealPlan.recipe)).filter(
         MealPlan.household_id == current_user.household_id,
         MealPlan.planned_date >= start_date,
         MealPlan.planned_date <= end_date
-    ).order_by(MealPlan.planned_date).all()
+    )
 
-    return meal_plans
+    meal_plans, next_cursor = keyset_paginate(query, MEAL_PLAN_SORT, cursor, limit)
+    return {"items": meal_plans, "next_cursor": next_cursor}
 
 
 @router.post("/plan", status_code=201)
@@ -1,9 +1,11 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
-from sqlalchemy.orm import Session
-from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Query
+from sqlalchemy.orm import Session, selectinload
+from datetime import datetime, timedelta
+import asyncio
 import os
 import uuid
+import anyio
 from app.db.session import get_db
 from app.api.deps import get_current_active_user
 from app.models.user import User
@@ -16,11 +18,18 @@ from app.schemas.receipt import (
     ReceiptLineItemResponse
 )
 from app.services.ocr_service import OCRService
+from app.schemas.pagination import Page
+from app.api.pagination import SortKey, keyset_paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.core.config import settings
 
 router = APIRouter()
 ocr_service = OCRService()
 
+RECEIPT_SORT = [
+    SortKey(Receipt.created_at, descending=True),
+    SortKey(Receipt.id, descending=True),
+]
+
 
 async def process_receipt_async(
     receipt_id: int,
@@ -136,19 +145,20 @@ async def upload_receipt(
     }
 
 
-@router.get("/", response_model=List[ReceiptResponse])
+@router.get("/", response_model=Page[ReceiptResponse])
 def get_receipts(
-    skip: int = 0,
-    limit: int = 50,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all receipts for the user's household."""
-    receipts = db.query(Receipt).filter(
+    """Get receipts for the user's household, newest first, keyed on (created_at, id)."""
+    query = db.query(Receipt).options(selectinload(Receipt.line_items)).filter(
         Receipt.household_id == current_user.household_id
-    ).order_by(Receipt.created_at.desc()).offset(skip).limit(limit).all()
+    )
 
-    return receipts
+    receipts, next_cursor = keyset_paginate(query, RECEIPT_SORT, cursor, limit)
+    return {"items": receipts, "next_cursor": next_cursor}
 
 
 @router.get("/{receipt_id}", response_model=ReceiptResponse)
@@ -158,7 +168,7 @@ def get_receipt(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific receipt with line items."""
-    receipt = db.query(Receipt).filter(
+    receipt = db.query(Receipt).options(selectinload(Receipt.line_items)).filter(
         Receipt.id == receipt_id,
         Receipt.household_id == current_user.household_id
     ).first()
@@ -169,6 +179,16 @@ def get_receipt(
     return receipt
 
 
+async def _classify_line_items(ai_service, line_items, purchase_date: str):
+    """(category, shelf life in days) per line item, with the AI calls run concurrently."""
+    async def classify(line_item):
+        category = await ai_service.categorize_product(line_item.description)
+        shelf_life_days = await ai_service.estimate_expiration_date(line_item.description, category, purchase_date)
+        return category, shelf_life_days
+
+    return await asyncio.gather(*(classify(line_item) for line_item in line_items))
+
+
 @router.post("/{receipt_id}/confirm", status_code=200)
 def confirm_receipt_items(
     receipt_id: int,
@@ -198,17 +218,15 @@ def confirm_receipt_items(
     from app.services.ai_service import AIService
     ai_service = AIService()
 
-    for line_item in line_items:
-        # Determine category
-        category = await ai_service.categorize_product(line_item.description)
-
-        # Estimate expiration
-        shelf_life_days = await ai_service.estimate_expiration_date(
-            line_item.description,
-            category,
-            receipt.purchase_date.isoformat() if receipt.purchase_date else datetime.utcnow().isoformat()
-        )
+    # This endpoint runs in the threadpool; hop to the event loop once for the AI calls
+    classified = anyio.from_thread.run(
+        _classify_line_items,
+        ai_service,
+        line_items,
+        receipt.purchase_date.isoformat() if receipt.purchase_date else datetime.utcnow().isoformat()
+    )
 
+    for line_item, (category, shelf_life_days) in zip(line_items, classified):
         expiration_date = (receipt.purchase_date or datetime.utcnow()) + timedelta(days=shelf_life_days)
 
         inventory_item = InventoryItem(
@@ -1,28 +1,44 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
 from datetime import datetime
 from app.db.session import get_db
 from app.api.deps import get_current_active_user
 from app.models.user import User
 from app.models.shopping import ShoppingList, ShoppingListItem, ShoppingListStatus
+from app.schemas.shopping import ShoppingListResponse
+from app.schemas.pagination import Page
+from app.api.pagination import SortKey, keyset_paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.etag import conditional_get
 
 router = APIRouter()
 
+SHOPPING_LIST_SORT = [
+    SortKey(ShoppingList.created_at, descending=True),
+    SortKey(ShoppingList.id, descending=True),
+]
 
-@router.get("/lists", response_model=List[dict])
+
+@router.get(
+    "/lists",
+    response_model=Page[ShoppingListResponse],
+    dependencies=[Depends(conditional_get("shopping_list"))]
+)
 def get_shopping_lists(
     status: ShoppingListStatus = ShoppingListStatus.ACTIVE,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get shopping lists."""
-    lists = db.query(ShoppingList).filter(
+    """Get shopping lists, newest first, keyed on (created_at, id)."""
+    query = db.query(ShoppingList).options(selectinload(ShoppingList.items)).filter(
         ShoppingList.household_id == current_user.household_id,
         ShoppingList.status == status
-    ).order_by(ShoppingList.created_at.desc()).all()
+    )
 
-    return lists
+    lists, next_cursor = keyset_paginate(query, SHOPPING_LIST_SORT, cursor, limit)
+    return {"items": lists, "next_cursor": next_cursor}
 
 
 @router.post("/lists", status_code=201)
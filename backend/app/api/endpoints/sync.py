@@ -0,0 +1,207 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.db.session import get_db
+from app.db.change_log import DELETE
+from app.db.undo import full_snapshot
+from app.db.unit_of_work import record_action, unit_of_work
+from app.db.bulk import insert_inventory_items, update_inventory_items
+from app.api.deps import get_current_active_user
+from app.models.user import Household, User
+from app.models.inventory import InventoryItem
+from app.models.shopping import ShoppingList
+from app.models.meal import MealPlan
+from app.models.sync import AppliedMutation, ChangeLog
+from app.schemas.sync import SyncResponse, SyncPushRequest, SyncPushResponse, SyncMutationType
+
+router = APIRouter()
+
+MAX_SYNC_CHANGES = 1000
+
+# entity_type -> (model, eager-load options, response key)
+SYNCED_ENTITIES = {
+    "inventory_item": (InventoryItem, [], "inventory_items"),
+    "shopping_list": (ShoppingList, [selectinload(ShoppingList.items)], "shopping_lists"),
+    "meal_plan": (MealPlan, [joinedload(MealPlan.recipe)], "meal_plans"),
+}
+
+
+def _current_version(db: Session, household_id: int) -> int:
+    return db.query(Household.sync_version).filter(Household.id == household_id).scalar() or 0
+
+
+def _entity_versions(db: Session, entity_type: str, entity_ids) -> dict:
+    """Latest sync version per entity id, with one grouped query."""
+    if not entity_ids:
+        return {}
+    return dict(
+        db.query(ChangeLog.entity_id, func.max(ChangeLog.version)).filter(
+            ChangeLog.entity_type == entity_type,
+            ChangeLog.entity_id.in_(entity_ids)
+        ).group_by(ChangeLog.entity_id).all()
+    )
+
+
+@router.get("/", response_model=SyncResponse)
+def pull_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(MAX_SYNC_CHANGES, ge=1, le=MAX_SYNC_CHANGES),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Return everything that changed in the household after version `since`.
+
+    Changed rows come back in their current state and deletions as
+    tombstones. When `has_more` is set, call again with the returned
+    `version` to fetch the rest.
+    """
+    changes = db.query(ChangeLog).filter(
+        ChangeLog.household_id == current_user.household_id,
+        ChangeLog.version > since
+    ).order_by(ChangeLog.version).limit(limit + 1).all()
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    version = changes[-1].version if changes else max(since, _current_version(db, current_user.household_id))
+
+    # Only the latest operation per entity matters
+    latest = {}
+    for change in changes:
+        latest[(change.entity_type, change.entity_id)] = change.operation
+
+    response = {"version": version, "has_more": has_more, "deleted": []}
+    for entity_type, (model, options, key) in SYNCED_ENTITIES.items():
+        ids = [eid for (etype, eid), op in latest.items() if etype == entity_type and op != DELETE]
+        rows = db.query(model).options(*options).filter(
+            model.id.in_(ids),
+            model.household_id == current_user.household_id
+        ).all() if ids else []
+        response[key] = rows
+
+        # Rows deleted after this window are tombstoned as well
+        found = {row.id for row in rows}
+        response["deleted"] += [
+            {"entity_type": entity_type, "entity_id": eid}
+            for (etype, eid), op in latest.items()
+            if etype == entity_type and (op == DELETE or eid not in found)
+        ]
+
+    return response
+
+
+@router.post("/", response_model=SyncPushResponse)
+def push_changes(
+    push_in: SyncPushRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Apply a queue of offline inventory mutations in one transaction.
+
+    An update or delete conflicts when the item changed on the server after
+    the mutation's `base_version`. Conflicting mutations are not applied, and
+    their result carries the current server state so the client can resolve
+    the conflict.
+
+    Applied mutations are remembered by `client_id`: pushing one again (e.g.
+    a retry after a lost response) is not reapplied and returns the original
+    entity id. Target items, their versions and the remembered mutations are
+    loaded with one query each, and creates are written with one INSERT.
+    """
+    household_id = current_user.household_id
+    mutations = push_in.mutations
+
+    applied = {
+        row.client_id: row.entity_id
+        for row in db.query(AppliedMutation).filter(
+            AppliedMutation.household_id == household_id,
+            AppliedMutation.client_id.in_({mutation.client_id for mutation in mutations})
+        )
+    }
+    item_ids = {mutation.entity_id for mutation in mutations if mutation.entity_id is not None}
+    item_ids |= {entity_id for entity_id in applied.values() if entity_id is not None}
+    items = {
+        item.id: item
+        for item in db.query(InventoryItem).filter(
+            InventoryItem.id.in_(item_ids),
+            InventoryItem.household_id == household_id
+        )
+    } if item_ids else {}
+    versions = _entity_versions(db, "inventory_item", list(items))
+
+    results = []
+    created = []  # (result, row) written together after the loop
+    newly_applied = []  # results to remember
+    pushed_ids = set()  # Items already changed by this push don't conflict with themselves
+    with unit_of_work(db, current_user.id, "sync_push", grouped=True):
+        for mutation in mutations:
+            result = {"client_id": mutation.client_id, "entity_id": mutation.entity_id}
+            results.append(result)
+
+            if mutation.client_id in applied:
+                entity_id = applied[mutation.client_id]
+                result.update(status="applied", entity_id=entity_id)
+                if entity_id in items and items[entity_id] not in db.deleted:
+                    result["item"] = items[entity_id]
+                continue
+
+            if mutation.op == SyncMutationType.CREATE:
+                if mutation.create is None:
+                    result.update(status="error", detail="create payload is required")
+                    continue
+                row = {
+                    **mutation.create.model_dump(),
+                    "household_id": household_id,
+                    "added_by": current_user.id,
+                    "original_quantity": mutation.create.quantity
+                }
+                result["status"] = "applied"
+                created.append((result, row))
+                applied[mutation.client_id] = None  # Set once the item is inserted below
+                continue
+
+            item = items.get(mutation.entity_id)
+            if item is None or item in db.deleted:
+                # Deleting an already-deleted item is a no-op, not an error
+                if mutation.op == SyncMutationType.DELETE:
+                    result["status"] = "applied"
+                else:
+                    result.update(status="error", detail="Item not found")
+                continue
+
+            if item.id not in pushed_ids and versions.get(item.id, 0) > mutation.base_version:
+                result.update(status="conflict", detail="Item changed on server", item=item)
+                continue
+
+            if mutation.op == SyncMutationType.DELETE:
+                db.delete(item)
+                result["status"] = "applied"
+            else:
+                for field, value in (mutation.changes.model_dump(exclude_unset=True) if mutation.changes else {}).items():
+                    setattr(item, field, value)
+                result.update(status="applied", item=item)
+
+            pushed_ids.add(item.id)
+            applied[mutation.client_id] = item.id
+            newly_applied.append(result)
+
+        for (result, _), item in zip(created, insert_inventory_items(db, [row for _, row in created])):
+            record_action(db, "inventory_item", item.id, None, full_snapshot(item))
+            result.update(entity_id=item.id, item=item)
+            applied[result["client_id"]] = item.id
+            items[item.id] = item
+            newly_applied.append(result)
+        for result in results:
+            # A create repeated within this push points at the item the first copy created
+            if result["status"] == "applied" and result["entity_id"] is None and applied.get(result["client_id"]):
+                result.update(entity_id=applied[result["client_id"]], item=items[applied[result["client_id"]]])
+
+        update_inventory_items(db, [item for item in items.values() if item in db.dirty])
+        if newly_applied:
+            db.execute(insert(AppliedMutation), [
+                {"household_id": household_id, "client_id": result["client_id"], "entity_id": result["entity_id"]}
+                for result in newly_applied
+            ])
+
+    return {"version": _current_version(db, household_id), "results": results}
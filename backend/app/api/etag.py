@@ -0,0 +1,60 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.api.deps import get_current_active_user
+from app.models.user import User
+from app.models.sync import ChangeLog
+
+
+def resource_version(db: Session, household_id: int, entity_type: str) -> int:
+    """Latest change_log version for one resource of a household (0 if never changed)."""
+    return db.query(func.max(ChangeLog.version)).filter(
+        ChangeLog.household_id == household_id,
+        ChangeLog.entity_type == entity_type
+    ).scalar() or 0
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes on either side
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_get(entity_type: str, time_sensitive: bool = False):
+    """
+    Dependency that short-circuits a household-scoped GET with 304 Not Modified.
+
+    The weak ETag combines the household, the resource's change_log version
+    and a digest of the request path and query string. Time-sensitive resources, whose answers
+    shift as items approach expiry, also include the current UTC hour. A
+    matching If-None-Match raises 304 before the endpoint runs its query.
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_active_user)
+    ):
+        version = resource_version(db, current_user.household_id, entity_type)
+        # Different endpoints and filters over one resource need distinct tags
+        representation = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode()).hexdigest()[:10]
+        parts = [str(current_user.household_id), entity_type, str(version), representation]
+        if time_sensitive:
+            parts.append(datetime.utcnow().strftime("%Y%m%d%H"))
+        etag = f'W/"{":".join(parts)}"'
+
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+
+    return dependency
@@ -0,0 +1,108 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import DateTime, and_, false, or_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import Label
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class SortKey(NamedTuple):
+    """
+    One column of a keyset ordering. Nullable keys sort NULLs last.
+
+    A key can also be a labeled expression, such as a search rank; it is
+    selected alongside the entity to build the cursor.
+    """
+    column: Any
+    descending: bool = False
+    nullable: bool = False
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort-key values of the last row of a page as an opaque token."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: List[SortKey]) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor` for the same sort keys."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match sort keys")
+        return [
+            datetime.fromisoformat(v) if v is not None and isinstance(key.column.type, DateTime) else v
+            for key, v in zip(keys, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _order_clause(key: SortKey):
+    clause = key.column.desc() if key.descending else key.column.asc()
+    return clause.nulls_last() if key.nullable else clause
+
+
+def _equals(key: SortKey, value: Any):
+    return key.column.is_(None) if value is None else key.column == value
+
+
+def _beyond(key: SortKey, value: Any):
+    """Rows strictly after `value` in this key's direction (NULLs last)."""
+    if value is None:
+        return false()
+    clause = key.column < value if key.descending else key.column > value
+    return or_(clause, key.column.is_(None)) if key.nullable else clause
+
+
+def _after_cursor(keys: List[SortKey], values: List[Any]):
+    """Lexicographic "comes after (v1, v2, ...)" predicate over the sort keys."""
+    return or_(*[
+        and_(*[_equals(k, v) for k, v in zip(keys[:i], values[:i])], _beyond(key, values[i]))
+        for i, key in enumerate(keys)
+    ])
+
+
+def keyset_paginate(
+    query: Query,
+    keys: List[SortKey],
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page of `query` ordered by `keys`, starting after `cursor`.
+
+    The last key must be unique (normally the primary key) so the ordering is
+    total. Returns the rows and the cursor for the next page, or None when
+    this is the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        query = query.filter(_after_cursor(keys, decode_cursor(cursor, keys)))
+
+    computed = [k.column for k in keys if isinstance(k.column, Label)]
+    if computed:
+        query = query.add_columns(*computed)
+
+    rows = query.order_by(*[_order_clause(k) for k in keys]).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([
+            last._mapping[k.column] if isinstance(k.column, Label) else getattr(last[0] if computed else last, k.column.key)
+            for k in keys
+        ])
+
+    if computed:
+        rows = [row[0] for row in rows]
+    return rows, next_cursor
@@ -0,0 +1,117 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+from app.db.session import SessionLocal
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    """JSON/CSV-friendly form of a column value."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def stream_rows(statement: Select) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a statement's rows as dicts through a server-side cursor.
+
+    Uses its own session: FastAPI closes request-scoped dependencies
+    before a streaming body is sent. With `yield_per`, psycopg2 uses a
+    named cursor, so only one batch is held in memory at a time.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for row in result:
+            yield {key: _plain(value) for key, value in row._mapping.items()}
+    finally:
+        db.close()
+
+
+def nest_rows(
+    rows: Iterable[Dict[str, Any]],
+    key: str,
+    child_name: str,
+    child_prefix: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fold consecutive joined rows sharing `key` into one dict with a list of children.
+
+    Child columns are recognized by `child_prefix`, which is stripped.
+    Rows must be ordered by `key`; an outer join's all-NULL child is dropped.
+    """
+    for _, group in groupby(rows, key=lambda row: row[key]):
+        parent, children = None, []
+        for row in group:
+            if parent is None:
+                parent = {k: v for k, v in row.items() if not k.startswith(child_prefix)}
+            child = {k[len(child_prefix):]: v for k, v in row.items() if k.startswith(child_prefix)}
+            if any(v is not None for v in child.values()):
+                children.append(child)
+        parent[child_name] = children
+        yield parent
+
+
+def _csv_chunks(columns: List[str], rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=str, separators=(",", ":")) + "\n"
+
+
+def export_response(
+    rows: Iterable[Dict[str, Any]],
+    columns: List[str],
+    export_format: ExportFormat,
+    filename: str,
+    nest: Optional[Callable[[Iterable[Dict[str, Any]]], Iterable[Dict[str, Any]]]] = None
+) -> StreamingResponse:
+    """
+    Stream rows as a CSV or NDJSON download.
+
+    CSV gets one flat row per input row. NDJSON gets one object per line,
+    folded by `nest` if given (e.g. a receipt with its line items).
+    """
+    if export_format == ExportFormat.CSV:
+        body = _csv_chunks(columns, rows)
+    else:
+        body = _ndjson_lines(nest(rows) if nest else rows)
+
+    return StreamingResponse(
+        body,
+        media_type=_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    )
@@ -0,0 +1,245 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import redis
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Reads a household's generation and the entry under that generation in one round trip
+_FETCH_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return {generation, redis.call('GET', ARGV[1] .. generation)}
+"""
+
+
+class CacheStats:
+    """Hit ratio and latency of one process's cache lookups."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.lookup_ms = 0.0
+        self.compute_ms = 0.0
+
+    def record_lookup(self, hit: bool, elapsed_ms: float):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.lookup_ms += elapsed_ms
+
+    def record_compute(self, elapsed_ms: float):
+        with self._lock:
+            self.compute_ms += elapsed_ms
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "avg_lookup_ms": round(self.lookup_ms / lookups, 3) if lookups else 0.0,
+                "avg_miss_compute_ms": round(self.compute_ms / self.misses, 3) if self.misses else 0.0,
+            }
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with TTLs; the fallback when Redis is unreachable.
+
+    Other processes' writes cannot invalidate it, so entries live at most
+    max_ttl seconds.
+    """
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_ttl: int):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._generations = {}
+        self._max_entries = max_entries
+        self._max_ttl = max_ttl
+
+    def fetch(self, generation_key: str, key_prefix: str) -> Tuple[int, Optional[str]]:
+        with self._lock:
+            generation = self._generations.get(generation_key, 0)
+            key = f"{key_prefix}{generation}"
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return generation, None
+            self._entries.move_to_end(key)
+            return generation, entry[1]
+
+    def store(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + min(ttl, self._max_ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self, generation_key: str):
+        with self._lock:
+            self._generations[generation_key] = self._generations.get(generation_key, 0) + 1
+
+
+class RedisCache:
+    """Cache shared by all API processes."""
+    name = "redis"
+
+    def __init__(self, client: redis.Redis):
+        self._client = client
+        self._fetch = client.register_script(_FETCH_SCRIPT)
+
+    def fetch(self, generation_key: str, key_prefix: str) -> Tuple[int, Optional[str]]:
+        generation, value = self._fetch(keys=[generation_key], args=[key_prefix])
+        return int(generation), value.decode() if value is not None else None
+
+    def store(self, key: str, value: str, ttl: int):
+        self._client.set(key, value, ex=ttl)
+
+    def bump(self, generation_key: str):
+        self._client.incr(generation_key)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_fallback = None
+_retry_at = 0.0
+_retry_delay = 0.0
+# Households whose invalidation never reached Redis; flushed before Redis is used again
+_pending_bumps = set()
+cache_stats = CacheStats()
+
+
+def get_cache():
+    """
+    The process-wide cache: Redis at REDIS_URL, or in-process while it cannot
+    be reached. Redis is retried with exponential backoff.
+    """
+    global _cache
+    if _cache is None or (_cache is _fallback and settings.REDIS_URL and time.monotonic() >= _retry_at):
+        with _cache_lock:
+            if _cache is None or (_cache is _fallback and settings.REDIS_URL and time.monotonic() >= _retry_at):
+                _cache = _connect()
+    return _cache
+
+
+def _connect():
+    global _retry_delay
+    if settings.REDIS_URL:
+        try:
+            client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.CACHE_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.CACHE_SOCKET_TIMEOUT
+            )
+            client.ping()
+            cache = RedisCache(client)
+            while _pending_bumps:
+                household_id = next(iter(_pending_bumps))
+                cache.bump(_generation_key(household_id))
+                _pending_bumps.discard(household_id)
+            if _retry_delay:
+                logger.info("Redis reachable again; leaving in-process cache")
+            _retry_delay = 0.0
+            return cache
+        except redis.RedisError as e:
+            _schedule_retry()
+            logger.warning("Redis unavailable (%s); using in-process cache, retrying in %.1fs", e, _retry_delay)
+    return _fallback_cache()
+
+
+def _fallback_cache() -> MemoryCache:
+    global _fallback
+    if _fallback is None:
+        _fallback = MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_FALLBACK_TTL)
+    return _fallback
+
+
+def _schedule_retry():
+    global _retry_at, _retry_delay
+    _retry_delay = min(max(_retry_delay * 2, settings.CACHE_RETRY_SECONDS), settings.CACHE_RETRY_MAX_SECONDS)
+    _retry_at = time.monotonic() + _retry_delay
+
+
+def _disconnect(cache, error: redis.RedisError):
+    """Fall back to the in-process cache after a Redis error, until the next retry."""
+    global _cache
+    logger.warning("Cache request failed: %s", error)
+    cache_stats.record_error()
+    with _cache_lock:
+        if _cache is cache:
+            _schedule_retry()
+            _cache = _fallback_cache()
+
+
+def _generation_key(household_id: int) -> str:
+    return f"cache:generation:{household_id}"
+
+
+def cached_value(household_id: int, key: str, compute) -> Any:
+    """
+    Return the cached value of `key` for a household, computing it on a miss.
+
+    Entries are stored under the household's current generation, so bumping
+    the generation (bump_generation) invalidates all of them at once; stale
+    entries simply expire. Values must be JSON-serializable. Cache errors
+    fall through to `compute`.
+    """
+    cache = get_cache()
+    key_prefix = f"cache:{household_id}:{key}:"
+
+    start = time.perf_counter()
+    try:
+        generation, raw = cache.fetch(_generation_key(household_id), key_prefix)
+    except redis.RedisError as e:
+        _disconnect(cache, e)
+        return compute()
+    cache_stats.record_lookup(raw is not None, (time.perf_counter() - start) * 1000)
+
+    if raw is not None:
+        return json.loads(raw)
+
+    start = time.perf_counter()
+    value = compute()
+    cache_stats.record_compute((time.perf_counter() - start) * 1000)
+
+    try:
+        cache.store(f"{key_prefix}{generation}", json.dumps(value, default=str), settings.CACHE_TTL)
+    except redis.RedisError as e:
+        _disconnect(cache, e)
+    return value
+
+
+def bump_generation(household_id: int):
+    """
+    Invalidate every cached value of a household.
+
+    An invalidation that cannot reach Redis is kept and applied before Redis
+    is used again, so entries cached before the write are never served.
+    """
+    get_cache()
+    with _cache_lock:
+        cache = _cache
+        if cache is _fallback and settings.REDIS_URL:
+            _pending_bumps.add(household_id)
+    try:
+        cache.bump(_generation_key(household_id))
+    except redis.RedisError as e:
+        logger.error("Cache invalidation failed for household %d: %s", household_id, e)
+        with _cache_lock:
+            _pending_bumps.add(household_id)
+        _disconnect(cache, e)
+        _fallback_cache().bump(_generation_key(household_id))
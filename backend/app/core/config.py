@@ -12,6 +12,16 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_QUERY_WARN_THRESHOLD: int = 20  # Statements per request before logging a warning
+    DB_NPLUSONE_THRESHOLD: int = 5  # Repeats of one statement per request treated as N+1
+    DB_QUERY_STRICT: bool = False  # Raise on N+1 instead of logging (enable in tests)
+
+    # Undo history
+    UNDO_HISTORY_LIMIT: int = 200  # Actions kept per user by the compaction job
+
+    # Inventory archival
+    INVENTORY_ARCHIVE_AFTER_DAYS: int = 30  # Wasted/consumed items stay live this long
+    INVENTORY_ARCHIVE_BATCH_SIZE: int = 1000
 
     # Security
     SECRET_KEY: str
@@ -37,9 +47,25 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
     UPLOAD_DIR: str = "./uploads"
     RECEIPTS_DIR: str = "./receipts"
+    IMPORTS_DIR: str = "./uploads/imports"
+    MAX_IMPORT_SIZE: int = 52428800  # 50MB, about 500k CSV rows
+    IMPORT_CHUNK_SIZE: int = 500  # Rows validated and inserted per statement
+    IMPORT_MAX_ERRORS: int = 100  # Row errors kept on the import record
+
+    # Parquet analytics export (see app/jobs/export_parquet.py)
+    ANALYTICS_EXPORT_DIR: str = "./exports/parquet"
+    ANALYTICS_EXPORT_BUCKETS: int = 16  # Household partitions per month
+    ANALYTICS_EXPORT_CHUNK_SIZE: int = 50000  # Rows per fetch and per Parquet file
+    ANALYTICS_EXPORT_OVERLAP_MINUTES: int = 15  # Re-read before the watermark for rows committed late
 
     # Redis
-    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_URL: str = "redis://localhost:6379/0"  # Response cache; empty for in-process only
+    CACHE_TTL: int = 3600  # Seconds; writes invalidate earlier
+    CACHE_MAX_ENTRIES: int = 10000  # In-process fallback only
+    CACHE_FALLBACK_TTL: int = 30  # Seconds; the in-process cache misses other processes' invalidations
+    CACHE_RETRY_SECONDS: float = 1.0  # First reconnect delay after Redis fails; doubles per failure
+    CACHE_RETRY_MAX_SECONDS: float = 60.0
+    CACHE_SOCKET_TIMEOUT: float = 0.1  # Seconds; on timeout responses are computed uncached
 
     # Email
     SMTP_HOST: str = "smtp.gmail.com"
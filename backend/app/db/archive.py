@@ -0,0 +1,111 @@
+import logging
+from datetime import datetime
+from typing import Iterable
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, text, union_all, update
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.orm import Session
+from app.models.inventory import InventoryItem, InventoryItemHistory
+from app.models.shopping import ShoppingListItem
+from app.db.change_log import DELETE, record_changes
+
+logger = logging.getLogger(__name__)
+
+_hot = InventoryItem.__table__
+_cold = InventoryItemHistory.__table__
+
+# Columns both tiers share, in table order
+SHARED_COLUMNS = [column.name for column in _cold.columns if column.name in _hot.columns]
+
+# Both tiers as one relation for analytics. A UNION ALL subquery rather than
+# a database view, so it works on every dialect and follows the models;
+# PostgreSQL pushes filters down into each branch.
+all_inventory_items = union_all(
+    select(*[_hot.c[name] for name in SHARED_COLUMNS], literal(False).label("is_archived")),
+    select(*[_cold.c[name] for name in SHARED_COLUMNS], literal(True).label("is_archived"))
+).subquery("inventory_items_all")
+
+
+def _retired(cutoff: datetime):
+    """Wasted or used-up items that left live stock before `cutoff`."""
+    return or_(
+        and_(InventoryItem.is_wasted == True, InventoryItem.wasted_date < cutoff),
+        and_(InventoryItem.is_consumed == True, InventoryItem.consumed_date < cutoff)
+    )
+
+
+def ensure_history_partitions(db: Session, years: Iterable[int]):
+    """
+    Create yearly inventory_item_history partitions on PostgreSQL.
+
+    Run ahead of time (the archiver does this for the current and next
+    year); rows without a matching partition land in the default one.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+
+    for year in years:
+        try:
+            with db.begin_nested():
+                db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS inventory_item_history_{year:d} "
+                    f"PARTITION OF inventory_item_history "
+                    f"FOR VALUES FROM ('{year:d}-01-01') TO ('{year + 1:d}-01-01')"
+                ))
+        except ProgrammingError as e:
+            # The default partition already holds rows for this year
+            logger.warning("Could not create history partition for %d: %s", year, e)
+    db.commit()
+
+
+def archive_inventory(db: Session, cutoff: datetime, batch_size: int = 1000) -> int:
+    """
+    Move items wasted or used up before `cutoff` to inventory_item_history.
+
+    Works in batches of `batch_size`, each its own transaction: copy rows
+    with INSERT ... SELECT, detach shopping list references, delete the hot
+    rows and log sync deletes. Rows locked by a live request are skipped
+    and picked up by the next run. Returns the number of rows moved.
+    """
+    moved = 0
+
+    while True:
+        ids = db.scalars(
+            select(InventoryItem.id)
+            .where(InventoryItem.household_id != None, _retired(cutoff))
+            .order_by(InventoryItem.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            break
+
+        db.execute(insert(InventoryItemHistory).from_select(
+            [*SHARED_COLUMNS, "retired_at"],
+            select(
+                *[_hot.c[name] for name in SHARED_COLUMNS],
+                func.coalesce(InventoryItem.wasted_date, InventoryItem.consumed_date)
+            ).where(InventoryItem.id.in_(ids))
+        ))
+        db.execute(
+            update(ShoppingListItem)
+            .where(ShoppingListItem.inventory_item_id.in_(ids))
+            .values(inventory_item_id=None)
+            .execution_options(synchronize_session=False)
+        )
+
+        by_household = {}
+        for item_id, household_id in db.execute(
+            delete(InventoryItem)
+            .where(InventoryItem.id.in_(ids))
+            .returning(InventoryItem.id, InventoryItem.household_id)
+            .execution_options(synchronize_session=False)
+        ):
+            by_household.setdefault(household_id, []).append(item_id)
+        for household_id, item_ids in by_household.items():
+            if household_id is not None:
+                record_changes(db, household_id, "inventory_item", item_ids, DELETE)
+
+        db.commit()
+        moved += len(ids)
+
+    return moved
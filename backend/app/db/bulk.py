@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import case, insert, inspect, literal, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.inventory import InventoryItem
+from app.db.change_log import record_changes
+from app.db.eat_first import item_eat_by
+from app.db.rollups import record_rollup_updates, record_rollups
+from app.db.cache_invalidation import invalidate_household
+from app.db.unit_of_work import record_updates
+
+
+def _record_changes(db: Session, items: List[InventoryItem]):
+    """Sync changes and cache invalidation for written items, per household."""
+    by_household = {}
+    for item in items:
+        by_household.setdefault(item.household_id, []).append(item.id)
+    for household_id, ids in by_household.items():
+        if household_id is not None:
+            record_changes(db, household_id, "inventory_item", ids)
+            invalidate_household(db, household_id)
+
+
+def insert_inventory_items(db: Session, rows: List[Dict[str, Any]]) -> List[InventoryItem]:
+    """
+    Insert inventory rows with multi-row INSERT ... RETURNING.
+
+    SQLAlchemy batches the rows into as few statements as the driver allows
+    (insertmanyvalues, 1000 rows per statement by default). It returns fully
+    populated InventoryItem objects, server defaults included, so callers
+    can build responses without a refresh. This bypasses the flush hooks:
+    eat_by, rollups, cache invalidation and sync changes are handled here,
+    but callers record their own undo entry.
+    """
+    if not rows:
+        return []
+
+    rows = [{**row, "eat_by": item_eat_by(row)} for row in rows]
+    items = list(db.scalars(insert(InventoryItem).returning(InventoryItem), rows))
+
+    record_rollups(db, items)
+    _record_changes(db, items)
+    return items
+
+
+def update_inventory_items(db: Session, items: Iterable[InventoryItem]):
+    """
+    Write the pending attribute changes of persistent items with one UPDATE.
+
+    Every changed column is set with `CASE id WHEN ... END`, so items with
+    different changes still share one statement, where a flush emits one
+    UPDATE per run of items changing the same columns. Like the insert above
+    this bypasses the flush hooks: eat_by, rollups, sync changes, cache
+    invalidation and undo entries are handled here. The items are left
+    clean, as if flushed.
+    """
+    items = [item for item in items if item not in db.deleted]
+    for item in items:
+        eat_by = item_eat_by(item)
+        if eat_by != item.eat_by:
+            item.eat_by = eat_by
+
+    changes = {}
+    for item in items:
+        state = inspect(item)
+        changed = {
+            attr.key: getattr(item, attr.key)
+            for attr in state.mapper.column_attrs
+            if state.attrs[attr.key].history.has_changes()
+        }
+        if changed:
+            changes[item] = changed
+    if not changes:
+        return
+
+    record_updates(db, list(changes))
+    record_rollup_updates(db, list(changes))
+
+    columns = InventoryItem.__table__.c
+    values = {
+        key: case(
+            {item.id: literal(changed[key], columns[key].type) for item, changed in changes.items() if key in changed},
+            value=InventoryItem.id,
+            else_=columns[key]
+        )
+        for key in sorted({key for changed in changes.values() for key in changed})
+    }
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(InventoryItem)
+        .where(InventoryItem.id.in_([item.id for item in changes]))
+        .values(**values, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+    for item, changed in changes.items():
+        for key, value in {**changed, "updated_at": now}.items():
+            set_committed_value(item, key, value)
+    _record_changes(db, list(changes))
@@ -0,0 +1,36 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.cache import bump_generation
+
+_PENDING_KEY = "cache_invalidations"
+
+
+def invalidate_household(db: Session, household_id: int):
+    """
+    Invalidate a household's cached responses once the transaction commits.
+
+    Flushed changes to models declaring `__cache_household__` are picked up
+    automatically; set-based statements that skip the flush call this.
+    """
+    if household_id is not None:
+        db.info.setdefault(_PENDING_KEY, set()).add(household_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session: Session, flush_context):
+    changed = list(session.new) + [o for o in session.dirty if session.is_modified(o)] + list(session.deleted)
+    for obj in changed:
+        if getattr(obj, "__cache_household__", False):
+            invalidate_household(session, obj.household_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_generations(session: Session):
+    # After, not before, the commit: a reader must not cache pre-commit data under the new generation
+    for household_id in session.info.pop(_PENDING_KEY, ()):
+        bump_generation(household_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,92 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+from app.models.sync import ChangeLog
+from app.models.user import Household
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+def _append(connection, rows: List[Dict[str, Any]]):
+    """
+    Insert change rows, numbering them from their household's sync counter.
+
+    Bumping households.sync_version locks the household row until commit,
+    so a concurrent writer waits and takes the next versions: a version is
+    never committed below one a client has already pulled past, as
+    autoincrement ids would be when transactions commit out of order.
+    """
+    by_household = defaultdict(list)
+    for row in rows:
+        by_household[row["household_id"]].append(row)
+
+    households = Household.__table__
+    for household_id, household_rows in sorted(by_household.items()):  # One lock order, no deadlocks
+        last = connection.execute(
+            update(households)
+            .where(households.c.id == household_id)
+            # Keep updated_at: this is bookkeeping, not a change to the household
+            .values(sync_version=households.c.sync_version + len(household_rows), updated_at=households.c.updated_at)
+            .returning(households.c.sync_version)
+        ).scalar_one()
+        for offset, row in enumerate(household_rows, start=last - len(household_rows) + 1):
+            row["version"] = offset
+    connection.execute(insert(ChangeLog), rows)
+
+
+def _sync_target(obj) -> Optional[Tuple[str, int, int]]:
+    """
+    Resolve the synced (entity_type, entity_id, household_id) for a changed object.
+
+    Models declare `__sync_entity__` to be synced directly, or
+    `__sync_parent__` (a relationship name) when a change should resync the
+    parent, as shopping list items do for their list.
+    """
+    entity_type = getattr(obj, "__sync_entity__", None)
+    if entity_type is not None:
+        return entity_type, obj.id, obj.household_id
+
+    parent_attr = getattr(obj, "__sync_parent__", None)
+    if parent_attr is not None:
+        parent = getattr(obj, parent_attr)
+        if parent is not None:
+            return _sync_target(parent)
+
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session: Session, flush_context):
+    """Append a change_log row for every synced entity touched in this flush."""
+    changes: Dict[Tuple[str, int], Tuple[int, str]] = {}
+
+    for obj in list(session.new) + [o for o in session.dirty if session.is_modified(o)]:
+        target = _sync_target(obj)
+        if target is not None and target[2] is not None:
+            changes.setdefault(target[:2], (target[2], UPSERT))
+
+    for obj in session.deleted:
+        target = _sync_target(obj)
+        if target is None or target[2] is None:
+            continue
+        # A deleted child only modifies its parent; a deleted entity is a tombstone
+        operation = DELETE if getattr(obj, "__sync_entity__", None) else UPSERT
+        if operation == DELETE or target[:2] not in changes:
+            changes[target[:2]] = (target[2], operation)
+
+    if changes:
+        _append(session.connection(), [
+            {"household_id": household_id, "entity_type": entity_type, "entity_id": entity_id, "operation": operation}
+            for (entity_type, entity_id), (household_id, operation) in changes.items()
+        ])
+
+
+def record_changes(db: Session, household_id: int, entity_type: str, entity_ids: List[int], operation: str = UPSERT):
+    """Log changes made outside the ORM flush, e.g. bulk INSERT/UPDATE statements."""
+    if entity_ids:
+        _append(db.connection(), [
+            {"household_id": household_id, "entity_type": entity_type, "entity_id": entity_id, "operation": operation}
+            for entity_id in entity_ids
+        ])
@@ -0,0 +1,259 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+import numpy as np
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.inventory import InventoryItem, Product, UnitType
+from app.services.units import UnitProfile, can_convert, convert, convert_many, profile_for
+from app.services.eat_first import compute_eat_by
+from app.db.change_log import record_changes
+from app.db.cache_invalidation import invalidate_household
+from app.db.unit_of_work import record_action, record_usage_events
+from app.db.usage_log import record_consumption
+
+# Remainders below this (in the lot's unit) count as used up, absorbing float error
+_EPSILON = 1e-9
+
+
+class InsufficientQuantityError(Exception):
+    """Raised when the matching lots hold less than the requested quantity."""
+
+    def __init__(self, available: float, unit: UnitType):
+        super().__init__(f"Only {available:g} {unit.value} available")
+        self.available = available
+        self.unit = unit
+
+
+def mark_consumed(item: InventoryItem):
+    """Move a used-up item to the consumed state; the row is kept for history."""
+    item.quantity = 0
+    item.is_consumed = True
+    item.consumed_date = datetime.now(timezone.utc)
+
+
+def decrement_quantity(
+    db: Session,
+    item: InventoryItem,
+    amount: float,
+    user_id: Optional[int] = None
+) -> Optional[float]:
+    """
+    Atomically subtract `amount` from an item's quantity.
+
+    Returns the remaining quantity, or None if the item is consumed, wasted
+    or has less than `amount` left. See decrement_quantities.
+    """
+    return decrement_quantities(db, [(item, amount)], user_id)[0]
+
+
+def decrement_quantities(
+    db: Session,
+    usages: List[Tuple[InventoryItem, float]],
+    user_id: Optional[int] = None
+) -> List[Optional[float]]:
+    """
+    Atomically subtract amounts from the quantities of several items.
+
+    Runs a single `UPDATE ... SET quantity = quantity - CASE id ... END
+    WHERE quantity >= CASE id ... END RETURNING ...` for all (item, amount)
+    pairs, so concurrent decrements of the same row serialize on the row
+    lock and none of them is lost. Each item may appear only once. Consumed
+    and wasted items never match. The first use also marks an item opened.
+    Items are refreshed from the RETURNING rows.
+
+    Returns the remaining quantity per pair, None where the item is
+    consumed, wasted or has less than its amount left. The usage events,
+    sync changes, cache invalidations and undo entries are recorded here
+    because the statement bypasses the flush hooks.
+    """
+    if not usages:
+        return []
+
+    items = {item.id: item for item, _ in usages}
+    amounts = {item.id: amount for item, amount in usages}
+    if len(amounts) != len(usages):
+        raise ValueError("Each item may be decremented only once per statement")
+    amount = case(amounts, value=InventoryItem.id)
+
+    was_opened = {item_id: (item.is_opened, item.opened_date) for item_id, item in items.items()}
+    values = {"quantity": InventoryItem.quantity - amount, "is_opened": True}
+    unopened = [item for item in items.values() if item.opened_date is None]
+    if unopened:
+        # Opening shortens the shelf life, so the eat-by rank moves too
+        now = datetime.now(timezone.utc)
+        values["opened_date"] = func.coalesce(InventoryItem.opened_date, now)
+        values["eat_by"] = case(
+            {item.id: compute_eat_by(item.category, item.expiration_date, item.purchase_date, now) for item in unopened},
+            value=InventoryItem.id,
+            else_=InventoryItem.eat_by
+        )
+
+    rows = db.execute(
+        update(InventoryItem)
+        .where(
+            InventoryItem.id.in_(list(amounts)),
+            InventoryItem.quantity >= amount,
+            InventoryItem.is_consumed == False,
+            InventoryItem.is_wasted == False
+        )
+        .values(**values)
+        .returning(
+            InventoryItem.id,
+            InventoryItem.quantity,
+            InventoryItem.opened_date,
+            InventoryItem.eat_by,
+            InventoryItem.updated_at
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    remaining = {}
+    changed = defaultdict(list)
+    for row in rows:
+        item = items[row.id]
+        for key in ("quantity", "opened_date", "eat_by", "updated_at"):
+            set_committed_value(item, key, getattr(row, key))
+        set_committed_value(item, "is_opened", True)
+
+        old_state, new_state = {"quantity": row.quantity + amounts[row.id]}, {"quantity": row.quantity}
+        opened, opened_date = was_opened[row.id]
+        if not opened:
+            old_state.update(is_opened=False, opened_date=opened_date)
+            new_state.update(is_opened=True, opened_date=row.opened_date)
+        record_action(db, "inventory_item", item.id, old_state, new_state)
+
+        remaining[row.id] = row.quantity
+        if item.household_id is not None:
+            changed[item.household_id].append(item.id)
+
+    used = [(items[item_id], amounts[item_id]) for item_id in remaining]
+    record_usage_events(db, record_consumption(db, user_id, used))
+    for household_id, item_ids in changed.items():
+        record_changes(db, household_id, "inventory_item", item_ids)
+        invalidate_household(db, household_id)
+
+    return [remaining.get(item.id) for item, _ in usages]
+
+
+def _lots_query(db: Session, household_id: int, barcode: Optional[str], name: Optional[str]):
+    """Non-wasted lots of one product, by barcode or else case-insensitive name."""
+    query = db.query(InventoryItem).filter(
+        InventoryItem.household_id == household_id,
+        InventoryItem.is_wasted == False,
+        InventoryItem.is_consumed == False,
+        InventoryItem.quantity > 0
+    )
+    if barcode:
+        return query.filter(InventoryItem.barcode == barcode)
+    return query.filter(func.lower(InventoryItem.name) == name.strip().lower())
+
+
+def _matching_lots(db: Session, household_id: int, barcode: Optional[str], name: Optional[str]):
+    """Lots of one product, oldest expiration first, locked for update."""
+    return _lots_query(db, household_id, barcode, name).order_by(
+        InventoryItem.expiration_date.asc().nulls_last(),
+        InventoryItem.purchase_date.asc(),
+        InventoryItem.id.asc()
+    ).with_for_update(skip_locked=True).all()
+
+
+def _unit_profile(db: Session, barcode: Optional[str], name: Optional[str]) -> UnitProfile:
+    """Density and each-weight of the matching master Product, if any."""
+    query = db.query(Product)
+    if barcode:
+        query = query.filter(Product.barcode == barcode)
+    else:
+        query = query.filter(func.lower(Product.name) == name.strip().lower())
+    return profile_for(query.order_by(Product.id).first())
+
+
+def product_total(
+    db: Session,
+    household_id: int,
+    unit: UnitType,
+    barcode: Optional[str] = None,
+    name: Optional[str] = None
+) -> Tuple[float, int, int]:
+    """
+    Total of a product across its lots, converted to `unit`.
+
+    Returns (total, lots counted, lots whose unit could not be converted).
+    """
+    rows = _lots_query(db, household_id, barcode, name).with_entities(
+        InventoryItem.quantity, InventoryItem.unit
+    ).all()
+    if not rows:
+        return 0.0, 0, 0
+
+    profile = _unit_profile(db, barcode, name)
+    quantities, units = zip(*rows)
+    converted = convert_many(
+        quantities,
+        units,
+        unit,
+        densities=np.full(len(rows), profile.density if profile.density is not None else np.nan),
+        each_weights=np.full(len(rows), profile.each_weight if profile.each_weight is not None else np.nan)
+    )
+    convertible = ~np.isnan(converted)
+    return float(converted[convertible].sum()), int(convertible.sum()), int((~convertible).sum())
+
+
+def consume_product(
+    db: Session,
+    household_id: int,
+    quantity: float,
+    unit: UnitType,
+    barcode: Optional[str] = None,
+    name: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> List[Tuple[InventoryItem, float, bool]]:
+    """
+    Use `quantity` of a product across its lots, first to expire first (FIFO).
+
+    Lots are matched by barcode, or else by case-insensitive name, and
+    locked with `FOR UPDATE SKIP LOCKED`: a lot another request is already
+    consuming is skipped rather than waited on. Lots whose unit cannot be
+    converted to `unit` (using the Product's density and each-weight) are
+    ignored. Used-up lots move to the consumed
+    state, and one usage event is appended per lot. Item changes go through
+    the flush, so a grouped `unit_of_work` records one undo entry.
+
+    Returns (lot, quantity used in the lot's unit, used up) triples.
+
+    Raises:
+        InsufficientQuantityError: if the lots hold less than `quantity`;
+            nothing is changed
+    """
+    profile = _unit_profile(db, barcode, name)
+    lots = [
+        lot for lot in _matching_lots(db, household_id, barcode, name)
+        if can_convert(lot.unit, unit, profile)
+    ]
+
+    available = sum(convert(lot.quantity, lot.unit, unit, profile) for lot in lots)
+    if available < quantity - _EPSILON:
+        raise InsufficientQuantityError(available, unit)
+
+    used, remaining = [], quantity
+    now = datetime.now(timezone.utc)
+    for lot in lots:
+        if remaining <= _EPSILON:
+            break
+
+        take = min(convert(remaining, unit, lot.unit, profile), lot.quantity)
+        remaining -= convert(take, lot.unit, unit, profile)
+        depleted = lot.quantity - take <= _EPSILON
+        used.append((lot, take, depleted))
+
+        if depleted:
+            mark_consumed(lot)
+        else:
+            lot.quantity = round(lot.quantity - take, 9)
+            if not lot.is_opened:
+                lot.is_opened = True
+                lot.opened_date = now
+
+    record_usage_events(db, record_consumption(db, user_id, [(lot, take) for lot, take, _ in used]))
+    return used
@@ -0,0 +1,32 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Query, Session
+from app.models.inventory import InventoryItem
+from app.services.eat_first import compute_eat_by
+
+
+def item_eat_by(item: InventoryItem):
+    """compute_eat_by() for an item, or a dict of its column values."""
+    get = item.get if isinstance(item, dict) else lambda key: getattr(item, key)
+    return compute_eat_by(get("category"), get("expiration_date"), get("purchase_date"), get("opened_date"))
+
+
+@event.listens_for(InventoryItem, "before_insert")
+@event.listens_for(InventoryItem, "before_update")
+def _maintain_eat_by(mapper, connection, target: InventoryItem):
+    """Keep the stored eat_by in step with every ORM write of an item."""
+    target.eat_by = item_eat_by(target)
+
+
+def eat_first_query(db: Session, household_id: int) -> Query:
+    """
+    Live items of a household, soonest eat-by first.
+
+    Served by ix_inventory_items_eat_first, so the top N is an index range
+    scan whatever the size of the inventory. Shared by /inventory/eat-first
+    and meal suggestions.
+    """
+    return db.query(InventoryItem).filter(
+        InventoryItem.household_id == household_id,
+        InventoryItem.is_wasted == False,
+        InventoryItem.is_consumed == False
+    ).order_by(InventoryItem.eat_by.asc(), InventoryItem.id.asc())
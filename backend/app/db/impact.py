@@ -0,0 +1,73 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict
+from sqlalchemy import and_, literal, select, union_all
+from sqlalchemy.orm import Session
+from app.db.archive import all_inventory_items
+from app.models.consumption import ConsumptionEvent
+from app.models.inventory import Product
+from app.services.impact import CONSUMED, WASTED, compute_impact
+
+
+def household_impact(db: Session, household_id: int, start: date, end: date) -> Dict[str, Any]:
+    """
+    Impact of the food a household used up and wasted from `start` through `end`.
+
+    Usage events (undo reversals included) and wasted items, live and
+    archived, come back as one UNION ALL with their product's footprint
+    matched by barcode; compute_impact totals the columns with NumPy.
+    """
+    since = datetime.combine(start, time.min)
+    until = datetime.combine(end + timedelta(days=1), time.min)
+    items = all_inventory_items.c
+    events = ConsumptionEvent
+
+    used = select(
+        literal(CONSUMED).label("kind"),
+        events.quantity,
+        events.unit,
+        events.category,
+        items.price,
+        items.original_quantity,
+        events.barcode
+    ).select_from(
+        # Price share comes from the item; events outlive deleted items
+        events.__table__.outerjoin(all_inventory_items, items.id == events.item_id)
+    ).where(
+        events.household_id == household_id,
+        events.created_at >= since,
+        events.created_at < until
+    )
+
+    wasted = select(
+        literal(WASTED).label("kind"),
+        items.quantity,
+        items.unit,
+        items.category,
+        items.price,
+        items.original_quantity,
+        items.barcode
+    ).where(
+        items.household_id == household_id,
+        items.is_wasted == True,
+        items.wasted_date >= since,
+        items.wasted_date < until
+    )
+
+    rows = union_all(used, wasted).subquery("impact_rows")
+    result = db.execute(
+        select(
+            rows.c.kind,
+            rows.c.quantity,
+            rows.c.unit,
+            rows.c.category,
+            rows.c.price,
+            rows.c.original_quantity,
+            Product.density_g_per_ml,
+            Product.each_weight_g,
+            Product.co2e_kg_per_kg,
+            Product.water_l_per_kg
+        ).outerjoin(Product, and_(rows.c.barcode != None, Product.barcode == rows.c.barcode))
+    ).all()
+
+    columns = list(zip(*result)) if result else [()] * 10
+    return compute_impact(*columns)
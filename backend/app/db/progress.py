@@ -0,0 +1,186 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.analytics import DailyRollup, HouseholdProgress
+from app.services.achievements import COUNTERS, advance, empty_progress
+
+# Rollup measure feeding each progress counter
+_MEASURES = {"items_added": "items_added", "items_consumed": "consumed_count", "items_wasted": "waste_count"}
+
+_STATE_COLUMNS = ("first_day", "last_waste_day", "longest_streak", *COUNTERS, "badges")
+
+# Dialects with INSERT ... ON CONFLICT
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _daily_counts(deltas) -> Dict[int, Dict[date, Dict[str, int]]]:
+    """Rollup deltas summed per household and day, keeping days with count changes."""
+    counts = defaultdict(lambda: defaultdict(lambda: dict.fromkeys(COUNTERS, 0)))
+    for (household_id, day, _), measures in deltas.items():
+        for counter, measure in _MEASURES.items():
+            if measures.get(measure):
+                counts[household_id][day][counter] += measures[measure]
+    return counts
+
+
+def replay_progress(db: Session, household_id: int, badges: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Rebuild a household's progress from its daily rollups.
+
+    Badges already earned can be passed in to keep them (badges are never
+    taken back, even when undo reverses the events that earned them).
+    """
+    progress = empty_progress()
+    days = db.connection().execute(
+        select(
+            DailyRollup.day,
+            func.sum(DailyRollup.items_added),
+            func.sum(DailyRollup.consumed_count),
+            func.sum(DailyRollup.waste_count)
+        ).where(DailyRollup.household_id == household_id)
+        .group_by(DailyRollup.day)
+        .order_by(DailyRollup.day)
+    )
+    for day, added, consumed, wasted in days:
+        if added or consumed or wasted:
+            advance(progress, day, added, consumed, wasted)
+
+    for code, earned_at in (badges or {}).items():
+        progress["badges"][code] = min(earned_at, progress["badges"].get(code, earned_at))
+    return progress
+
+
+def _state(row) -> Dict[str, Any]:
+    state = {column: getattr(row, column) for column in _STATE_COLUMNS}
+    state["badges"] = dict(state["badges"] or {})
+    return state
+
+
+def _lock(db: Session, household_id: int) -> Dict[str, Any]:
+    """Lock a household's progress row, creating it if needed, and return its state (replay only)."""
+    table = HouseholdProgress.__table__
+    connection = db.connection()
+    connection.execute(
+        _INSERTS[connection.dialect.name](table)
+        .values(household_id=household_id)
+        .on_conflict_do_nothing(index_elements=["household_id"])
+    )
+    return _state(connection.execute(
+        select(table).where(table.c.household_id == household_id).with_for_update()
+    ).one())
+
+
+def save_progress(db: Session, household_id: int, progress: Dict[str, Any]):
+    table = HouseholdProgress.__table__
+    db.connection().execute(
+        update(table)
+        .where(table.c.household_id == household_id)
+        .values(
+            **{column: progress[column] for column in _STATE_COLUMNS},
+            needs_replay=False,
+            revision=table.c.revision + 1
+        )
+    )
+
+
+def _mark_for_replay(connection, household_id: int):
+    """Flag a household's progress as stale; reads replay it until the job stores it."""
+    table = HouseholdProgress.__table__
+    connection.execute(
+        _INSERTS[connection.dialect.name](table)
+        .values(household_id=household_id, needs_replay=True)
+        .on_conflict_do_update(
+            index_elements=["household_id"],
+            set_={"needs_replay": True, "revision": table.c.revision + 1, "updated_at": func.now()}
+        )
+    )
+
+
+def update_progress(db: Session, deltas):
+    """
+    Advance streaks and badge progress with a flush's rollup deltas.
+
+    Called from app/db/rollups.py in the writing transaction. The household
+    row is read without a lock and written back only if its `revision` is
+    unchanged, so writers never wait on each other here. Days that cannot
+    be applied in order (reversed waste, backdated events), and the rare
+    write that loses the race to a concurrent one, mark the row
+    `needs_replay` instead: reads replay it from the rollups and the replay
+    job stores the result. The replay never runs on the write path.
+    """
+    table = HouseholdProgress.__table__
+    connection = db.connection()
+
+    for household_id, days in _daily_counts(deltas).items():
+        row = connection.execute(select(table).where(table.c.household_id == household_id)).first()
+        if row is not None and row.needs_replay:
+            continue  # The stored state is replaced by the next replay anyway
+
+        progress = _state(row) if row is not None else empty_progress()
+        in_order = all(
+            advance(progress, day, days[day]["items_added"], days[day]["items_consumed"], days[day]["items_wasted"])
+            for day in sorted(days)
+        )
+        if not in_order:
+            _mark_for_replay(connection, household_id)
+            continue
+
+        state = {column: progress[column] for column in _STATE_COLUMNS}
+        if row is None:
+            written = connection.execute(
+                _INSERTS[connection.dialect.name](table)
+                .values(household_id=household_id, **state)
+                .on_conflict_do_nothing(index_elements=["household_id"])
+            ).rowcount
+        else:
+            written = connection.execute(
+                update(table)
+                .where(table.c.household_id == household_id, table.c.revision == row.revision)
+                .values(**state, revision=row.revision + 1)
+            ).rowcount
+        if not written:
+            _mark_for_replay(connection, household_id)
+
+
+def get_progress(db: Session, household_id: int) -> Dict[str, Any]:
+    """
+    A household's progress: one primary key lookup, plus a replay from the
+    rollups (not stored) while the row is marked `needs_replay`.
+    """
+    row = db.get(HouseholdProgress, household_id)
+    if row is None:
+        return empty_progress()
+    progress = _state(row)
+    if row.needs_replay:
+        progress = replay_progress(db, household_id, progress["badges"])
+    return progress
+
+
+def rebuild_progress(db: Session, household_id: Optional[int] = None, stale_only: bool = False) -> Dict[int, bool]:
+    """
+    Replay progress from history for one or all households and store it.
+
+    `stale_only` limits it to households marked `needs_replay`. Returns,
+    per household, whether the stored state already matched the replay
+    (earned badges are kept either way). Commits.
+    """
+    if household_id is not None:
+        household_ids = [household_id]
+    elif stale_only:
+        household_ids = db.execute(
+            select(HouseholdProgress.household_id).where(HouseholdProgress.needs_replay == True)
+        ).scalars().all()
+    else:
+        household_ids = db.execute(select(DailyRollup.household_id).distinct()).scalars().all()
+
+    matches = {}
+    for household_id in household_ids:
+        stored = _lock(db, household_id)
+        replayed = replay_progress(db, household_id, stored["badges"])
+        matches[household_id] = replayed == stored
+        save_progress(db, household_id, replayed)
+        db.commit()
+    return matches
@@ -0,0 +1,93 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in strict mode when one statement repeats too often in a request."""
+
+
+class QueryStats:
+    """SQL statement count and time accumulated over one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+
+    def most_repeated(self):
+        """Return (statement, count) for the most frequently executed statement."""
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request_stats() -> QueryStats:
+    """Begin collecting stats for the current request context."""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def stop_request_stats():
+    """Stop collecting stats in the current context, e.g. for background work after the response."""
+    _current_stats.set(None)
+
+
+def get_request_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def report_request_stats(stats: QueryStats, path: str):
+    """Log a warning when a request ran too many statements or looks like N+1."""
+    statement, repeats = stats.most_repeated()
+
+    if stats.count > settings.DB_QUERY_WARN_THRESHOLD:
+        logger.warning(
+            "%s ran %d SQL statements in %.1f ms", path, stats.count, stats.total_ms
+        )
+
+    if repeats > settings.DB_NPLUSONE_THRESHOLD:
+        logger.warning(
+            "Possible N+1 on %s: statement executed %d times: %s", path, repeats, statement
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, so a failed statement leaves nothing behind
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = context._query_start_time
+    stats = _current_stats.get()
+    if stats is None:
+        return
+
+    stats.record(statement, (time.perf_counter() - start) * 1000)
+
+    if settings.DB_QUERY_STRICT and stats.statements[statement] > settings.DB_NPLUSONE_THRESHOLD:
+        raise NPlusOneError(
+            f"Statement executed {stats.statements[statement]} times in one request: {statement}"
+        )
+
+
+def install_query_stats(engine: Engine):
+    """Attach statement counting and timing listeners to an engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,208 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import Date, and_, delete, event, func, inspect, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.db.archive import all_inventory_items
+from app.models.analytics import DailyRollup
+from app.models.inventory import InventoryItem
+from app.db.progress import update_progress
+
+MEASURES = ("spend", "items_added", "waste_count", "waste_value", "consumed_count")
+
+# InventoryItem columns that feed the rollups
+_SOURCE_COLUMNS = (
+    "household_id", "category", "price", "purchase_date",
+    "is_wasted", "wasted_date", "is_consumed", "consumed_date"
+)
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+RollupKey = Tuple[int, date, Any]
+
+
+def _day(value: Optional[datetime]) -> Optional[date]:
+    """UTC calendar day of a timestamp, matching date() on the stored value."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _contribution(values: Dict[str, Any]) -> Dict[RollupKey, Counter]:
+    """What one item adds to the rollups, given its column values."""
+    totals = defaultdict(Counter)
+    household_id, category = values.get("household_id"), values.get("category")
+    if household_id is None or category is None:
+        return totals
+
+    price = values.get("price") or 0
+    purchased = _day(values.get("purchase_date"))
+    if purchased is not None:
+        totals[(household_id, purchased, category)].update(spend=price, items_added=1)
+
+    wasted = _day(values.get("wasted_date"))
+    if values.get("is_wasted") and wasted is not None:
+        totals[(household_id, wasted, category)].update(waste_count=1, waste_value=price)
+
+    consumed = _day(values.get("consumed_date"))
+    if values.get("is_consumed") and consumed is not None:
+        totals[(household_id, consumed, category)].update(consumed_count=1)
+
+    return totals
+
+
+def _values(obj, old: bool) -> Dict[str, Any]:
+    """Source column values of an item before (old) or after this flush."""
+    state = inspect(obj)
+    values = {}
+    for key in _SOURCE_COLUMNS:
+        history = state.attrs[key].history
+        values[key] = history.deleted[0] if old and history.deleted else getattr(obj, key)
+    return values
+
+
+def _accumulate(deltas: Dict[RollupKey, Counter], values: Dict[str, Any], sign: int):
+    for key, measures in _contribution(values).items():
+        for measure, amount in measures.items():
+            deltas[key][measure] += sign * amount
+
+
+def apply_deltas(db: Session, deltas: Dict[RollupKey, Counter]):
+    """
+    Add measure deltas to the rollup rows, creating missing rows.
+
+    One multi-row INSERT ... ON CONFLICT DO UPDATE in the caller's
+    transaction; keys are unique, as PostgreSQL requires within a statement.
+    Streaks and badges advance with the same deltas.
+    """
+    rows = [
+        {"household_id": household_id, "day": day, "category": category,
+         **{measure: measures.get(measure, 0) for measure in MEASURES}}
+        for (household_id, day, category), measures in deltas.items()
+        if any(measures.values())
+    ]
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    upsert = _UPSERT_INSERTS[dialect](DailyRollup)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=["household_id", "day", "category"],
+        set_={measure: DailyRollup.__table__.c[measure] + upsert.excluded[measure] for measure in MEASURES}
+    )
+    db.connection().execute(upsert, rows)
+    update_progress(db, deltas)
+
+
+def _accumulate_update(deltas: Dict[RollupKey, Counter], obj: InventoryItem):
+    """Replace an item's contribution before its pending changes with the one after."""
+    state = inspect(obj)
+    if not any(state.attrs[key].history.has_changes() for key in _SOURCE_COLUMNS):
+        return
+    _accumulate(deltas, _values(obj, old=True), -1)
+    _accumulate(deltas, _values(obj, old=False), 1)
+
+
+def record_rollups(db: Session, items: Iterable[InventoryItem]):
+    """Add newly inserted items to the rollups, for inserts that skip the flush."""
+    deltas = defaultdict(Counter)
+    for item in items:
+        _accumulate(deltas, {key: getattr(item, key) for key in _SOURCE_COLUMNS}, 1)
+    apply_deltas(db, deltas)
+
+
+def record_rollup_updates(db: Session, items: Iterable[InventoryItem]):
+    """Apply the pending changes of items to the rollups, for updates that skip the flush."""
+    deltas = defaultdict(Counter)
+    for item in items:
+        _accumulate_update(deltas, item)
+    apply_deltas(db, deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_rollups(session: Session, flush_context):
+    """
+    Apply the rollup deltas of inventory items changed in this flush.
+
+    Each item's contribution before the flush is subtracted and its
+    contribution after added, so inserts, updates (waste, use, undo, price
+    or date corrections) and deletes all stay in step, in the same
+    transaction as the write.
+    """
+    deltas = defaultdict(Counter)
+
+    for obj in session.new:
+        if isinstance(obj, InventoryItem):
+            _accumulate(deltas, _values(obj, old=False), 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, InventoryItem):
+            _accumulate_update(deltas, obj)
+
+    for obj in session.deleted:
+        if isinstance(obj, InventoryItem):
+            _accumulate(deltas, _values(obj, old=True), -1)
+
+    apply_deltas(session, deltas)
+
+
+def _source_rows():
+    """Rollup measures per live or archived item event, as one UNION ALL."""
+    items = all_inventory_items.c
+    price = func.coalesce(items.price, 0)
+    zero = literal(0)
+
+    def events(day_column, spend, items_added, waste_count, waste_value, consumed_count, *conditions):
+        return select(
+            items.household_id,
+            func.date(day_column, type_=Date).label("day"),
+            items.category,
+            spend.label("spend"),
+            items_added.label("items_added"),
+            waste_count.label("waste_count"),
+            waste_value.label("waste_value"),
+            consumed_count.label("consumed_count")
+        ).where(items.household_id != None, day_column != None, *conditions)
+
+    return union_all(
+        events(items.purchase_date, price, literal(1), zero, zero, zero),
+        events(items.wasted_date, zero, zero, literal(1), price, zero, items.is_wasted == True),
+        events(items.consumed_date, zero, zero, zero, zero, literal(1), items.is_consumed == True)
+    ).subquery("rollup_events")
+
+
+def rebuild_rollups(db: Session, household_id: Optional[int] = None) -> int:
+    """
+    Recompute rollups from live and archived items with one INSERT ... SELECT.
+
+    Used to backfill existing data and to repair drift. Limited to one
+    household when `household_id` is given. Returns the rows written.
+    """
+    source = _source_rows()
+    grouped = select(
+        source.c.household_id,
+        source.c.day,
+        source.c.category,
+        *[func.sum(source.c[measure]) for measure in MEASURES]
+    ).group_by(source.c.household_id, source.c.day, source.c.category)
+
+    clear = delete(DailyRollup)
+    if household_id is not None:
+        grouped = grouped.where(source.c.household_id == household_id)
+        clear = clear.where(DailyRollup.household_id == household_id)
+
+    db.execute(clear)
+    result = db.execute(insert(DailyRollup).from_select(
+        ["household_id", "day", "category", *MEASURES], grouped
+    ))
+    db.commit()
+    return result.rowcount
+
+
+def rollup_range(household_id: int, start_day: date):
+    """Filter for a household's rollup rows from `start_day` on."""
+    return and_(DailyRollup.household_id == household_id, DailyRollup.day >= start_day)
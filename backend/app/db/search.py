@@ -0,0 +1,74 @@
+from typing import Any, List, Tuple
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Query
+
+# pg_trgm cannot index patterns shorter than one trigram
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _is_postgres(query: Query) -> bool:
+    return query.session.get_bind().dialect.name == "postgresql"
+
+
+def apply_text_search(query: Query, columns: List, term: str) -> Query:
+    """Filter a query to rows where any of `columns` matches `term`, ordered by relevance (see text_search)."""
+    query, ranking = text_search(query, columns, term)
+    return query.order_by(*[expression.desc() if descending else expression for expression, descending in ranking])
+
+
+def text_search(query: Query, columns: List, term: str) -> Tuple[Query, List[Tuple[Any, bool]]]:
+    """
+    Filter a query to rows where any of `columns` matches `term`.
+
+    Returns the filtered query and its relevance ordering as (expression,
+    descending) pairs, most significant first, for callers that page
+    through the results; the ordering is empty for a blank term.
+
+    On PostgreSQL, terms of three or more characters use the pg_trgm GIN indexes
+    (`ILIKE '%term%'` or trigram similarity), ranked by `similarity()`. Shorter
+    terms fall back to an indexed `lower(col) LIKE 'term%'` prefix match. Other
+    dialects (SQLite test runs) rank exact, prefix, word-prefix and substring
+    matches in that order.
+    """
+    term = term.strip()
+    if not term:
+        return query, []
+
+    lowered = term.lower()
+    escaped = _escape_like(lowered)
+
+    if len(term) < TRIGRAM_MIN_LENGTH:
+        query = query.filter(or_(
+            *[func.lower(col).like(f"{escaped}%", escape="\\") for col in columns]
+        ))
+    elif _is_postgres(query):
+        query = query.filter(or_(
+            *[col.ilike(f"%{escaped}%", escape="\\") for col in columns],
+            *[col.op("%")(term) for col in columns]
+        ))
+    else:
+        query = query.filter(or_(
+            *[func.lower(col).like(f"%{escaped}%", escape="\\") for col in columns]
+        ))
+
+    if _is_postgres(query):
+        scores = [func.coalesce(func.similarity(col, term), 0) for col in columns]
+        score = func.greatest(*scores) if len(scores) > 1 else scores[0]
+        return query, [(score, True), (func.length(columns[0]), False)]
+
+    ranks = [
+        case(
+            (func.lower(col) == lowered, 0),
+            (func.lower(col).like(f"{escaped}%", escape="\\"), 1),
+            (func.lower(col).like(f"% {escaped}%", escape="\\"), 2),
+            else_=3
+        )
+        for col in columns
+    ]
+    rank = func.min(*ranks) if len(ranks) > 1 else ranks[0]
+    return query, [(rank, False), (func.length(columns[0]), False)]
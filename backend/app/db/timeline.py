@@ -0,0 +1,146 @@
+import enum
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+from zoneinfo import ZoneInfo
+from sqlalchemy import DateTime, bindparam, cast, func, null, select
+from sqlalchemy.dialects.postgresql import INTERVAL
+from sqlalchemy.orm import Session
+from app.db.archive import all_inventory_items
+from app.models.inventory import ItemCategory
+
+
+class TimelineInterval(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"  # ISO weeks, starting Monday
+    MONTH = "month"
+
+
+def _floor(day: date, interval: TimelineInterval) -> date:
+    if interval == TimelineInterval.WEEK:
+        return day - timedelta(days=day.weekday())
+    if interval == TimelineInterval.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _next(bucket: date, interval: TimelineInterval) -> date:
+    if interval == TimelineInterval.WEEK:
+        return bucket + timedelta(days=7)
+    if interval == TimelineInterval.MONTH:
+        return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+
+def _local_day(value: datetime, tz: ZoneInfo) -> date:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # Stored in UTC
+    return value.astimezone(tz).date()
+
+
+def _postgresql_rows(db: Session, purchases, start: datetime, tz: ZoneInfo, interval: TimelineInterval, by_category: bool):
+    """(bucket, category, total) rows, gap-filled with generate_series, in one statement."""
+    unit = interval.value
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    local_start = func.timezone(tz.key, bindparam("start", start, type_=DateTime(timezone=True)))
+    local_now = func.timezone(tz.key, func.now())
+
+    bucket = func.date_trunc(unit, func.timezone(tz.key, purchases.c.purchase_date))
+    groups = [bucket, purchases.c.category] if by_category else [bucket]
+    totals = select(
+        bucket.label("bucket"),
+        (purchases.c.category if by_category else null()).label("category"),
+        func.sum(func.coalesce(purchases.c.price, 0)).label("total")
+    ).group_by(*groups).subquery("totals")
+
+    series = func.generate_series(
+        func.date_trunc(unit, local_start),
+        func.date_trunc(unit, local_now),
+        cast(f"1 {unit}", INTERVAL)
+    ).table_valued("bucket").alias("series")
+
+    return [
+        (row.bucket.date(), row.category, row.total)
+        for row in db.execute(
+            select(series.c.bucket, totals.c.category, totals.c.total)
+            .select_from(series.outerjoin(totals, totals.c.bucket == series.c.bucket))
+            .order_by(series.c.bucket)
+        )
+    ]
+
+
+def _portable_rows(db: Session, purchases, start: datetime, tz: ZoneInfo, interval: TimelineInterval, by_category: bool):
+    """Fallback without time zone support in SQL: bucket the window's purchases here."""
+    totals = {}
+    for purchase_date, category, price in db.execute(select(
+        purchases.c.purchase_date, purchases.c.category, purchases.c.price
+    )):
+        key = (_floor(_local_day(purchase_date, tz), interval), category if by_category else None)
+        totals[key] = totals.get(key, 0) + (price or 0)
+
+    rows = [(bucket, category, total) for (bucket, category), total in totals.items()]
+    buckets = {bucket for bucket, _, _ in rows}
+    bucket = _floor(_local_day(start, tz), interval)
+    last = _floor(_local_day(datetime.now(timezone.utc), tz), interval)
+    while bucket <= last:
+        if bucket not in buckets:
+            rows.append((bucket, None, None))
+        bucket = _next(bucket, interval)
+    return sorted(rows, key=lambda row: row[0])
+
+
+def _purchases(household_id: int, start: datetime):
+    """Purchases (live and archived) of a household since `start`."""
+    items = all_inventory_items.c
+    return select(items.purchase_date, items.category, items.price).where(
+        items.household_id == household_id,
+        items.purchase_date >= start
+    ).subquery("purchases")
+
+
+def spending_by_category(db: Session, household_id: int, start: datetime) -> List[Tuple[ItemCategory, float, int]]:
+    """(category, total, count) over the same purchases as spending_timeline()."""
+    purchases = _purchases(household_id, start)
+    return db.execute(
+        select(
+            purchases.c.category,
+            func.sum(func.coalesce(purchases.c.price, 0)),
+            func.count()
+        ).group_by(purchases.c.category)
+    ).all()
+
+
+def spending_timeline(
+    db: Session,
+    household_id: int,
+    start: datetime,
+    tz: ZoneInfo,
+    interval: TimelineInterval = TimelineInterval.DAY,
+    by_category: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Spending per day, week or month in the household's time zone.
+
+    Purchases (live and archived) since `start` are bucketed by their local
+    date, and every bucket up to the current one is present, with a zero
+    total when nothing was bought. With `by_category` each bucket also
+    carries per-category totals, for stacked charts. PostgreSQL buckets and
+    gap-fills in the database; other dialects fall back to Python.
+    """
+    purchases = _purchases(household_id, start)
+
+    fetch = _postgresql_rows if db.get_bind().dialect.name == "postgresql" else _portable_rows
+    timeline = {}
+    for bucket, category, total in fetch(db, purchases, start, tz, interval, by_category):
+        point = timeline.setdefault(bucket, {"date": bucket.isoformat(), "total": 0.0})
+        if by_category:
+            point.setdefault("categories", {})
+        if total is None:
+            continue
+        point["total"] += float(total)
+        if by_category:
+            point["categories"][category.value] = round(float(total), 2)
+
+    for point in timeline.values():
+        point["total"] = round(point["total"], 2)
+    return list(timeline.values())
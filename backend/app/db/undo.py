@@ -0,0 +1,261 @@
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import DateTime, Enum as SQLEnum, and_, delete, func, inspect, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.db.session import Base
+from app.models.inventory import UserAction
+from app.db.usage_log import replay_consumption
+
+# Stored states, per entity:
+#   created  -> old None, new full snapshot (every tracked column, None included)
+#   deleted  -> old full snapshot (None values omitted), new None
+#   updated  -> old/new hold only the changed columns
+# Grouped actions (is_group) key those states by entity id. Usage events the
+# action appended are listed in usage_event_ids and replayed, never re-derived.
+#
+# Undo and redo only apply while the entity still holds the state the action
+# left (resp. found); otherwise they raise UndoConflict. Recording a new action
+# marks the user's undone actions superseded, which clears the redo stack.
+
+# Columns that change on every write or are derived on write; they carry no undo information
+UNTRACKED_COLUMNS = {"created_at", "updated_at", "eat_by"}
+
+
+class UndoConflict(Exception):
+    """The entity no longer matches the state the action expects."""
+
+
+def dump_state(state: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Serialize a state compactly for UserAction.old_state/new_state."""
+    return json.dumps(state, default=str, separators=(",", ":")) if state is not None else None
+
+
+def _load_state(raw: Optional[str]):
+    return json.loads(raw) if raw else None
+
+
+def _undo_models() -> Dict[str, type]:
+    return {
+        mapper.class_.__undo_entity__: mapper.class_
+        for mapper in Base.registry.mappers
+        if hasattr(mapper.class_, "__undo_entity__")
+    }
+
+
+def _coerce(model, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert JSON values back to the column types of `model`."""
+    columns = inspect(model).columns
+    values = {}
+    for key, value in state.items():
+        column_type = columns[key].type
+        if value is not None and isinstance(column_type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column_type, SQLEnum) and column_type.enum_class:
+            value = column_type.enum_class(value)
+        values[key] = value
+    return values
+
+
+def full_snapshot(obj) -> Dict[str, Any]:
+    """
+    Every tracked column of a row, None included.
+
+    Stored as the state a created (or re-created) row must still hold for
+    undo to delete it, so any later change to it is a conflict.
+    """
+    return {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(obj).mapper.column_attrs
+        if attr.key not in UNTRACKED_COLUMNS
+    }
+
+
+def _comparable(value):
+    # timestamptz columns read back aware, but SQLite and older rows give naive UTC
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _check_unchanged(model, obj, expected: Dict[str, Any]):
+    """Raise UndoConflict unless `obj` still holds the `expected` column values."""
+    for key, value in _coerce(model, expected).items():
+        if _comparable(getattr(obj, key)) != _comparable(value):
+            raise UndoConflict(f"{model.__name__} {obj.id} has changed since ({key})")
+
+
+def _changes(action: UserAction) -> List[Tuple[int, Any, Any]]:
+    """Return (entity_id, old, new) triples for an action."""
+    old, new = _load_state(action.old_state), _load_state(action.new_state)
+    if not action.is_group:
+        return [(action.entity_id, old, new)]
+    ids = list(dict.fromkeys([*(old or {}), *(new or {})]))
+    return [(int(i), (old or {}).get(i), (new or {}).get(i)) for i in ids]
+
+
+def action_entity_ids(action: UserAction) -> List[int]:
+    """Ids of all entities an action touched."""
+    return [entity_id for entity_id, _, _ in _changes(action)]
+
+
+def _transition(db: Session, model, entity_id: int, current, target) -> Optional[Dict[str, Any]]:
+    """
+    Move one entity from `current` to `target` state.
+
+    The row must still hold the `current` values of the columns the action
+    touched, so a later edit by someone else is never silently reverted.
+    Returns the snapshot of a row that was deleted, so the opposite
+    direction can re-create it.
+    """
+    obj = db.get(model, entity_id)
+
+    if target is None:
+        if obj is None:
+            raise UndoConflict(f"{model.__name__} {entity_id} no longer exists")
+        _check_unchanged(model, obj, current)
+        snapshot = full_snapshot(obj)
+        db.delete(obj)
+        return json.loads(dump_state(snapshot))
+
+    if current is None:
+        if obj is not None:
+            raise UndoConflict(f"{model.__name__} {entity_id} already exists")
+        db.add(model(**_coerce(model, {**target, "id": entity_id})))
+        return None
+
+    if obj is None:
+        raise UndoConflict(f"{model.__name__} {entity_id} no longer exists")
+    _check_unchanged(model, obj, current)
+    for key, value in _coerce(model, target).items():
+        setattr(obj, key, value)
+    return None
+
+
+def _replay(db: Session, action: UserAction, undo: bool):
+    model = _undo_models()[action.entity_type]
+    old_states, new_states = {}, {}
+
+    changes = _changes(action)
+    # One query loads every entity into the identity map so db.get() below
+    # issues no SQL; the list keeps them referenced (the map is weak)
+    loaded = db.query(model).filter(model.id.in_([entity_id for entity_id, _, _ in changes])).all()
+
+    for entity_id, old, new in changes:
+        current, target = (new, old) if undo else (old, new)
+        deleted = _transition(db, model, entity_id, current, target)
+        if deleted is not None:
+            # Keep the removed row so the opposite direction can restore it
+            if undo:
+                new = deleted
+            else:
+                old = deleted
+        old_states[str(entity_id)], new_states[str(entity_id)] = old, new
+
+    if action.is_group:
+        action.old_state, action.new_state = dump_state(old_states), dump_state(new_states)
+    else:
+        key = str(action.entity_id)
+        action.old_state, action.new_state = dump_state(old_states[key]), dump_state(new_states[key])
+    action.is_undone = undo
+
+    event_ids = _load_state(action.usage_event_ids)
+    if event_ids:
+        # Usage events are append-only: undo appends reversals, redo re-appends
+        replay_consumption(db, action.user_id, event_ids, -1 if undo else 1)
+
+
+def _ordered_before(action_id: int):
+    """Actions older than `action_id` in (created_at, id) order."""
+    # Compare against the stored timestamp, not a round-tripped Python value
+    created_at = select(UserAction.created_at).where(UserAction.id == action_id).scalar_subquery()
+    return or_(
+        UserAction.created_at < created_at,
+        and_(UserAction.created_at == created_at, UserAction.id < action_id)
+    )
+
+
+def supersede_undone(connection: Connection, user_id: int):
+    """
+    Clear the user's redo stack before a new action is recorded.
+
+    Undone actions are kept for history but marked superseded, so redo
+    never resurrects them after later undos.
+    """
+    connection.execute(
+        update(UserAction)
+        .where(
+            UserAction.user_id == user_id,
+            UserAction.is_undone == True,
+            UserAction.is_superseded == False
+        )
+        .values(is_superseded=True)
+    )
+
+
+def undo_last(db: Session, user_id: int) -> Optional[UserAction]:
+    """Revert the user's most recent action that has not been undone."""
+    action = db.query(UserAction).filter(
+        UserAction.user_id == user_id,
+        UserAction.is_undone == False
+    ).order_by(UserAction.created_at.desc(), UserAction.id.desc()).first()
+    if action is None:
+        return None
+    _replay(db, action, undo=True)
+    db.commit()
+    return action
+
+
+def redo_last(db: Session, user_id: int) -> Optional[UserAction]:
+    """
+    Re-apply the most recently undone action.
+
+    Undo always takes the newest active action, so the undone actions not
+    yet superseded by a new one all follow the active ones; the oldest of
+    them is the top of the redo stack.
+    """
+    action = db.query(UserAction).filter(
+        UserAction.user_id == user_id,
+        UserAction.is_undone == True,
+        UserAction.is_superseded == False
+    ).order_by(UserAction.created_at.asc(), UserAction.id.asc()).first()
+    if action is None:
+        return None
+    _replay(db, action, undo=False)
+    db.commit()
+    return action
+
+
+def compact_history(db: Session, keep: int, batch_size: int = 1000) -> int:
+    """Delete each user's actions beyond the newest `keep`. Returns rows deleted."""
+    if keep < 1:
+        raise ValueError("keep must be at least 1")
+
+    deleted = 0
+    user_ids = [
+        user_id for (user_id,) in db.query(UserAction.user_id)
+        .group_by(UserAction.user_id)
+        .having(func.count(UserAction.id) > keep)
+    ]
+
+    for user_id in user_ids:
+        # The oldest action still inside the window
+        boundary_id = db.query(UserAction.id).filter(
+            UserAction.user_id == user_id
+        ).order_by(UserAction.created_at.desc(), UserAction.id.desc()).offset(keep - 1).limit(1).scalar()
+
+        while True:
+            stale_ids = [
+                action_id for (action_id,) in db.query(UserAction.id).filter(
+                    UserAction.user_id == user_id,
+                    _ordered_before(boundary_id)
+                ).limit(batch_size)
+            ]
+            if not stale_ids:
+                break
+            db.execute(delete(UserAction).where(UserAction.id.in_(stale_ids)))
+            db.commit()
+            deleted += len(stale_ids)
+
+    return deleted
@@ -0,0 +1,232 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session
+from app.models.inventory import UserAction
+from app.db.undo import UNTRACKED_COLUMNS, dump_state, full_snapshot, supersede_undone
+
+_UNDO_CONTEXT_KEY = "undo_context"
+
+
+def _column_keys(obj) -> list:
+    return [attr.key for attr in inspect(obj).mapper.column_attrs if attr.key not in UNTRACKED_COLUMNS]
+
+
+def _deleted_snapshot(obj) -> Dict[str, Any]:
+    """Non-null column values as last loaded from the database."""
+    state = inspect(obj)
+    snapshot = {}
+    for key in _column_keys(obj):
+        history = state.attrs[key].history
+        value = history.deleted[0] if history.deleted else getattr(obj, key)
+        if value is not None:
+            snapshot[key] = value
+    return snapshot
+
+
+def _diff(obj):
+    """Return (old, new) dicts holding only the columns changed in this flush."""
+    state = inspect(obj)
+    old, new = {}, {}
+    for key in _column_keys(obj):
+        history = state.attrs[key].history
+        if not history.has_changes():
+            continue
+        old[key] = history.deleted[0] if history.deleted else None
+        new[key] = history.added[0] if history.added else None
+    return old, new
+
+
+@event.listens_for(Session, "after_flush")
+def _record_user_actions(session: Session, flush_context):
+    """
+    Write a UserAction row for every tracked model changed in this flush.
+
+    Tracked models declare `__undo_entity__`. Rows are written only inside a
+    `unit_of_work` block, on the same connection and transaction as the
+    change itself. In after_flush, new objects already have primary keys and
+    attribute history is still intact.
+
+    States are kept compact where that is safe (see app/db/undo.py):
+    updates store only the changed columns and deletes the non-null
+    columns. Inserts store the full row, which undo checks before deleting
+    it, so an item someone changed since is not deleted with their changes.
+    """
+    context = session.info.get(_UNDO_CONTEXT_KEY)
+    if context is None:
+        return
+
+    entries = []
+    changes = (
+        [(obj, None, full_snapshot(obj)) for obj in session.new]
+        + [(obj, *_diff(obj)) for obj in session.dirty if session.is_modified(obj)]
+        + [(obj, _deleted_snapshot(obj), None) for obj in session.deleted]
+    )
+    for obj, old_state, new_state in changes:
+        entity_type = getattr(obj, "__undo_entity__", None)
+        if entity_type is None or old_state == new_state:
+            continue
+        entries.append((entity_type, obj.id, old_state, new_state))
+
+    _store_entries(session, context, entries)
+
+
+def _store_entries(session: Session, context: Dict[str, Any], entries: list):
+    """Insert one UserAction per entry, or hold them for a grouped unit of work."""
+    if context["group"] is not None:
+        context["group"].extend(entries)
+        return
+
+    rows = [
+        {
+            "user_id": context["user_id"],
+            "action_type": context["action_type"],
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "old_state": dump_state(old_state),
+            "new_state": dump_state(new_state),
+            "is_undone": False,
+        }
+        for entity_type, entity_id, old_state, new_state in entries
+    ]
+    if rows:
+        _insert_actions(session, context, rows)
+
+
+def _insert_actions(session: Session, context: Dict[str, Any], rows: list):
+    """Insert UserAction rows, clearing the redo stack on the first insert of the unit of work."""
+    connection = session.connection()
+    if not context["redo_cleared"]:
+        supersede_undone(connection, context["user_id"])
+        context["redo_cleared"] = True
+    connection.execute(insert(UserAction), rows)
+
+
+def record_action(
+    db: Session,
+    entity_type: str,
+    entity_id: int,
+    old_state: Optional[Dict[str, Any]],
+    new_state: Optional[Dict[str, Any]]
+):
+    """
+    Record an undo entry for a change made outside the flush.
+
+    Set-based statements (UPDATE ... RETURNING and the like) skip the
+    after_flush hook, so their callers report the diff here. Outside a
+    `unit_of_work` block this is a no-op, same as the hook.
+    """
+    context = db.info.get(_UNDO_CONTEXT_KEY)
+    if context is None or old_state == new_state:
+        return
+    _store_entries(db, context, [(entity_type, entity_id, old_state, new_state)])
+
+
+def record_updates(db: Session, objs: List[Any]):
+    """
+    Record undo entries for the pending changes of tracked objects.
+
+    For callers that write attribute changes with a set-based UPDATE instead
+    of the flush (see app/db/bulk.py); call before the changes are marked
+    committed, while attribute history is intact.
+    """
+    context = db.info.get(_UNDO_CONTEXT_KEY)
+    if context is None:
+        return
+    entries = [(obj.__undo_entity__, obj.id, *_diff(obj)) for obj in objs]
+    _store_entries(db, context, [entry for entry in entries if entry[2] != entry[3]])
+
+
+def record_usage_events(db: Session, event_ids: List[int]):
+    """
+    Link usage events appended in this unit of work to its undo entry.
+
+    Undo then reverses exactly these events. Usage is only recorded by
+    grouped units, which store the ids on their single UserAction.
+    """
+    context = db.info.get(_UNDO_CONTEXT_KEY)
+    if context is None or context["group"] is None:
+        return
+    context["usage_events"].extend(event_ids)
+
+
+def _merge(first, second):
+    """Combine two successive (old, new) changes of one entity; None if they cancel out."""
+    (old1, new1), (old2, new2) = first, second
+    if old1 is None:
+        # Created in this unit of work: later updates are part of the row, a delete cancels it
+        return None if new2 is None else (None, {})
+    if new2 is None:
+        return {**old2, **old1}, None
+    return {**old2, **old1}, {**new1, **new2}
+
+
+def _grouped_action(context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Collapse all entries of a grouped unit of work into one UserAction row."""
+    entries = context["group"]
+    merged = {}
+    for _, entity_id, old, new in entries:
+        key = str(entity_id)
+        if key in merged:
+            combined = _merge(merged[key], (old, new))
+            if combined is None:
+                del merged[key]
+                continue
+            merged[key] = combined
+        else:
+            merged[key] = (old, new)
+
+    if not merged:
+        return None
+
+    return {
+        "user_id": context["user_id"],
+        "action_type": context["action_type"],
+        "entity_type": entries[0][0],
+        "entity_id": entries[0][1],
+        "old_state": dump_state({key: old for key, (old, _) in merged.items()}),
+        "new_state": dump_state({key: new for key, (_, new) in merged.items()}),
+        "is_group": True,
+        "is_undone": False,
+        "usage_event_ids": dump_state(context["usage_events"]) if context["usage_events"] else None,
+    }
+
+
+@contextmanager
+def unit_of_work(db: Session, user_id: int, action_type: str, grouped: bool = False) -> Iterator[Session]:
+    """
+    Run a block of writes as one transaction with automatic undo capture.
+
+    Changes to tracked models are recorded as UserAction diffs in the same
+    flush, and the block ends with a single commit. With `grouped=True` all
+    changes collapse into one UserAction whose states are keyed by entity
+    id, so a multi-item operation is undone as a unit.
+
+    Objects are not expired on commit, so responses can be built without a
+    refresh. Server-generated columns come back through RETURNING via the
+    mapper's `eager_defaults`.
+    """
+    context = {
+        "user_id": user_id,
+        "action_type": action_type,
+        "group": [] if grouped else None,
+        "usage_events": [],
+        "redo_cleared": False,
+    }
+    db.info[_UNDO_CONTEXT_KEY] = context
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        yield db
+        if grouped:
+            db.flush()
+            action = _grouped_action(context) if context["group"] else None
+            if action is not None:
+                _insert_actions(db, context, [action])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.expire_on_commit = expire_on_commit
+        db.info.pop(_UNDO_CONTEXT_KEY, None)
@@ -0,0 +1,51 @@
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import Integer, insert, literal, select
+from sqlalchemy.orm import Session
+from app.models.inventory import InventoryItem
+from app.models.consumption import ConsumptionEvent
+
+# Copied unchanged when events are replayed (see replay_consumption)
+_EVENT_COLUMNS = ("household_id", "item_id", "name", "barcode", "category", "unit")
+
+
+def record_consumption(db: Session, user_id: Optional[int], usages: Iterable[Tuple[InventoryItem, float]]) -> List[int]:
+    """
+    Append one ConsumptionEvent per (item, quantity in the item's unit).
+
+    Written with a single multi-row INSERT in the caller's transaction.
+    Returns the new event ids, so the undo entry can be linked to them.
+    """
+    rows = [
+        {
+            "household_id": item.household_id,
+            "user_id": user_id,
+            "item_id": item.id,
+            "name": item.name,
+            "barcode": item.barcode,
+            "category": item.category,
+            "quantity": quantity,
+            "unit": item.unit,
+        }
+        for item, quantity in usages
+        if item.household_id is not None and quantity
+    ]
+    if not rows:
+        return []
+    return list(db.execute(insert(ConsumptionEvent).returning(ConsumptionEvent.id), rows).scalars())
+
+
+def replay_consumption(db: Session, user_id: int, event_ids: List[int], sign: int):
+    """
+    Append a copy of each given event with its quantity multiplied by `sign`.
+
+    Undo passes -1 to reverse the events an action recorded, redo passes 1
+    to record them again. The log stays append-only, and actions that never
+    recorded usage never touch it.
+    """
+    table = ConsumptionEvent.__table__
+    source = select(
+        *(table.c[key] for key in _EVENT_COLUMNS),
+        literal(user_id, Integer),
+        table.c.quantity * sign
+    ).where(table.c.id.in_(event_ids))
+    db.execute(insert(ConsumptionEvent).from_select([*_EVENT_COLUMNS, "user_id", "quantity"], source))
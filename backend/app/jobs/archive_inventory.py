@@ -0,0 +1,36 @@
+"""
+Move wasted and consumed inventory older than INVENTORY_ARCHIVE_AFTER_DAYS
+to inventory_item_history.
+
+Run periodically, e.g. nightly from cron:
+
+    python -m app.jobs.archive_inventory
+"""
+import logging
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.archive import archive_inventory, ensure_history_partitions
+
+logger = logging.getLogger(__name__)
+
+
+def run() -> int:
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        ensure_history_partitions(db, [now.year, now.year + 1])
+        moved = archive_inventory(
+            db,
+            cutoff=now - timedelta(days=settings.INVENTORY_ARCHIVE_AFTER_DAYS),
+            batch_size=settings.INVENTORY_ARCHIVE_BATCH_SIZE
+        )
+        logger.info("Archived inventory: %d items moved to history", moved)
+        return moved
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
@@ -0,0 +1,28 @@
+"""
+Trim undo history to the newest UNDO_HISTORY_LIMIT actions per user.
+
+Run periodically, e.g. from cron:
+
+    python -m app.jobs.compact_undo_history
+"""
+import logging
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.undo import compact_history
+
+logger = logging.getLogger(__name__)
+
+
+def run() -> int:
+    db = SessionLocal()
+    try:
+        deleted = compact_history(db, keep=settings.UNDO_HISTORY_LIMIT)
+        logger.info("Compacted undo history: %d actions deleted", deleted)
+        return deleted
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
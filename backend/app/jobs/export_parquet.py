@@ -0,0 +1,276 @@
+"""
+Export household history to Parquet for offline analysis and BI.
+
+Writes inventory items (live and archived), receipts, receipt line items
+and consumption events under ANALYTICS_EXPORT_DIR, one dataset per table,
+hive-partitioned by month and household bucket:
+
+    <dataset>/month=2024-03/household_bucket=5/<run>-<chunk>-0.parquet
+
+Each run appends the rows created or changed since the previous run,
+re-reading ANALYTICS_EXPORT_OVERLAP_MINUTES before it so rows committed
+after their timestamp are not missed. A row can therefore be exported more
+than once, and mutable tables (items, receipts) hold several versions of a
+row; read them with app.services.columnar, which keeps one copy of the
+latest. Deleted inventory items are exported as tombstones, from the sync
+change log, to the "deletions" dataset; archived items are re-exported
+from the history table when they move. Receipts are not in the change log,
+so their deletions only reach the export with --full, which writes a fresh
+snapshot and replaces the previous files. Run periodically:
+
+    python -m app.jobs.export_parquet [--full]
+"""
+import enum
+import json
+import logging
+import os
+import shutil
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, NamedTuple, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, exists, func, literal, or_, select, union_all
+from sqlalchemy.sql import Select
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.archive import SHARED_COLUMNS
+from app.db.change_log import DELETE
+from app.models.inventory import InventoryItem, InventoryItemHistory
+from app.models.receipt import Receipt, ReceiptLineItem
+from app.models.consumption import ConsumptionEvent
+from app.models.sync import ChangeLog
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "_export_state.json"
+PARTITION_COLUMNS = ["month", "household_bucket"]
+
+# Large or machine-local columns left out of the export
+_SKIPPED_COLUMNS = {"ocr_raw_response", "image_path"}
+
+
+class ExportSource(NamedTuple):
+    columns: list  # Selected columns; must include household_id and created_at
+    changed_at: Any  # Row version timestamp, the incremental watermark
+    # Indexed timestamps; whenever changed_at is past the watermark, one of them is too
+    indexed: list
+    source: Any = None  # FROM clause, when the columns alone do not imply it
+    where: Any = None
+
+
+class ExportDataset(NamedTuple):
+    name: str
+    sources: list  # ExportSources with matching columns, combined with UNION ALL
+
+
+def _datasets():
+    hot, cold = InventoryItem.__table__.c, InventoryItemHistory.__table__.c
+    receipt_columns = [c for c in Receipt.__table__.c if c.key not in _SKIPPED_COLUMNS]
+    return [
+        ExportDataset("inventory_items", [
+            ExportSource(
+                [*(hot[name] for name in SHARED_COLUMNS), literal(False).label("is_archived")],
+                func.coalesce(hot.updated_at, hot.created_at),
+                [hot.updated_at, hot.created_at]
+            ),
+            # An archived item's newest version is the move itself
+            ExportSource(
+                [*(cold[name] for name in SHARED_COLUMNS), literal(True).label("is_archived")],
+                cold.archived_at,
+                [cold.archived_at]
+            ),
+        ]),
+        ExportDataset("receipts", [
+            ExportSource(
+                receipt_columns, func.coalesce(Receipt.updated_at, Receipt.created_at), [Receipt.updated_at, Receipt.created_at]
+            ),
+        ]),
+        ExportDataset("receipt_line_items", [
+            ExportSource(
+                [*ReceiptLineItem.__table__.c, Receipt.household_id],
+                ReceiptLineItem.created_at,
+                [ReceiptLineItem.created_at],
+                ReceiptLineItem.__table__.join(Receipt.__table__, ReceiptLineItem.receipt_id == Receipt.id)
+            ),
+        ]),
+        ExportDataset("consumption_events", [
+            ExportSource(list(ConsumptionEvent.__table__.c), ConsumptionEvent.created_at, [ConsumptionEvent.created_at]),
+        ]),
+        # Tombstones of deleted inventory items. Archiving also logs a sync
+        # delete, but those items are exported from the history table instead.
+        ExportDataset("deletions", [
+            ExportSource(
+                [
+                    literal("inventory_items").label("dataset"),
+                    ChangeLog.entity_id.label("id"),
+                    ChangeLog.household_id,
+                    ChangeLog.created_at
+                ],
+                ChangeLog.created_at,
+                [ChangeLog.created_at],
+                where=(ChangeLog.operation == DELETE) & (ChangeLog.entity_type == "inventory_item") & ~exists().where(
+                    InventoryItemHistory.id == ChangeLog.entity_id
+                )
+            ),
+        ]),
+    ]
+
+
+def _arrow_type(sql_type) -> pa.DataType:
+    if isinstance(sql_type, (BigInteger, Integer)):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    return pa.string()  # Strings, enum values, JSON text
+
+
+def _arrow_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def _source_statement(source: ExportSource, since: Optional[datetime], until: datetime) -> Select:
+    statement = select(*source.columns, source.changed_at.label("changed_at"))
+    if source.source is not None:
+        statement = statement.select_from(source.source)
+    if source.where is not None:
+        statement = statement.where(source.where)
+    statement = statement.where(source.changed_at <= until)
+    if since is not None:
+        # The OR of plain column ranges can use their indexes; changed_at alone cannot
+        statement = statement.where(or_(*(column > since for column in source.indexed)))
+        if not any(column is source.changed_at for column in source.indexed):
+            statement = statement.where(source.changed_at > since)
+    return statement
+
+
+def _statement(dataset: ExportDataset, since: Optional[datetime], until: datetime) -> Select:
+    """The dataset's rows changed in (since, until], filtered in each branch of the union."""
+    statements = [_source_statement(source, since, until) for source in dataset.sources]
+    return statements[0] if len(statements) == 1 else union_all(*statements)
+
+
+def _schema(statement: Select) -> pa.Schema:
+    fields = [pa.field(column.key, _arrow_type(column.type)) for column in statement.selected_columns]
+    return pa.schema([*fields, pa.field("month", pa.string()), pa.field("household_bucket", pa.int32())])
+
+
+def _partition_values(row: Dict[str, Any]) -> Dict[str, Any]:
+    created_at = row["created_at"] or row["changed_at"]
+    household_id = row["household_id"]
+    return {
+        "month": created_at.strftime("%Y-%m") if created_at else "unknown",
+        "household_bucket": household_id % settings.ANALYTICS_EXPORT_BUCKETS if household_id is not None else -1,
+    }
+
+
+def export_dataset(db, dataset: ExportDataset, root: str, run_id: str, since: Optional[datetime], until: datetime) -> int:
+    """Append one dataset's new and changed rows, a chunk at a time. Returns rows written."""
+    statement = _statement(dataset, since, until)
+    schema = _schema(statement)
+    path = os.path.join(root, dataset.name)
+    written = 0
+
+    result = db.execute(statement.execution_options(yield_per=settings.ANALYTICS_EXPORT_CHUNK_SIZE))
+    for chunk_index, chunk in enumerate(result.mappings().partitions()):
+        rows = [
+            {**{key: _arrow_value(value) for key, value in row.items()}, **_partition_values(row)}
+            for row in chunk
+        ]
+        pq.write_to_dataset(
+            pa.Table.from_pylist(rows, schema=schema),
+            root_path=path,
+            partition_cols=PARTITION_COLUMNS,
+            basename_template=f"{run_id}-{chunk_index}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore"
+        )
+        written += len(rows)
+    return written
+
+
+def _load_state(root: str) -> Dict[str, Any]:
+    path = os.path.join(root, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _watermark(state: Dict[str, Any]) -> datetime:
+    watermark = datetime.fromisoformat(state["watermark"])
+    if watermark.tzinfo is None:
+        watermark = watermark.replace(tzinfo=timezone.utc)  # Written as naive UTC by earlier versions
+    return watermark
+
+
+def _save_state(root: str, state: Dict[str, Any]):
+    path = os.path.join(root, STATE_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def run(full: bool = False) -> Dict[str, int]:
+    """
+    Export everything changed since the last run, or with `full` a fresh
+    snapshot of all history that replaces the previous files.
+
+    The watermark advances only after every dataset is written, so a failed
+    run is retried from the same point (its partial files duplicate rows,
+    which readers collapse to the latest version). Timestamps are written
+    by the transaction before it commits, so each run starts the overlap
+    window before the watermark to pick up rows that were still in flight.
+    A snapshot is written to a staging directory and swapped in dataset by
+    dataset once complete.
+    """
+    root = settings.ANALYTICS_EXPORT_DIR
+    os.makedirs(root, exist_ok=True)
+    state = {} if full else _load_state(root)
+    since = None
+    if state.get("watermark"):
+        since = _watermark(state) - timedelta(minutes=settings.ANALYTICS_EXPORT_OVERLAP_MINUTES)
+    until = datetime.now(timezone.utc)
+    # Unique per run, so runs never overwrite each other's files
+    run_id = f"{until:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    target = os.path.join(root, f".snapshot-{run_id}") if full else root
+
+    db = SessionLocal()
+    try:
+        counts = {}
+        for dataset in _datasets():
+            counts[dataset.name] = export_dataset(db, dataset, target, run_id, since, until)
+            logger.info("Exported %d %s rows", counts[dataset.name], dataset.name)
+    finally:
+        db.close()
+
+    if full:
+        _replace_datasets(root, target)
+    _save_state(root, {"watermark": until.isoformat()})
+    return counts
+
+
+def _replace_datasets(root: str, snapshot: str):
+    """Swap a finished snapshot's datasets in for the exported ones."""
+    for dataset in _datasets():
+        current, fresh = os.path.join(root, dataset.name), os.path.join(snapshot, dataset.name)
+        if os.path.exists(current):
+            os.replace(current, os.path.join(snapshot, f"{dataset.name}.old"))
+        if os.path.exists(fresh):
+            os.replace(fresh, current)
+    shutil.rmtree(snapshot)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run(full="--full" in sys.argv[1:])
@@ -0,0 +1,156 @@
+"""
+Import inventory items from an uploaded CSV file.
+
+Started in the background by POST /inventory/import. A job that failed or
+was interrupted keeps its file and resumes after the last committed chunk:
+
+    python -m app.jobs.import_inventory <job_id>
+"""
+import csv
+import logging
+import os
+import sys
+from datetime import date, datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Tuple
+from pydantic import ValidationError
+from app.core.config import settings
+from app.db.bulk import insert_inventory_items
+from app.db.query_stats import stop_request_stats
+from app.db.session import SessionLocal
+from app.models.import_job import ImportJob
+from app.schemas.inventory import InventoryItemCreate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FIELDS = set(InventoryItemCreate.model_fields)
+
+
+def _clean(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a CSV record: known columns only, blanks dropped."""
+    cleaned = {}
+    for key, value in record.items():
+        if key is None:
+            continue  # More values than header columns
+        key = key.strip().lower()
+        if key in IMPORT_FIELDS and value is not None and value.strip():
+            cleaned[key] = value.strip()
+    if "category" in cleaned:
+        cleaned["category"] = cleaned["category"].lower()
+    if len(cleaned.get("expiration_date", "")) == 10:
+        # Plain dates are the norm in spreadsheets; pydantic wants a time too
+        try:
+            cleaned["expiration_date"] = date.fromisoformat(cleaned["expiration_date"]).isoformat() + "T00:00:00"
+        except ValueError:
+            pass
+    return cleaned
+
+
+def _format_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _validate(chunk: List[Tuple[int, Dict[str, Any]]]):
+    """Split a chunk into insertable rows and (line, error) pairs."""
+    items, errors = [], []
+    for line, record in chunk:
+        try:
+            items.append(InventoryItemCreate.model_validate(_clean(record)))
+        except ValidationError as e:
+            errors.append((line, _format_error(e)))
+    return items, errors
+
+
+def _chunks(reader: csv.DictReader, size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    # Data starts on line 2, after the header
+    records = ((reader.line_num, record) for record in reader)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(job_id: int):
+    """
+    Process an import job chunk by chunk.
+
+    Each chunk is validated with Pydantic, inserted with one multi-row
+    statement and committed together with the job's progress, so memory
+    stays flat and a failure keeps the rows imported so far. rows_processed
+    is therefore the number of records already committed, and a re-run
+    skips them. The uploaded file is removed only once the import
+    completes. Invalid rows are counted and the first IMPORT_MAX_ERRORS are
+    kept; they do not stop the import.
+
+    Must not be started for a job that is still running.
+    """
+    # Started from a request's background tasks: not part of that request's query budget
+    stop_request_stats()
+    db = SessionLocal(expire_on_commit=False)
+    job = db.get(ImportJob, job_id)
+    if job is None or job.status == "completed":
+        db.close()
+        return
+
+    if job.status == "failed":
+        logger.info("Resuming inventory import %d after %d rows", job_id, job.rows_processed or 0)
+    job.status = "processing"
+    job.rows_processed = job.rows_processed or 0
+    job.rows_imported = job.rows_imported or 0
+    job.rows_failed = job.rows_failed or 0
+    job.error = None
+    job.finished_at = None
+    db.commit()
+
+    user_id, household_id, file_path = job.user_id, job.household_id, job.file_path
+    row_errors = list(job.row_errors or [])
+
+    try:
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for _ in islice(reader, job.rows_processed):
+                pass  # Committed by an earlier run
+            for chunk in _chunks(reader, settings.IMPORT_CHUNK_SIZE):
+                items, errors = _validate(chunk)
+                created = insert_inventory_items(db, [
+                    {
+                        **item.model_dump(),
+                        "household_id": household_id,
+                        "added_by": user_id,
+                        "original_quantity": item.quantity
+                    }
+                    for item in items
+                ])
+
+                room = settings.IMPORT_MAX_ERRORS - len(row_errors)
+                row_errors.extend({"row": line, "error": error} for line, error in errors[:room])
+
+                job.rows_processed += len(chunk)
+                job.rows_imported += len(items)
+                job.rows_failed += len(errors)
+                job.row_errors = list(row_errors)
+                db.commit()
+                # Keep the identity map from growing with the file
+                for item in created:
+                    db.expunge(item)
+
+        job.status = "completed"
+    except Exception as e:
+        logger.exception("Inventory import %d failed", job_id)
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        db.close()
+        if job.status == "completed" and os.path.exists(file_path):
+            os.remove(file_path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run(int(sys.argv[1]))
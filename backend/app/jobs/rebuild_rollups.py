@@ -0,0 +1,29 @@
+"""
+Rebuild the daily analytics rollups from live and archived inventory.
+
+Run once after migration 012 to backfill, or to repair a household:
+
+    python -m app.jobs.rebuild_rollups [household_id]
+"""
+import logging
+import sys
+from typing import Optional
+from app.db.session import SessionLocal
+from app.db.rollups import rebuild_rollups
+
+logger = logging.getLogger(__name__)
+
+
+def run(household_id: Optional[int] = None) -> int:
+    db = SessionLocal()
+    try:
+        written = rebuild_rollups(db, household_id)
+        logger.info("Rebuilt analytics rollups: %d rows written", written)
+        return written
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -1,8 +1,10 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
-from app.api.endpoints import auth, inventory, receipts, meals, shopping, analytics
+from app.api.endpoints import auth, inventory, receipts, meals, shopping, analytics, sync, actions, export
+from app.db.query_stats import start_request_stats, report_request_stats
+from app.db import change_log, unit_of_work, eat_first, rollups, cache_invalidation  # noqa: F401  Register session/mapper event listeners
 import os
 
 app = FastAPI(
@@ -22,6 +24,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# Per-request SQL statement counting (N+1 detection)
+@app.middleware("http")
+async def query_stats_middleware(request: Request, call_next):
+    """Count SQL statements per request and, in debug mode, expose them via Server-Timing."""
+    stats = start_request_stats()
+    response = await call_next(request)
+    report_request_stats(stats, request.url.path)
+    if settings.DEBUG:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["Server-Timing"] = f"db;desc=\"{stats.count} queries\";dur={stats.total_ms:.1f}"
+    return response
+
+
 # Create upload directories
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 os.makedirs(settings.RECEIPTS_DIR, exist_ok=True)
@@ -37,6 +53,9 @@ app.include_router(receipts.router, prefix=f"{settings.API_V1_STR}/receipts", ta
 app.include_router(meals.router, prefix=f"{settings.API_V1_STR}/meals", tags=["Meals"])
 app.include_router(shopping.router, prefix=f"{settings.API_V1_STR}/shopping", tags=["Shopping"])
 app.include_router(analytics.router, prefix=f"{settings.API_V1_STR}/analytics", tags=["Analytics"])
+app.include_router(sync.router, prefix=f"{settings.API_V1_STR}/sync", tags=["Sync"])
+app.include_router(actions.router, prefix=f"{settings.API_V1_STR}/actions", tags=["Undo/Redo"])
+app.include_router(export.router, prefix=f"{settings.API_V1_STR}/export", tags=["Export"])
 
 
 @app.get("/")
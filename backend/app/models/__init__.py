@@ -1,8 +1,12 @@
 from app.models.user import User, Household, StorageLocation, UserRole
-from app.models.inventory import InventoryItem, Product, UserAction, UnitType, ItemCategory
+from app.models.inventory import InventoryItem, InventoryItemHistory, Product, UserAction, UnitType, ItemCategory
 from app.models.receipt import Receipt, ReceiptLineItem
 from app.models.meal import Recipe, Ingredient, MealPlan, AIMealSuggestion
 from app.models.shopping import ShoppingList, ShoppingListItem, StoreAisle, ShoppingListStatus
+from app.models.sync import ChangeLog, AppliedMutation
+from app.models.consumption import ConsumptionEvent
+from app.models.import_job import ImportJob
+from app.models.analytics import DailyRollup, HouseholdProgress
 
 __all__ = [
     "User",
@@ -10,6 +14,7 @@ __all__ = [
     "StorageLocation",
     "UserRole",
     "InventoryItem",
+    "InventoryItemHistory",
     "Product",
     "UserAction",
     "UnitType",
@@ -24,4 +29,10 @@ __all__ = [
     "ShoppingListItem",
     "StoreAisle",
     "ShoppingListStatus",
+    "ChangeLog",
+    "AppliedMutation",
+    "ConsumptionEvent",
+    "ImportJob",
+    "DailyRollup",
+    "HouseholdProgress",
 ]
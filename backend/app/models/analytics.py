@@ -0,0 +1,51 @@
+from sqlalchemy import Boolean, Column, Integer, Float, Date, DateTime, Enum as SQLEnum, ForeignKey, JSON, text
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.models.inventory import ItemCategory
+
+
+class DailyRollup(Base):
+    """
+    Per household, day and category inventory totals for analytics.
+
+    Maintained incrementally on every inventory write (see app/db/rollups.py),
+    so dashboard ranges read at most one small row per day and category.
+    Purchases count on the purchase day, waste on the wasted day and use on
+    the consumed day.
+    """
+    __tablename__ = "daily_rollups"
+
+    household_id = Column(Integer, ForeignKey("households.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    category = Column(SQLEnum(ItemCategory), primary_key=True)
+
+    spend = Column(Float, nullable=False, default=0, server_default=text("0"))
+    items_added = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    waste_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    waste_value = Column(Float, nullable=False, default=0, server_default=text("0"))
+    consumed_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+
+class HouseholdProgress(Base):
+    """
+    Streak and badge state of a household, one small row updated as
+    inventory events happen (see app/db/progress.py).
+
+    The current streak is derived from last_waste_day on read, so no
+    daily job is needed. Rows marked needs_replay are replayed from the
+    rollups on read until the replay job stores the result.
+    """
+    __tablename__ = "household_progress"
+
+    household_id = Column(Integer, ForeignKey("households.id"), primary_key=True)
+    first_day = Column(Date)  # First day with any inventory event
+    last_waste_day = Column(Date)
+    longest_streak = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    items_added = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    items_consumed = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    items_wasted = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    badges = Column(JSON)  # Badge code -> ISO date earned (see app/services/achievements.py)
+    # Set by writes that cannot be applied in order; cleared by app.jobs.replay_progress
+    needs_replay = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    revision = Column(Integer, nullable=False, default=0, server_default=text("0"))  # Bumped on every write
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
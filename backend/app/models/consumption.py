@@ -0,0 +1,31 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, Enum as SQLEnum, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.models.inventory import UnitType, ItemCategory
+
+
+class ConsumptionEvent(Base):
+    """
+    Append-only record of inventory usage (see app/db/usage_log.py).
+
+    Product fields are copied from the item so range aggregations need no
+    join. A negative quantity reverses an earlier event (undo).
+    """
+    __tablename__ = "consumption_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    household_id = Column(Integer, ForeignKey("households.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    item_id = Column(Integer, nullable=False)  # No FK: events outlive deleted items
+    name = Column(String, nullable=False)
+    barcode = Column(String)
+    category = Column(SQLEnum(ItemCategory), nullable=False)
+    quantity = Column(Float, nullable=False)
+    unit = Column(SQLEnum(UnitType), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_consumption_events_household_created_at", "household_id", "created_at"),
+        Index("ix_consumption_events_item_id", "item_id"),
+        Index("ix_consumption_events_created_at", "created_at"),  # Parquet export watermark
+    )
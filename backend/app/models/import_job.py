@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class ImportJob(Base):
+    """A CSV inventory import, processed in the background (see app/jobs/import_inventory.py)."""
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    household_id = Column(Integer, ForeignKey("households.id"))
+
+    filename = Column(String)
+    file_path = Column(String)
+
+    status = Column(String, default="pending")  # "pending", "processing", "completed", "failed"
+    rows_processed = Column(Integer, default=0)
+    rows_imported = Column(Integer, default=0)
+    rows_failed = Column(Integer, default=0)
+    row_errors = Column(JSON)  # First IMPORT_MAX_ERRORS of [{"row": n, "error": "..."}]
+    error = Column(Text)  # Why the whole import failed
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
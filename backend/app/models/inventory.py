@@ -1,7 +1,8 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, Enum as SQLEnum, ForeignKey, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, Enum as SQLEnum, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
+from datetime import datetime, timezone
 import enum
 
 
@@ -39,6 +40,9 @@ class ItemCategory(str, enum.Enum):
 
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
+    __undo_entity__ = "inventory_item"  # Changes recorded as UserAction (see app/db/unit_of_work.py)
+    __sync_entity__ = "inventory_item"  # Changes recorded in change_log (see app/db/change_log.py)
+    __cache_household__ = True  # Changes invalidate the household's cached analytics (see app/db/cache_invalidation.py)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
@@ -54,6 +58,7 @@ class InventoryItem(Base):
     purchase_date = Column(DateTime(timezone=True), server_default=func.now())
     expiration_date = Column(DateTime(timezone=True))
     opened_date = Column(DateTime(timezone=True))
+    eat_by = Column(DateTime(timezone=True))  # "Eat First" rank, maintained on write (see app/db/eat_first.py)
 
     # Location
     location_id = Column(Integer, ForeignKey("storage_locations.id"))
@@ -67,6 +72,8 @@ class InventoryItem(Base):
     is_wasted = Column(Boolean, default=False)
     waste_reason = Column(String)
     wasted_date = Column(DateTime(timezone=True))
+    is_consumed = Column(Boolean, default=False)  # Used up; kept for history instead of deleted
+    consumed_date = Column(DateTime(timezone=True))
 
     # Metadata
     notes = Column(Text)
@@ -80,13 +87,105 @@ class InventoryItem(Base):
     household_id = Column(Integer, ForeignKey("households.id"))
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Stamped in Python: a flush then needs no RETURNING per row and batches same-column UPDATEs
+    updated_at = Column(DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc))
 
     # Relationships
     location = relationship("StorageLocation", back_populates="inventory_items")
     added_by_user = relationship("User", back_populates="inventory_items")
     receipt = relationship("Receipt", back_populates="items")
 
+    __table_args__ = (
+        # Trigram indexes for fuzzy search (see app/db/search.py)
+        Index("ix_inventory_items_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_inventory_items_brand_trgm", "brand", postgresql_using="gin", postgresql_ops={"brand": "gin_trgm_ops"}),
+        Index("ix_inventory_items_name_lower", func.lower(name).label("name_lower"), postgresql_ops={"name_lower": "text_pattern_ops"}),
+        # FIFO lot lookup for consume-by-product (see app/db/consumption.py)
+        Index("ix_inventory_items_household_name_expiration", household_id, func.lower(name), expiration_date),
+        Index("ix_inventory_items_household_barcode_expiration", household_id, barcode, expiration_date),
+        # Live stock only: wasted/consumed rows awaiting archival stay out of the index
+        Index(
+            "ix_inventory_items_live",
+            household_id, expiration_date,
+            postgresql_where=text("is_wasted = false AND is_consumed = false"),
+            sqlite_where=text("is_wasted = 0 AND is_consumed = 0")
+        ),
+        Index(
+            "ix_inventory_items_eat_first",
+            household_id, eat_by, id,
+            postgresql_where=text("is_wasted = false AND is_consumed = false"),
+            sqlite_where=text("is_wasted = 0 AND is_consumed = 0")
+        ),
+        # Incremental Parquet export watermark (see app/jobs/export_parquet.py)
+        Index("ix_inventory_items_updated_at", updated_at),
+        Index("ix_inventory_items_created_at", created_at),
+    )
+    # Fetch server defaults (purchase_date, created_at) via RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class InventoryItemHistory(Base):
+    """
+    Cold tier of inventory_items: wasted and consumed items moved out of
+    live stock by the archiver (see app/db/archive.py).
+
+    Rows keep their original id. On PostgreSQL the table is partitioned by
+    `retired_at`, the date the item was wasted or used up.
+    """
+    __tablename__ = "inventory_item_history"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    retired_at = Column(DateTime(timezone=True), primary_key=True)
+    name = Column(String, nullable=False)
+    category = Column(SQLEnum(ItemCategory), nullable=False)
+    barcode = Column(String)
+
+    # Quantity
+    quantity = Column(Float, nullable=False)
+    unit = Column(SQLEnum(UnitType), nullable=False)
+    original_quantity = Column(Float)
+
+    # Dates
+    purchase_date = Column(DateTime(timezone=True))
+    expiration_date = Column(DateTime(timezone=True))
+    opened_date = Column(DateTime(timezone=True))
+
+    location_id = Column(Integer)
+
+    # Pricing
+    price = Column(Float)
+    currency = Column(String)
+
+    # Status
+    is_opened = Column(Boolean)
+    is_wasted = Column(Boolean)
+    waste_reason = Column(String)
+    wasted_date = Column(DateTime(timezone=True))
+    is_consumed = Column(Boolean)
+    consumed_date = Column(DateTime(timezone=True))
+
+    # Metadata
+    notes = Column(Text)
+    brand = Column(String)
+    store = Column(String)
+    image_url = Column(String)
+
+    # Tracking (no FKs: history outlives users, receipts and locations)
+    added_by = Column(Integer)
+    receipt_id = Column(Integer)
+    household_id = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_inventory_item_history_household_retired_at", "household_id", "retired_at"),
+        Index("ix_inventory_item_history_household_purchase_date", "household_id", "purchase_date"),
+        Index("ix_inventory_item_history_archived_at", "archived_at"),
+        {"postgresql_partition_by": "RANGE (retired_at)"},
+    )
+
 
 class Product(Base):
     """Master product database for autocomplete and smart matching."""
@@ -99,8 +198,16 @@ class Product(Base):
     brand = Column(String)
     default_unit = Column(SQLEnum(UnitType))
     average_shelf_life_days = Column(Integer)  # For expiration estimates
+
+    # Unit conversion across dimensions (see app/services/units.py)
+    density_g_per_ml = Column(Float)  # Volume <-> weight
+    each_weight_g = Column(Float)  # Count <-> weight
     image_url = Column(String)
 
+    # Environmental footprint, overriding the category defaults (see app/services/impact.py)
+    co2e_kg_per_kg = Column(Float)
+    water_l_per_kg = Column(Float)
+
     # Price tracking
     average_price = Column(Float)
     last_price = Column(Float)
@@ -108,9 +215,16 @@ class Product(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Trigram index for autocomplete (see app/db/search.py)
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        # Prefix index for short (< 3 char) autocomplete terms
+        Index("ix_products_name_lower", func.lower(name).label("name_lower"), postgresql_ops={"name_lower": "text_pattern_ops"}),
+    )
+
 
 class UserAction(Base):
-    """For undo/redo functionality."""
+    """For undo/redo functionality (see app/db/undo.py for the state format)."""
     __tablename__ = "user_actions"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -120,8 +234,15 @@ class UserAction(Base):
     entity_id = Column(Integer, nullable=False)
     old_state = Column(Text)  # JSON snapshot of old state
     new_state = Column(Text)  # JSON snapshot of new state
+    is_group = Column(Boolean, default=False)  # States keyed by entity id (bulk/batch actions)
+    usage_event_ids = Column(Text)  # JSON list of ConsumptionEvent ids the action appended
     is_undone = Column(Boolean, default=False)
+    is_superseded = Column(Boolean, default=False)  # Undone, then dropped from redo by a newer action
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="actions")
+
+    __table_args__ = (
+        Index("ix_user_actions_user_id_created_at", "user_id", "created_at"),
+    )
@@ -69,6 +69,7 @@ class Ingredient(Base):
 
 class MealPlan(Base):
     __tablename__ = "meal_plans"
+    __sync_entity__ = "meal_plan"  # Changes recorded in change_log (see app/db/change_log.py)
 
     id = Column(Integer, primary_key=True, index=True)
     household_id = Column(Integer, ForeignKey("households.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, Text, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -6,6 +6,7 @@ from app.db.session import Base
 
 class Receipt(Base):
     __tablename__ = "receipts"
+    __cache_household__ = True  # Changes invalidate the household's cached analytics (see app/db/cache_invalidation.py)
 
     id = Column(Integer, primary_key=True, index=True)
     uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -50,6 +51,12 @@ class Receipt(Base):
     items = relationship("InventoryItem", back_populates="receipt")
     line_items = relationship("ReceiptLineItem", back_populates="receipt")
 
+    __table_args__ = (
+        # Incremental Parquet export watermark (see app/jobs/export_parquet.py)
+        Index("ix_receipts_updated_at", "updated_at"),
+        Index("ix_receipts_created_at", "created_at"),
+    )
+
 
 class ReceiptLineItem(Base):
     """Individual line items extracted from receipts."""
@@ -76,3 +83,7 @@ class ReceiptLineItem(Base):
 
     # Relationships
     receipt = relationship("Receipt", back_populates="line_items")
+
+    __table_args__ = (
+        Index("ix_receipt_line_items_created_at", "created_at"),
+    )
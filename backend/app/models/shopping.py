@@ -13,6 +13,7 @@ class ShoppingListStatus(str, enum.Enum):
 
 class ShoppingList(Base):
     __tablename__ = "shopping_lists"
+    __sync_entity__ = "shopping_list"  # Changes recorded in change_log (see app/db/change_log.py)
 
     id = Column(Integer, primary_key=True, index=True)
     household_id = Column(Integer, ForeignKey("households.id"))
@@ -37,6 +38,7 @@ class ShoppingList(Base):
 
 class ShoppingListItem(Base):
     __tablename__ = "shopping_list_items"
+    __sync_parent__ = "shopping_list"  # Item changes resync the parent list
 
     id = Column(Integer, primary_key=True, index=True)
     shopping_list_id = Column(Integer, ForeignKey("shopping_lists.id"), nullable=False)
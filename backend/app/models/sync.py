@@ -0,0 +1,50 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint, text
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class ChangeLog(Base):
+    """
+    Append-only log of synced entity changes.
+
+    `version` is the sync cursor. It is numbered per household from
+    households.sync_version inside the writing transaction, so versions
+    become visible in commit order (see app/db/change_log.py); the id is
+    only a row key.
+    """
+    __tablename__ = "change_log"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    household_id = Column(Integer, ForeignKey("households.id"), nullable=False)
+    version = Column(BigInteger, nullable=False)
+    entity_type = Column(String, nullable=False)  # e.g., "inventory_item", "shopping_list", "meal_plan"
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)  # "upsert" or "delete"
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_change_log_household_version", "household_id", "version", unique=True),
+        Index("ix_change_log_household_entity_version", "household_id", "entity_type", "version"),
+        Index("ix_change_log_entity_version", "entity_type", "entity_id", "version"),
+        # Tombstones for the Parquet export (see app/jobs/export_parquet.py)
+        Index(
+            "ix_change_log_deleted_at", "created_at",
+            postgresql_where=text("operation = 'delete'"),
+            sqlite_where=text("operation = 'delete'")
+        ),
+    )
+
+
+class AppliedMutation(Base):
+    """Offline mutations already applied, keyed by the client's id, so a retried push is not applied twice."""
+    __tablename__ = "applied_mutations"
+
+    id = Column(Integer, primary_key=True)
+    household_id = Column(Integer, ForeignKey("households.id"), nullable=False)
+    client_id = Column(String, nullable=False)
+    entity_id = Column(Integer)  # The created or changed item
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("household_id", "client_id", name="uq_applied_mutations_household_client"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -40,6 +40,8 @@ class Household(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
+    timezone = Column(String, default="UTC", server_default="UTC")  # IANA name, for local-day analytics
+    sync_version = Column(BigInteger, nullable=False, default=0, server_default=text("0"))  # Last change_log version
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
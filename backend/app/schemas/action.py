@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+
+class UserActionResponse(BaseModel):
+    id: int
+    action_type: str
+    entity_type: str
+    entity_ids: List[int]
+    is_undone: bool
+    created_at: datetime
@@ -1,7 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
 from datetime import datetime
 from app.models.inventory import UnitType, ItemCategory
+import enum
 
 
 class InventoryItemBase(BaseModel):
@@ -22,6 +23,27 @@ class InventoryItemCreate(InventoryItemBase):
     pass
 
 
+class ImportRowError(BaseModel):
+    row: int  # Line number in the CSV file
+    error: str
+
+
+class ImportJobResponse(BaseModel):
+    id: int
+    filename: Optional[str] = None
+    status: str
+    rows_processed: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    row_errors: Optional[List[ImportRowError]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class InventoryItemUpdate(BaseModel):
     name: Optional[str] = None
     category: Optional[ItemCategory] = None
@@ -39,6 +61,9 @@ class InventoryItemResponse(InventoryItemBase):
     purchase_date: datetime
     is_opened: bool
     is_wasted: bool
+    is_consumed: bool = False
+    consumed_date: Optional[datetime] = None
+    eat_by: Optional[datetime] = None
     added_by: Optional[int] = None
     household_id: Optional[int] = None
     created_at: datetime
@@ -48,6 +73,10 @@ class InventoryItemResponse(InventoryItemBase):
         from_attributes = True
 
 
+class EatFirstItem(InventoryItemResponse):
+    days_left: Optional[int] = None
+
+
 class InventoryItemWaste(BaseModel):
     item_id: int
     waste_reason: str
@@ -61,6 +90,10 @@ class ProductResponse(BaseModel):
     brand: Optional[str] = None
     default_unit: Optional[UnitType] = None
     average_shelf_life_days: Optional[int] = None
+    density_g_per_ml: Optional[float] = None
+    each_weight_g: Optional[float] = None
+    co2e_kg_per_kg: Optional[float] = None
+    water_l_per_kg: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -71,5 +104,71 @@ class BulkInventoryAdd(BaseModel):
 
 
 class PartialUsage(BaseModel):
+    item_id: int
+    quantity_used: float = Field(..., gt=0)
+
+
+class ConsumeProduct(BaseModel):
+    """Use a quantity of a product across all of its lots, FIFO by expiration."""
+    barcode: Optional[str] = None
+    name: Optional[str] = None
+    quantity: float = Field(..., gt=0)
+    unit: UnitType
+
+    @model_validator(mode="after")
+    def require_product(self):
+        if not self.barcode and not (self.name and self.name.strip()):
+            raise ValueError("barcode or name is required")
+        return self
+
+
+class ProductTotal(BaseModel):
+    quantity: float
+    unit: UnitType
+    lots: int
+    unconverted_lots: int  # Lots whose unit cannot be related to `unit`
+
+
+class ConsumedLot(BaseModel):
     item_id: int
     quantity_used: float
+    unit: UnitType
+    remaining_quantity: float
+    depleted: bool
+
+
+class ConsumeProductResponse(BaseModel):
+    lots: List[ConsumedLot]
+
+
+class BatchOperationType(str, enum.Enum):
+    USE = "use"
+    WASTE = "waste"
+    UPDATE = "update"
+    MOVE = "move"
+    DELETE = "delete"
+
+
+class InventoryBatchOperation(BaseModel):
+    op: BatchOperationType
+    item_id: int
+    quantity_used: Optional[float] = Field(None, gt=0)  # For "use"
+    waste_reason: Optional[str] = None  # For "waste"
+    location_id: Optional[int] = None  # For "move"
+    changes: Optional[InventoryItemUpdate] = None  # For "update"
+
+
+class InventoryBatchRequest(BaseModel):
+    operations: List[InventoryBatchOperation] = Field(..., min_length=1, max_length=500)
+
+
+class InventoryBatchResult(BaseModel):
+    op: BatchOperationType
+    item_id: int
+    status_code: int
+    detail: Optional[str] = None
+    item: Optional[InventoryItemResponse] = None
+
+
+class InventoryBatchResponse(BaseModel):
+    results: List[InventoryBatchResult]
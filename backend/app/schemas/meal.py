@@ -0,0 +1,67 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class IngredientResponse(BaseModel):
+    id: int
+    name: str
+    category: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RecipeResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    servings: Optional[int] = None
+    prep_time_minutes: Optional[int] = None
+    cook_time_minutes: Optional[int] = None
+    total_time_minutes: Optional[int] = None
+    difficulty: Optional[str] = None
+    instructions: Optional[str] = None
+    cuisine: Optional[str] = None
+    meal_type: Optional[str] = None
+    dietary_tags: Optional[List[str]] = None
+    source_url: Optional[str] = None
+    image_url: Optional[str] = None
+    author: Optional[str] = None
+    household_id: Optional[int] = None
+    is_favorite: bool = False
+    times_made: int = 0
+    created_at: datetime
+    ingredients: List[IngredientResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+class RecipeSummary(BaseModel):
+    id: int
+    name: str
+    meal_type: Optional[str] = None
+    image_url: Optional[str] = None
+    total_time_minutes: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MealPlanResponse(BaseModel):
+    id: int
+    household_id: Optional[int] = None
+    created_by_id: Optional[int] = None
+    recipe_id: Optional[int] = None
+    planned_date: datetime
+    meal_type: Optional[str] = None
+    servings: Optional[int] = None
+    is_completed: bool = False
+    completed_at: Optional[datetime] = None
+    notes: Optional[str] = None
+    created_at: datetime
+    recipe: Optional[RecipeSummary] = None
+
+    class Config:
+        from_attributes = True
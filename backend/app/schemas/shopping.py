@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from app.models.shopping import ShoppingListStatus
+
+
+class ShoppingListItemResponse(BaseModel):
+    id: int
+    shopping_list_id: int
+    name: str
+    quantity: float = 1.0
+    unit: Optional[str] = None
+    category: Optional[str] = None
+    aisle: Optional[str] = None
+    estimated_price: Optional[float] = None
+    actual_price: Optional[float] = None
+    store: Optional[str] = None
+    is_purchased: bool = False
+    purchased_at: Optional[datetime] = None
+    is_staple: bool = False
+    notes: Optional[str] = None
+    already_have_warning: bool = False
+    inventory_item_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ShoppingListResponse(BaseModel):
+    id: int
+    household_id: Optional[int] = None
+    created_by_id: Optional[int] = None
+    name: str
+    store: Optional[str] = None
+    status: ShoppingListStatus
+    generated_from_meal_plan: bool = False
+    meal_plan_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    items: List[ShoppingListItemResponse] = []
+
+    class Config:
+        from_attributes = True
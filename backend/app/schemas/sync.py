@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from app.schemas.inventory import InventoryItemCreate, InventoryItemUpdate, InventoryItemResponse
+from app.schemas.shopping import ShoppingListResponse
+from app.schemas.meal import MealPlanResponse
+import enum
+
+
+class Tombstone(BaseModel):
+    entity_type: str
+    entity_id: int
+
+
+class SyncResponse(BaseModel):
+    version: int  # Pass back as `since` on the next sync
+    has_more: bool = False
+    inventory_items: List[InventoryItemResponse] = []
+    shopping_lists: List[ShoppingListResponse] = []
+    meal_plans: List[MealPlanResponse] = []
+    deleted: List[Tombstone] = []
+
+
+class SyncMutationType(str, enum.Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class SyncMutation(BaseModel):
+    client_id: str  # Echoed back so the client can match results to its queue
+    op: SyncMutationType
+    entity_id: Optional[int] = None  # Required for update/delete
+    base_version: int = 0  # Sync version the client had when it made the change
+    create: Optional[InventoryItemCreate] = None
+    changes: Optional[InventoryItemUpdate] = None
+
+
+class SyncPushRequest(BaseModel):
+    mutations: List[SyncMutation] = Field(..., min_length=1, max_length=500)
+
+
+class SyncMutationResult(BaseModel):
+    client_id: str
+    status: str  # "applied", "conflict" or "error"
+    detail: Optional[str] = None
+    entity_id: Optional[int] = None
+    item: Optional[InventoryItemResponse] = None  # Current server state
+
+
+class SyncPushResponse(BaseModel):
+    version: int
+    results: List[SyncMutationResult]
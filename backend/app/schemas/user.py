@@ -43,11 +43,13 @@ class TokenData(BaseModel):
 
 class HouseholdCreate(BaseModel):
     name: str
+    timezone: str = "UTC"
 
 
 class HouseholdResponse(BaseModel):
     id: int
     name: str
+    timezone: str = "UTC"
     created_at: datetime
 
     class Config:
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class Badge(NamedTuple):
+    code: str
+    name: str
+    description: str
+    metric: str  # "streak" (days without waste) or a progress counter
+    target: int
+
+
+BADGES = [
+    Badge("first_item", "First Item", "Add your first item", "items_added", 1),
+    Badge("stocked_up", "Stocked Up", "Add 100 items", "items_added", 100),
+    Badge("clean_plate", "Clean Plate", "Use up 25 items", "items_consumed", 25),
+    Badge("nothing_left_behind", "Nothing Left Behind", "Use up 100 items", "items_consumed", 100),
+    Badge("waste_free_week", "Waste-Free Week", "Go 7 days without waste", "streak", 7),
+    Badge("waste_free_month", "Waste-Free Month", "Go 30 days without waste", "streak", 30),
+    Badge("waste_free_season", "Waste-Free Season", "Go 90 days without waste", "streak", 90),
+]
+
+COUNTERS = ("items_added", "items_consumed", "items_wasted")
+
+
+def empty_progress() -> Dict[str, Any]:
+    """Progress of a household with no history."""
+    return {
+        "first_day": None,  # First day with any inventory event
+        "last_waste_day": None,
+        "longest_streak": 0,  # Longest finished run of days without waste
+        **{counter: 0 for counter in COUNTERS},
+        "badges": {},  # Badge code -> ISO date earned
+    }
+
+
+def _run_start(progress: Dict[str, Any]) -> Optional[date]:
+    if progress["last_waste_day"] is not None:
+        return progress["last_waste_day"] + timedelta(days=1)
+    return progress["first_day"]
+
+
+def current_streak(progress: Dict[str, Any], today: date) -> int:
+    """Days without waste up to and including `today`."""
+    start = _run_start(progress)
+    if start is None or start > today:
+        return 0
+    return (today - start).days + 1
+
+
+def streak_badges(progress: Dict[str, Any], through: date) -> Dict[str, str]:
+    """Streak badges reached by the current run as of `through`, with the day each was reached."""
+    start = _run_start(progress)
+    if start is None:
+        return {}
+    earned = {}
+    for badge in BADGES:
+        if badge.metric == "streak":
+            reached = start + timedelta(days=badge.target - 1)
+            if reached <= through:
+                earned[badge.code] = reached.isoformat()
+    return earned
+
+
+def _award(progress: Dict[str, Any], earned: Dict[str, str]):
+    for code, day in earned.items():
+        progress["badges"].setdefault(code, day)
+
+
+def advance(progress: Dict[str, Any], day: date, added: int, consumed: int, wasted: int) -> bool:
+    """
+    Apply one day's event counts to a household's progress, in place.
+
+    Days must arrive in order. Returns False without changing anything when
+    they cannot be applied incrementally (an earlier day than already seen,
+    or reversed waste); the caller then replays from history.
+    """
+    if progress["first_day"] is not None and day < progress["first_day"]:
+        return False
+    if wasted < 0 or (wasted > 0 and progress["last_waste_day"] is not None and day < progress["last_waste_day"]):
+        return False
+
+    if progress["first_day"] is None:
+        progress["first_day"] = day
+
+    if wasted > 0 and day != progress["last_waste_day"]:
+        # The waste-free run ends the day before
+        through = day - timedelta(days=1)
+        _award(progress, streak_badges(progress, through))
+        progress["longest_streak"] = max(progress["longest_streak"], current_streak(progress, through))
+        progress["last_waste_day"] = day
+
+    progress["items_added"] += added
+    progress["items_consumed"] += consumed
+    progress["items_wasted"] += wasted
+
+    for badge in BADGES:
+        if badge.metric != "streak" and progress[badge.metric] >= badge.target:
+            progress["badges"].setdefault(badge.code, day.isoformat())
+    return True
+
+
+def badge_progress(progress: Dict[str, Any], today: date) -> list:
+    """Every badge with the household's progress toward it, for display."""
+    streak = current_streak(progress, today)
+    earned = {**streak_badges(progress, today), **progress["badges"]}
+    return [
+        {
+            "code": badge.code,
+            "name": badge.name,
+            "description": badge.description,
+            "target": badge.target,
+            "progress": min(streak if badge.metric == "streak" else progress[badge.metric], badge.target),
+            "earned_at": earned.get(badge.code),
+        }
+        for badge in BADGES
+    ]
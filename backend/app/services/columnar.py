@@ -0,0 +1,113 @@
+"""
+Ad-hoc queries over the Parquet export (see app/jobs/export_parquet.py).
+
+    from app.services.columnar import read_table
+    items = read_table("inventory_items", household_id=42, columns=["name", "price", "is_wasted"])
+    items.to_pandas()
+
+The files are plain hive-partitioned Parquet, so DuckDB reads them too:
+
+    duckdb.sql("SELECT month, count(*) FROM read_parquet("
+               "'exports/parquet/inventory_items/**/*.parquet', hive_partitioning = true) GROUP BY 1")
+"""
+import os
+from typing import List, Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from app.core.config import settings
+
+DELETIONS = "deletions"
+
+
+def open_dataset(name: str, root: Optional[str] = None) -> ds.Dataset:
+    """One exported table as a lazily scanned, partition-aware dataset."""
+    return ds.dataset(
+        os.path.join(root or settings.ANALYTICS_EXPORT_DIR, name),
+        format="parquet",
+        partitioning="hive"
+    )
+
+
+def read_table(
+    name: str,
+    household_id: Optional[int] = None,
+    months: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+    latest: bool = True,
+    root: Optional[str] = None
+) -> pa.Table:
+    """
+    Read an exported table into Arrow.
+
+    `household_id` and `months` ("YYYY-MM") prune partitions, so only the
+    matching files are opened. `latest` keeps one copy of the newest
+    exported version of each row: mutable tables are re-exported when a
+    row changes, and overlapping runs export some rows twice. It also drops
+    rows deleted after that version.
+    """
+    dataset = open_dataset(name, root)
+
+    conditions = [filter] if filter is not None else []
+    conditions.extend(_household_conditions(household_id))
+    if months:
+        conditions.append(ds.field("month").isin(months))
+
+    scan_columns = columns
+    if latest and columns is not None:
+        scan_columns = list(dict.fromkeys([*columns, "id", "changed_at"]))
+
+    table = dataset.to_table(columns=scan_columns, filter=_all(conditions))
+    if latest and table.num_rows:
+        table = _drop_deleted(_latest_rows(table), name, household_id, root)
+        if columns is not None:
+            table = table.select(columns)
+    return table
+
+
+def _household_conditions(household_id: Optional[int]) -> List[ds.Expression]:
+    if household_id is None:
+        return []
+    return [
+        ds.field("household_bucket") == household_id % settings.ANALYTICS_EXPORT_BUCKETS,
+        ds.field("household_id") == household_id
+    ]
+
+
+def _all(conditions: List[ds.Expression]) -> Optional[ds.Expression]:
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _drop_deleted(table: pa.Table, name: str, household_id: Optional[int], root: Optional[str]) -> pa.Table:
+    """Drop rows with a tombstone newer than their version; tombstones are read from every month."""
+    if not os.path.isdir(os.path.join(root or settings.ANALYTICS_EXPORT_DIR, DELETIONS)):
+        return table
+    tombstones = open_dataset(DELETIONS, root).to_table(
+        columns=["id", "changed_at"],
+        filter=_all([ds.field("dataset") == name, *_household_conditions(household_id)])
+    )
+    if not tombstones.num_rows:
+        return table
+
+    latest = tombstones.group_by("id").aggregate([("changed_at", "max")])
+    deleted = pa.table({"id": latest["id"], "deleted_at": latest["changed_at_max"]})
+    joined = table.join(deleted, "id", join_type="left outer")
+    alive = pc.or_kleene(pc.is_null(joined["deleted_at"]), pc.greater(joined["changed_at"], joined["deleted_at"]))
+    return joined.filter(alive).drop_columns(["deleted_at"])
+
+
+def _latest_rows(table: pa.Table) -> pa.Table:
+    """One row per id: the newest version, once."""
+    table = table.sort_by([("id", "ascending"), ("changed_at", "descending")])
+    table = table.append_column("_row", pa.array(range(table.num_rows), pa.int64()))
+    first = table.group_by("id").aggregate([("_row", "min")])["_row_min"]
+    return table.take(first).drop_columns(["_row"])
+
+
+def sum_by(table: pa.Table, keys: List[str], value: str) -> pa.Table:
+    """Group an Arrow table and sum one column, e.g. spend per month."""
+    return table.group_by(keys).aggregate([(value, "sum")]).sort_by([(key, "ascending") for key in keys])
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.models.inventory import ItemCategory
+
+# Typical days an unopened item keeps when it has no expiration date
+SHELF_LIFE_DAYS = {
+    ItemCategory.PRODUCE: 7,
+    ItemCategory.DAIRY: 10,
+    ItemCategory.MEAT: 4,
+    ItemCategory.SEAFOOD: 2,
+    ItemCategory.BAKERY: 5,
+    ItemCategory.FROZEN: 180,
+    ItemCategory.CANNED: 730,
+    ItemCategory.DRY_GOODS: 365,
+    ItemCategory.BEVERAGES: 180,
+    ItemCategory.SNACKS: 90,
+    ItemCategory.CONDIMENTS: 180,
+    ItemCategory.SPICES: 730,
+    ItemCategory.OTHER: 30,
+}
+
+# Days an item keeps once opened, whatever its printed expiration date
+OPENED_SHELF_LIFE_DAYS = {
+    ItemCategory.PRODUCE: 5,
+    ItemCategory.DAIRY: 7,
+    ItemCategory.MEAT: 3,
+    ItemCategory.SEAFOOD: 2,
+    ItemCategory.BAKERY: 4,
+    ItemCategory.FROZEN: 90,
+    ItemCategory.CANNED: 4,
+    ItemCategory.DRY_GOODS: 90,
+    ItemCategory.BEVERAGES: 7,
+    ItemCategory.SNACKS: 14,
+    ItemCategory.CONDIMENTS: 60,
+    ItemCategory.SPICES: 365,
+    ItemCategory.OTHER: 14,
+}
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize to aware UTC; naive values are taken to be UTC already."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def compute_eat_by(
+    category: ItemCategory,
+    expiration_date: Optional[datetime] = None,
+    purchase_date: Optional[datetime] = None,
+    opened_date: Optional[datetime] = None
+) -> datetime:
+    """
+    Date by which an item should be eaten, for "Eat First" ordering.
+
+    The earliest of the printed expiration date and the opened shelf life
+    of the category. Items without an expiration date are estimated from
+    the purchase date and the category's shelf life, so perishables rank
+    ahead of pantry staples bought the same day.
+
+    The result is absolute, so the ranking does not change as time passes
+    and can be stored and indexed.
+    """
+    category = ItemCategory(category)
+    expiration_date, purchase_date, opened_date = _utc(expiration_date), _utc(purchase_date), _utc(opened_date)
+
+    if expiration_date is None:
+        expiration_date = (purchase_date or datetime.now(timezone.utc)) + timedelta(days=SHELF_LIFE_DAYS[category])
+    if opened_date is not None:
+        return min(expiration_date, opened_date + timedelta(days=OPENED_SHELF_LIFE_DAYS[category]))
+    return expiration_date
+
+
+def days_left(eat_by: Optional[datetime], now: Optional[datetime] = None) -> Optional[int]:
+    """Whole days until `eat_by`; negative once it has passed."""
+    if eat_by is None:
+        return None
+    return (_utc(eat_by) - _utc(now or datetime.now(timezone.utc))).days
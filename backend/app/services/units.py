@@ -0,0 +1,151 @@
+from typing import NamedTuple, Optional, Sequence
+import numpy as np
+from app.models.inventory import UnitType
+
+
+class IncompatibleUnitsError(ValueError):
+    """Raised when converting between units that cannot be related."""
+
+
+class UnitProfile(NamedTuple):
+    """Per-product facts that relate dimensions (from Product)."""
+    density: Optional[float] = None  # Grams per milliliter
+    each_weight: Optional[float] = None  # Grams per item
+
+
+MASS, VOLUME, COUNT, SERVING = 0, 1, 2, 3
+
+# Canonical base unit per dimension: grams, milliliters, items, servings
+BASE_UNITS = {MASS: UnitType.G, VOLUME: UnitType.ML, COUNT: UnitType.ITEM, SERVING: UnitType.SERVING}
+
+# (dimension, factor to the base unit of that dimension)
+UNIT_FACTORS = {
+    UnitType.G: (MASS, 1.0),
+    UnitType.KG: (MASS, 1000.0),
+    UnitType.OZ: (MASS, 28.349523125),
+    UnitType.LB: (MASS, 453.59237),
+    UnitType.ML: (VOLUME, 1.0),
+    UnitType.L: (VOLUME, 1000.0),
+    UnitType.FL_OZ: (VOLUME, 29.5735295625),
+    UnitType.CUP: (VOLUME, 236.5882365),
+    UnitType.ITEM: (COUNT, 1.0),
+    UnitType.SERVING: (SERVING, 1.0),
+}
+
+# Lookup arrays indexed by unit code, for convert_many
+_UNITS = list(UnitType)
+_CODES = {unit: code for code, unit in enumerate(_UNITS)}
+_CODES.update({unit.value: code for unit, code in list(_CODES.items())})
+_DIMENSIONS = np.array([UNIT_FACTORS[unit][0] for unit in _UNITS])
+_FACTORS = np.array([UNIT_FACTORS[unit][1] for unit in _UNITS])
+
+
+def profile_for(product) -> UnitProfile:
+    """UnitProfile from a Product, or an empty one."""
+    if product is None:
+        return UnitProfile()
+    return UnitProfile(product.density_g_per_ml, product.each_weight_g)
+
+
+def _grams_per_base(dimension: int, profile: UnitProfile) -> Optional[float]:
+    """Grams in one base unit of `dimension`, if the profile relates it to mass."""
+    if dimension == MASS:
+        return 1.0
+    if dimension == VOLUME:
+        return profile.density
+    if dimension == COUNT:
+        return profile.each_weight
+    return None
+
+
+def can_convert(from_unit: UnitType, to_unit: UnitType, profile: UnitProfile = UnitProfile()) -> bool:
+    """Whether a quantity can be converted between two units."""
+    from_dimension = UNIT_FACTORS[UnitType(from_unit)][0]
+    to_dimension = UNIT_FACTORS[UnitType(to_unit)][0]
+    return from_dimension == to_dimension or (
+        _grams_per_base(from_dimension, profile) is not None
+        and _grams_per_base(to_dimension, profile) is not None
+    )
+
+
+def convert(
+    quantity: float,
+    from_unit: UnitType,
+    to_unit: UnitType,
+    profile: UnitProfile = UnitProfile()
+) -> float:
+    """
+    Convert a quantity between units.
+
+    Units of the same dimension always convert. Volume and count convert
+    to and from mass through the product's density and each-weight.
+
+    Raises:
+        IncompatibleUnitsError: if the units cannot be related
+    """
+    from_unit, to_unit = UnitType(from_unit), UnitType(to_unit)
+    from_dimension, from_factor = UNIT_FACTORS[from_unit]
+    to_dimension, to_factor = UNIT_FACTORS[to_unit]
+
+    if from_dimension == to_dimension:
+        return quantity if from_factor == to_factor else quantity * from_factor / to_factor
+
+    from_grams = _grams_per_base(from_dimension, profile)
+    to_grams = _grams_per_base(to_dimension, profile)
+    if from_grams is None or to_grams is None:
+        raise IncompatibleUnitsError(f"Cannot convert {from_unit.value} to {to_unit.value}")
+    return quantity * from_factor * from_grams / (to_grams * to_factor)
+
+
+def unit_codes(units: Sequence) -> np.ndarray:
+    """Integer codes for UnitType members or values, for convert_many."""
+    units = np.asarray(units, dtype=object)
+    unique, inverse = np.unique(units, return_inverse=True)
+    return np.array([_CODES[unit] for unit in unique], dtype=np.intp)[inverse]
+
+
+def convert_many(
+    quantities,
+    from_units,
+    to_unit: UnitType,
+    densities=None,
+    each_weights=None
+) -> np.ndarray:
+    """
+    Convert arrays of quantities to one unit in a single vectorized pass.
+
+    Args:
+        quantities: Quantities, one per row
+        from_units: Unit per row, as UnitType members/values or unit_codes()
+        to_unit: Target unit
+        densities: Optional grams per milliliter per row (NaN if unknown)
+        each_weights: Optional grams per item per row (NaN if unknown)
+
+    Returns:
+        Float array in `to_unit`; NaN where a row cannot be converted
+    """
+    quantities = np.asarray(quantities, dtype=float)
+    if isinstance(from_units, np.ndarray) and from_units.dtype.kind in "iu":
+        codes = from_units
+    else:
+        codes = unit_codes(from_units)
+
+    n = quantities.shape[0]
+    densities = np.full(n, np.nan) if densities is None else np.asarray(densities, dtype=float)
+    each_weights = np.full(n, np.nan) if each_weights is None else np.asarray(each_weights, dtype=float)
+
+    to_dimension, to_factor = UNIT_FACTORS[UnitType(to_unit)]
+    dimensions = _DIMENSIONS[codes]
+    base = quantities * _FACTORS[codes]
+
+    # Grams per base unit of each row's dimension, and of the target dimension
+    grams_per_base = np.select(
+        [dimensions == MASS, dimensions == VOLUME, dimensions == COUNT],
+        [1.0, densities, each_weights],
+        default=np.nan
+    )
+    target_grams = {MASS: np.ones(n), VOLUME: densities, COUNT: each_weights}.get(to_dimension, np.full(n, np.nan))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cross = base * grams_per_base / target_grams
+    return np.where(dimensions == to_dimension, base, cross) / to_factor
@@ -0,0 +1,41 @@
+"""
+Benchmark the bulk inventory insert (POST /inventory/bulk) at 10, 100 and
+1000 items: wall time and SQL statements per request.
+
+Writes to the database in DATABASE_URL, so point it at a scratch database.
+From backend/:
+
+    python -m scripts.bench_bulk_insert [runs]
+"""
+import statistics
+import sys
+from app.api.endpoints.inventory import bulk_add_inventory
+from app.schemas.inventory import BulkInventoryAdd
+from scripts.bench_common import bench_session, bench_user, measure
+
+SIZES = (10, 100, 1000)
+
+
+def _payload(size: int) -> BulkInventoryAdd:
+    return BulkInventoryAdd(items=[
+        {"name": f"Item {i}", "category": "produce", "quantity": 2, "unit": "item", "price": 1.5}
+        for i in range(size)
+    ])
+
+
+def run(runs: int = 5):
+    db = bench_session()
+    try:
+        user = bench_user(db)
+        print(f"{'items':>6} {'median ms':>10} {'ms/item':>8} {'statements':>10}")
+        for size in SIZES:
+            payload = _payload(size)
+            timings = [measure(lambda: bulk_add_inventory(payload, db=db, current_user=user)) for _ in range(runs)]
+            median = statistics.median(ms for ms, _ in timings)
+            print(f"{size:>6} {median:>10.1f} {median / size:>8.3f} {timings[-1][1]:>10}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,41 @@
+"""Shared setup for the benchmark scripts in this directory."""
+import time
+import uuid
+from typing import Callable, Tuple
+from app.db.session import Base, SessionLocal, engine
+from app.db.query_stats import start_request_stats, stop_request_stats
+from app.db import change_log, unit_of_work, eat_first, rollups, cache_invalidation  # noqa: F401  Register session/mapper event listeners
+from app.models.user import Household, User
+
+
+def bench_session():
+    """A session on DATABASE_URL, with the tables created if they are missing."""
+    Base.metadata.create_all(engine)
+    return SessionLocal()
+
+
+def bench_user(db, name: str = "Benchmark") -> User:
+    """A user in a new household of their own, so runs do not see each other's rows."""
+    household = Household(name=name)
+    db.add(household)
+    db.flush()
+    user = User(
+        email=f"bench-{uuid.uuid4().hex}@example.com",
+        username=f"bench-{uuid.uuid4().hex}",
+        hashed_password="not-used",
+        household_id=household.id
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def measure(func: Callable) -> Tuple[float, int]:
+    """Run `func` once; return (milliseconds, SQL statements executed)."""
+    stats = start_request_stats()
+    try:
+        start = time.perf_counter()
+        func()
+        return (time.perf_counter() - start) * 1000, stats.count
+    finally:
+        stop_request_stats()
@@ -0,0 +1,65 @@
+"""
+Benchmark the waste statistics (GET /analytics/waste-stats) for a household
+with 50,000 wasted items: wall time and SQL statements per request, with
+the response cache bypassed.
+
+Writes to the database in DATABASE_URL, so point it at a scratch database.
+From backend/:
+
+    python -m scripts.bench_waste_stats [items] [runs]
+"""
+import statistics
+import sys
+from datetime import datetime, timedelta
+from app.api.endpoints.analytics import get_waste_statistics
+from app.db.bulk import insert_inventory_items
+from scripts.bench_common import bench_session, bench_user, measure
+
+CATEGORIES = ("produce", "dairy", "meat", "bakery", "frozen")
+REASONS = ("expired", "spoiled", "forgot", None)
+CHUNK_SIZE = 5000
+
+
+def _seed(db, user, count: int):
+    """Insert `count` wasted items spread over the last 30 days, with their rollups."""
+    now = datetime.utcnow()
+    for start in range(0, count, CHUNK_SIZE):
+        insert_inventory_items(db, [
+            {
+                "name": f"Item {i % 500}",
+                "category": CATEGORIES[i % len(CATEGORIES)],
+                "quantity": 1,
+                "original_quantity": 1,
+                "unit": "item",
+                "price": 2.0,
+                "is_wasted": True,
+                "waste_reason": REASONS[i % len(REASONS)],
+                "wasted_date": now - timedelta(days=i % 30),
+                "purchase_date": now - timedelta(days=i % 30 + 7),
+                "household_id": user.household_id,
+                "added_by": user.id,
+            }
+            for i in range(start, min(start + CHUNK_SIZE, count))
+        ])
+        db.commit()
+
+
+def run(count: int = 50000, runs: int = 5):
+    db = bench_session()
+    try:
+        user = bench_user(db)
+        _seed(db, user, count)
+
+        # The undecorated endpoint, so every run hits the database
+        waste_stats = get_waste_statistics.__wrapped__
+        timings = [measure(lambda: waste_stats(days=30, db=db, current_user=user)) for _ in range(runs)]
+        result = waste_stats(days=30, db=db, current_user=user)
+        print(f"{count} wasted items: {result['total_wasted_items']} in the last 30 days")
+        print(f"median {statistics.median(ms for ms, _ in timings):.1f} ms, {timings[-1][1]} statements")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
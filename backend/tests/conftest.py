@@ -0,0 +1,65 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read at import time, so the test environment comes first.
+# Point DATABASE_URL at a scratch PostgreSQL database to test row locking there.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'freshly_test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("MINDEE_API_KEY", "test")  # The OCR service needs some provider to start
+os.environ.setdefault("REDIS_URL", "")
+os.environ.setdefault("DB_QUERY_STRICT", "true")
+os.environ.setdefault("DEBUG", "true")  # Statement counts are only sent in debug mode
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.security import create_access_token
+from app.db.session import Base, SessionLocal, engine
+from app.models.user import Household, User
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    """A user in a fresh household of their own."""
+    household = Household(name="Test household")
+    db.add(household)
+    db.flush()
+
+    name = uuid.uuid4().hex
+    user = User(
+        email=f"{name}@example.com",
+        username=name,
+        hashed_password="not-used",
+        household_id=household.id
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    token = create_access_token(data={"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta, timezone
+from app.models.inventory import InventoryItem
+
+
+def test_spending_totals_match_the_timeline(client, auth_headers, user, db):
+    now = datetime.now(timezone.utc)
+    for days_ago, price in ((30.01, 4.0), (29.99, 2.5), (0, 1.5)):
+        db.add(InventoryItem(
+            name="Bread", category="bakery", quantity=1, unit="item", price=price,
+            purchase_date=now - timedelta(days=days_ago), household_id=user.household_id
+        ))
+    db.commit()
+
+    response = client.get("/api/v1/analytics/spending?days=30&tz=Pacific/Auckland", headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_spent"] == 4.0
+    assert sum(point["total"] for point in body["spending_timeline"]) == 4.0
+    assert body["spending_by_category"] == [{"category": "bakery", "total": 4.0, "count": 2}]
@@ -0,0 +1,76 @@
+import pytest
+import redis
+from app.core import cache
+from app.core.config import settings
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for RedisCache; fails while `down` is set."""
+
+    def __init__(self):
+        self.down = True
+        self.generations = {}
+        self.values = {}
+
+    def _check(self):
+        if self.down:
+            raise redis.ConnectionError("connection refused")
+
+    def ping(self):
+        self._check()
+
+    def register_script(self, source):
+        def fetch(keys, args):
+            self._check()
+            generation = self.generations.get(keys[0], 0)
+            return str(generation).encode(), self.values.get(f"{args[0]}{generation}")
+        return fetch
+
+    def incr(self, key):
+        self._check()
+        self.generations[key] = self.generations.get(key, 0) + 1
+
+    def set(self, key, value, ex):
+        self._check()
+        self.values[key] = value.encode()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://cache.invalid:6379/0")
+    monkeypatch.setattr(settings, "CACHE_RETRY_SECONDS", 0.0)
+    for name, value in (("_cache", None), ("_fallback", None), ("_retry_at", 0.0), ("_retry_delay", 0.0)):
+        monkeypatch.setattr(cache, name, value)
+    monkeypatch.setattr(cache, "_pending_bumps", set())
+    return fake
+
+
+def test_redis_is_retried_and_missed_invalidations_are_applied(fake_redis):
+    assert cache.get_cache().name == "memory"
+
+    fake_redis.down = False
+    fake_redis.values["cache:1:stats:0"] = b"1"  # Cached by another process before the outage
+    fake_redis.down = True
+    cache.bump_generation(1)
+
+    fake_redis.down = False
+    assert cache.get_cache().name == "redis"
+    assert cache.cached_value(1, "stats", lambda: 2) == 2
+
+
+def test_redis_error_falls_back_until_the_next_retry(fake_redis, monkeypatch):
+    fake_redis.down = False
+    assert cache.get_cache().name == "redis"
+
+    fake_redis.down = True
+    assert cache.cached_value(1, "stats", lambda: 1) == 1
+    monkeypatch.setattr(cache, "_retry_at", float("inf"))
+    assert cache.get_cache().name == "memory"
+
+
+def test_fallback_entries_expire_quickly():
+    memory = cache.MemoryCache(max_entries=10, max_ttl=30)
+    memory.store("key0", "1", ttl=3600)
+    assert memory._entries["key0"][0] <= cache.time.monotonic() + 30
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.core.config import settings
+from app.db.archive import archive_inventory
+from app.jobs import export_parquet
+from app.models.inventory import InventoryItem
+from app.services.columnar import read_table
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ANALYTICS_EXPORT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _exported(user):
+    rows = read_table("inventory_items", household_id=user.household_id, columns=["name", "is_archived"])
+    return sorted((row["name"], row["is_archived"]) for row in rows.to_pylist())
+
+
+def test_deleted_and_archived_items_reach_the_export(export_dir, user, db):
+    # Well in the past: SQLite timestamps have whole seconds, so versions written now would tie
+    created_at = datetime.now(timezone.utc) - timedelta(days=500)
+    items = [
+        InventoryItem(
+            name=name, category="produce", quantity=1, unit="item", household_id=user.household_id, created_at=created_at
+        )
+        for name in ("Apple", "Kale", "Pear")
+    ]
+    db.add_all(items)
+    db.commit()
+    export_parquet.run()
+
+    apple, kale, _ = items
+    db.delete(apple)
+    kale.is_wasted = True
+    kale.wasted_date = kale.updated_at = datetime.now(timezone.utc) - timedelta(days=400)
+    db.commit()
+    archive_inventory(db, cutoff=datetime.now(timezone.utc) - timedelta(days=365))
+    export_parquet.run()
+    assert _exported(user) == [("Kale", True), ("Pear", False)]
+
+    export_parquet.run(full=True)
+    assert _exported(user) == [("Kale", True), ("Pear", False)]
@@ -0,0 +1,41 @@
+import os
+import pytest
+from app.core.config import settings
+from app.jobs import import_inventory
+from app.models.import_job import ImportJob
+from app.models.inventory import InventoryItem
+
+
+@pytest.fixture
+def job(user, db, tmp_path):
+    path = tmp_path / "items.csv"
+    path.write_text("name,category,quantity,unit\n" + "".join(f"Item {i},produce,1,item\n" for i in range(7)))
+    job = ImportJob(user_id=user.id, household_id=user.household_id, filename="items.csv", file_path=str(path))
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_failed_import_resumes_after_committed_rows(job, user, db, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 3)
+    insert = import_inventory.insert_inventory_items
+    calls = []
+
+    def fail_on_second_chunk(session, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return insert(session, rows)
+
+    monkeypatch.setattr(import_inventory, "insert_inventory_items", fail_on_second_chunk)
+    import_inventory.run(job.id)
+    db.expire_all()
+    assert (job.status, job.rows_processed, job.rows_imported) == ("failed", 3, 3)
+    assert os.path.exists(job.file_path)
+
+    import_inventory.run(job.id)
+    db.expire_all()
+    assert (job.status, job.rows_processed, job.rows_imported) == ("completed", 7, 7)
+    assert not os.path.exists(job.file_path)
+    names = [name for name, in db.query(InventoryItem.name).filter(InventoryItem.household_id == user.household_id)]
+    assert sorted(names) == [f"Item {i}" for i in range(7)]
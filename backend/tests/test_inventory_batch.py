@@ -0,0 +1,70 @@
+from app.models.inventory import InventoryItem
+
+BATCH_SIZE = 30
+
+
+def _create_items(client, auth_headers, count: int):
+    response = client.post(
+        "/api/v1/inventory/bulk",
+        json={"items": [
+            {"name": f"Item {i}", "category": "produce", "quantity": 3, "unit": "item", "price": 1}
+            for i in range(count)
+        ]},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return [item["id"] for item in response.json()]
+
+
+def _batch(client, auth_headers, operations):
+    response = client.post("/api/v1/inventory/batch", json={"operations": operations}, headers=auth_headers)
+    assert response.status_code == 200
+    return response
+
+
+def _statement_count(response) -> int:
+    return int(response.headers["X-DB-Query-Count"])
+
+
+def test_batch_statement_count_does_not_grow(client, auth_headers):
+    # The suite runs with DB_QUERY_STRICT, so a statement per item raises NPlusOneError
+    small = _create_items(client, auth_headers, 5)
+    large = _create_items(client, auth_headers, BATCH_SIZE)
+
+    for op in (
+        lambda i: {"op": "use", "item_id": i, "quantity_used": 1},
+        lambda i: {"op": "waste", "item_id": i, "waste_reason": "spoiled"},
+    ):
+        few = _batch(client, auth_headers, [op(i) for i in small])
+        many = _batch(client, auth_headers, [op(i) for i in large])
+        assert _statement_count(many) == _statement_count(few)
+        assert all(result["status_code"] == 200 for result in many.json()["results"])
+
+
+def test_mixed_batch(client, auth_headers, db):
+    ids = _create_items(client, auth_headers, BATCH_SIZE)
+    kinds = [
+        lambda i: {"op": "use", "item_id": i, "quantity_used": 3},
+        lambda i: {"op": "waste", "item_id": i, "waste_reason": "spoiled"},
+        lambda i: {"op": "move", "item_id": i, "location_id": None},
+        lambda i: {"op": "update", "item_id": i, "changes": {"notes": "checked"}},
+        lambda i: {"op": "use", "item_id": i, "quantity_used": 1},
+        lambda i: {"op": "delete", "item_id": i},
+    ]
+    operations = [kinds[n % len(kinds)](i) for n, i in enumerate(ids)]
+    # Later operations on an item see the earlier ones
+    operations += [
+        {"op": "use", "item_id": ids[4], "quantity_used": 1},
+        {"op": "waste", "item_id": ids[4], "waste_reason": "late"},
+        {"op": "use", "item_id": ids[4], "quantity_used": 1},
+    ]
+
+    results = _batch(client, auth_headers, operations).json()["results"]
+
+    assert [result["status_code"] for result in results[-3:]] == [200, 200, 400]
+    items = {item.id: item for item in db.query(InventoryItem).filter(InventoryItem.id.in_(ids))}
+    assert items[ids[0]].is_consumed and items[ids[0]].quantity == 0
+    assert items[ids[1]].is_wasted
+    assert items[ids[3]].notes == "checked"
+    assert items[ids[4]].quantity == 1 and items[ids[4]].waste_reason == "late"
+    assert ids[5] not in items
@@ -0,0 +1,19 @@
+def test_search_results_are_paged_by_rank(client, auth_headers):
+    for name in ("Milk", "Oat milk", "Milkshake", "Buttermilk", "Milk chocolate", "Bread"):
+        response = client.post(
+            "/api/v1/inventory/",
+            json={"name": name, "category": "dairy", "quantity": 1, "unit": "item"},
+            headers=auth_headers
+        )
+        assert response.status_code == 201
+
+    pages, cursor = [], None
+    while True:
+        params = {"search": "milk", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/v1/inventory/", params=params, headers=auth_headers).json()
+        pages.append([item["name"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert pages == [["Milk", "Milkshake"], ["Milk chocolate", "Oat milk"], ["Buttermilk"]]
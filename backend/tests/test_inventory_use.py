@@ -0,0 +1,107 @@
+import asyncio
+import httpx
+from sqlalchemy import func
+from app.main import app
+from app.models.consumption import ConsumptionEvent
+from app.models.inventory import InventoryItem
+
+
+def _create_item(client, auth_headers, quantity: float) -> int:
+    response = client.post(
+        "/api/v1/inventory/",
+        json={"name": "Milk", "category": "dairy", "quantity": quantity, "unit": "L"},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def _use_concurrently(item_id: int, auth_headers, amounts):
+    """Send one /use request per amount, all in flight at once."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(
+            client.post(
+                f"/api/v1/inventory/{item_id}/use",
+                json={"item_id": item_id, "quantity_used": amount},
+                headers=auth_headers
+            )
+            for amount in amounts
+        ))
+
+
+def test_concurrent_use_never_overdraws(client, auth_headers, db):
+    item_id = _create_item(client, auth_headers, 10)
+    amounts = [1.0, 2.0, 3.0] * 8
+
+    responses = asyncio.run(_use_concurrently(item_id, auth_headers, amounts))
+
+    statuses = [response.status_code for response in responses]
+    assert set(statuses) <= {200, 400}
+    used = sum(amount for amount, status in zip(amounts, statuses) if status == 200)
+
+    item = db.get(InventoryItem, item_id)
+    assert item.quantity >= 0
+    assert used == 10 - item.quantity
+    assert item.is_consumed == (item.quantity == 0)
+
+    logged = db.query(func.sum(ConsumptionEvent.quantity)).filter(ConsumptionEvent.item_id == item_id).scalar()
+    assert logged == used
+
+
+def test_concurrent_use_to_zero(client, auth_headers, db):
+    item_id = _create_item(client, auth_headers, 5)
+
+    responses = asyncio.run(_use_concurrently(item_id, auth_headers, [1.0] * 12))
+
+    statuses = [response.status_code for response in responses]
+    assert statuses.count(200) == 5
+    assert statuses.count(400) == 7
+
+    item = db.get(InventoryItem, item_id)
+    assert item.quantity == 0
+    assert item.is_consumed
+
+
+def test_use_rejects_non_positive_quantity(client, auth_headers, db):
+    item_id = _create_item(client, auth_headers, 2)
+
+    for amount in (0, -5):
+        response = client.post(
+            f"/api/v1/inventory/{item_id}/use",
+            json={"item_id": item_id, "quantity_used": amount},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
+
+    batch = client.post(
+        "/api/v1/inventory/batch",
+        json={"operations": [{"op": "use", "item_id": item_id, "quantity_used": -5}]},
+        headers=auth_headers
+    )
+    assert batch.status_code == 422
+
+    assert db.get(InventoryItem, item_id).quantity == 2
+    assert db.query(ConsumptionEvent).filter(ConsumptionEvent.item_id == item_id).count() == 0
+
+
+def test_use_skips_wasted_items(client, auth_headers, db):
+    item_id = _create_item(client, auth_headers, 2)
+    response = client.post(
+        f"/api/v1/inventory/{item_id}/waste",
+        json={"item_id": item_id, "waste_reason": "spoiled"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = client.post(
+        f"/api/v1/inventory/{item_id}/use",
+        json={"item_id": item_id, "quantity_used": 1},
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+
+    item = db.get(InventoryItem, item_id)
+    assert item.quantity == 2
+    assert not item.is_consumed
+    assert db.query(ConsumptionEvent).filter(ConsumptionEvent.item_id == item_id).count() == 0
@@ -0,0 +1,52 @@
+from app.db.progress import get_progress, rebuild_progress, replay_progress
+from app.models.analytics import HouseholdProgress
+
+
+def _add(client, auth_headers, name: str) -> int:
+    response = client.post(
+        "/api/v1/inventory/",
+        json={"name": name, "category": "produce", "quantity": 1, "unit": "item"},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _row(db, user) -> HouseholdProgress:
+    db.expire_all()
+    return db.get(HouseholdProgress, user.household_id)
+
+
+def test_in_order_writes_update_counters_without_replay(client, auth_headers, user, db):
+    _add(client, auth_headers, "Apple")
+    rebuild_progress(db, user.household_id)  # Stores the first_item badge
+    assert not _row(db, user).needs_replay
+
+    for name in ("Pear", "Plum"):
+        _add(client, auth_headers, name)
+    row = _row(db, user)
+    assert (row.items_added, row.needs_replay) == (3, False)
+    assert get_progress(db, user.household_id) == replay_progress(db, user.household_id, row.badges)
+
+
+def test_waste_is_applied_in_order_and_undo_is_replayed(client, auth_headers, user, db):
+    item_id = _add(client, auth_headers, "Milk")
+    response = client.post(
+        f"/api/v1/inventory/{item_id}/waste",
+        json={"item_id": item_id, "waste_reason": "spoiled"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    row = _row(db, user)
+    assert (row.items_wasted, row.needs_replay) == (1, False)
+    assert row.last_waste_day is not None
+
+    # Undo reverses the waste, which cannot be applied incrementally
+    assert client.post("/api/v1/actions/undo", headers=auth_headers).status_code == 200
+    assert _row(db, user).needs_replay
+    assert get_progress(db, user.household_id)["last_waste_day"] is None
+
+    assert rebuild_progress(db, stale_only=True)
+    row = _row(db, user)
+    assert (row.items_wasted, row.last_waste_day, row.needs_replay) == (0, None, False)
+
@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.query_stats import NPlusOneError, start_request_stats, stop_request_stats
+
+
+@pytest.fixture
+def stats():
+    stats = start_request_stats()
+    yield stats
+    stop_request_stats()
+
+
+def test_repeated_statement_raises_in_strict_mode(db, stats):
+    for _ in range(settings.DB_NPLUSONE_THRESHOLD):
+        db.execute(text("SELECT 1"))
+
+    with pytest.raises(NPlusOneError):
+        db.execute(text("SELECT 1"))
+    assert stats.statements["SELECT 1"] == settings.DB_NPLUSONE_THRESHOLD + 1
+
+
+def test_stats_headers_only_in_debug_mode(client, monkeypatch):
+    assert "X-DB-Query-Count" in client.get("/health").headers
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    response = client.get("/health")
+    assert "X-DB-Query-Count" not in response.headers
+    assert "Server-Timing" not in response.headers
@@ -0,0 +1,92 @@
+import threading
+from app.db.session import SessionLocal
+from app.models.inventory import InventoryItem
+
+PUSH_SIZE = 30
+
+
+def _push(client, auth_headers, mutations):
+    response = client.post("/api/v1/sync/", json={"mutations": mutations}, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _create(client_id: str, name: str) -> dict:
+    return {
+        "client_id": client_id,
+        "op": "create",
+        "create": {"name": name, "category": "produce", "quantity": 2, "unit": "item"}
+    }
+
+
+def test_replayed_push_is_not_applied_twice(client, auth_headers, user, db):
+    mutations = [_create(f"create-{i}", f"Item {i}") for i in range(3)]
+    first = _push(client, auth_headers, mutations)
+    # A retry, e.g. after the first response was lost, carrying one new mutation
+    second = _push(client, auth_headers, mutations + [_create("create-new", "New item")])
+
+    assert [r["entity_id"] for r in second["results"][:3]] == [r["entity_id"] for r in first["results"]]
+    assert all(r["status"] == "applied" for r in second["results"])
+    assert db.query(InventoryItem).filter(InventoryItem.household_id == user.household_id).count() == 4
+
+    item_id = first["results"][0]["entity_id"]
+    update = {
+        "client_id": "update-1", "op": "update", "entity_id": item_id,
+        "base_version": second["version"], "changes": {"notes": "opened"}
+    }
+    _push(client, auth_headers, [update])
+    # Replaying an applied update is not reported as a conflict with itself
+    replay = _push(client, auth_headers, [update])
+    assert replay["results"][0]["status"] == "applied"
+    assert replay["results"][0]["item"]["notes"] == "opened"
+
+
+def test_push_statement_count_does_not_grow(client, auth_headers):
+    # The suite runs with DB_QUERY_STRICT, so a statement per mutation raises NPlusOneError
+    created = _push(client, auth_headers, [_create(f"c-{i}", f"Item {i}") for i in range(PUSH_SIZE)])
+    version = created["version"]
+    ids = [r["entity_id"] for r in created["results"]]
+
+    result = _push(client, auth_headers, [
+        {"client_id": f"u-{i}", "op": "update", "entity_id": item_id, "base_version": version,
+         "changes": {"quantity": i + 1}}
+        if i % 2 else
+        {"client_id": f"d-{i}", "op": "delete", "entity_id": item_id, "base_version": version}
+        for i, item_id in enumerate(ids)
+    ])
+    assert all(r["status"] == "applied" for r in result["results"])
+
+
+
+def test_pull_does_not_skip_a_transaction_that_commits_late(client, auth_headers, user):
+    def pull(since: int):
+        response = client.get("/api/v1/sync/", params={"since": since}, headers=auth_headers)
+        assert response.status_code == 200
+        body = response.json()
+        return body["version"], {item["name"] for item in body["inventory_items"]}
+
+    def add(session, name: str):
+        session.add(InventoryItem(name=name, category="produce", quantity=1, unit="item", household_id=user.household_id))
+        session.flush()
+
+    def second_writer():
+        second = SessionLocal()
+        add(second, "Second")
+        second.commit()
+        second.close()
+
+    start, _ = pull(0)
+    first = SessionLocal()
+    add(first, "First")  # Takes its sync version and stays open
+
+    writer = threading.Thread(target=second_writer)
+    writer.start()
+    writer.join(0.5)  # On PostgreSQL, autoincrement cursors let the second writer commit first here
+    cursor, seen = pull(start)
+
+    first.commit()
+    first.close()
+    writer.join()
+
+    _, seen_later = pull(cursor)
+    assert seen | seen_later == {"First", "Second"}
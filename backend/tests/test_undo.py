@@ -0,0 +1,44 @@
+import uuid
+import pytest
+from app.core.security import create_access_token
+from app.models.user import User
+
+
+@pytest.fixture
+def housemate_headers(user, db):
+    """Auth headers of a second member of the user's household."""
+    name = uuid.uuid4().hex
+    housemate = User(email=f"{name}@example.com", username=name, hashed_password="not-used", household_id=user.household_id)
+    db.add(housemate)
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': str(housemate.id)})}"}
+
+
+def _add(client, headers) -> int:
+    response = client.post(
+        "/api/v1/inventory/",
+        json={"name": "Rice", "category": "dry_goods", "quantity": 5, "unit": "kg"},
+        headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_undo_add_conflicts_with_a_housemates_use(client, auth_headers, housemate_headers):
+    item_id = _add(client, auth_headers)
+    response = client.post(
+        f"/api/v1/inventory/{item_id}/use", json={"item_id": item_id, "quantity_used": 2}, headers=housemate_headers
+    )
+    assert response.status_code == 200
+
+    assert client.post("/api/v1/actions/undo", headers=auth_headers).status_code == 409
+    assert client.get(f"/api/v1/inventory/{item_id}", headers=auth_headers).json()["quantity"] == 3
+
+
+def test_undo_add_after_undoing_own_edit(client, auth_headers):
+    item_id = _add(client, auth_headers)
+    assert client.patch(f"/api/v1/inventory/{item_id}", json={"notes": "top shelf"}, headers=auth_headers).status_code == 200
+
+    assert client.post("/api/v1/actions/undo", headers=auth_headers).status_code == 200
+    assert client.post("/api/v1/actions/undo", headers=auth_headers).status_code == 200
+    assert client.get(f"/api/v1/inventory/{item_id}", headers=auth_headers).status_code == 404
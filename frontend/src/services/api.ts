@@ -6,11 +6,21 @@ import type {
   User,
   InventoryItem,
   InventoryItemCreate,
+  InventoryBatchOperation,
+  InventoryBatchResult,
+  ConsumeProduct,
+  ConsumedLot,
+  EatFirstItem,
+  ImportJob,
   Receipt,
+  Page,
   MealSuggestion,
   ShoppingList,
   WasteStats,
-  SpendingStats
+  SpendingStats,
+  HouseholdProgress,
+  ImpactStats,
+  UserAction
 } from '@/types'
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
@@ -66,6 +76,23 @@ api.interceptors.response.use(
   }
 )
 
+// Largest page the list endpoints serve (MAX_PAGE_SIZE on the backend)
+const MAX_PAGE_SIZE = 200
+
+// Fetch every page of a cursor-paginated list endpoint by following next_cursor
+const getAllPages = async <T>(url: string, params: Record<string, unknown> = {}): Promise<T[]> => {
+  const items: T[] = []
+  let cursor: string | null | undefined = undefined
+  do {
+    const response: { data: Page<T> } = await api.get<Page<T>>(url, {
+      params: { limit: MAX_PAGE_SIZE, ...params, cursor }
+    })
+    items.push(...response.data.items)
+    cursor = response.data.next_cursor
+  } while (cursor)
+  return items
+}
+
 // Auth endpoints
 export const authAPI = {
   login: async (credentials: LoginCredentials): Promise<AuthTokens> => {
@@ -98,7 +125,17 @@ export const inventoryAPI = {
     expiring_soon?: boolean
     search?: string
   }): Promise<InventoryItem[]> => {
-    const response = await api.get<InventoryItem[]>('/inventory', { params })
+    return getAllPages<InventoryItem>('/inventory', params)
+  },
+
+  getPage: async (params?: {
+    location_id?: number
+    category?: string
+    search?: string
+    cursor?: string
+    limit?: number
+  }): Promise<Page<InventoryItem>> => {
+    const response = await api.get<Page<InventoryItem>>('/inventory', { params })
     return response.data
   },
 
@@ -140,14 +177,45 @@ export const inventoryAPI = {
   bulkAdd: async (items: InventoryItemCreate[]): Promise<InventoryItem[]> => {
     const response = await api.post<InventoryItem[]>('/inventory/bulk', { items })
     return response.data
+  },
+
+  batch: async (operations: InventoryBatchOperation[]): Promise<InventoryBatchResult[]> => {
+    const response = await api.post<{ results: InventoryBatchResult[] }>('/inventory/batch', { operations })
+    return response.data.results
+  },
+
+  getEatFirst: async (limit: number = 10): Promise<EatFirstItem[]> => {
+    const response = await api.get<EatFirstItem[]>('/inventory/eat-first', {
+      params: { limit }
+    })
+    return response.data
+  },
+
+  consume: async (consumption: ConsumeProduct): Promise<ConsumedLot[]> => {
+    const response = await api.post<{ lots: ConsumedLot[] }>('/inventory/consume', consumption)
+    return response.data.lots
+  },
+
+  importCsv: async (file: File): Promise<ImportJob> => {
+    const formData = new FormData()
+    formData.append('file', file)
+
+    const response = await api.post<ImportJob>('/inventory/import', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' }
+    })
+    return response.data
+  },
+
+  getImport: async (jobId: number): Promise<ImportJob> => {
+    const response = await api.get<ImportJob>(`/inventory/import/${jobId}`)
+    return response.data
   }
 }
 
 // Receipt endpoints
 export const receiptAPI = {
   getAll: async (): Promise<Receipt[]> => {
-    const response = await api.get<Receipt[]>('/receipts')
-    return response.data
+    return getAllPages<Receipt>('/receipts')
   },
 
   getById: async (id: number): Promise<Receipt> => {
@@ -185,15 +253,11 @@ export const mealAPI = {
   },
 
   getRecipes: async (params?: { search?: string; meal_type?: string }): Promise<any[]> => {
-    const response = await api.get('/meals/recipes', { params })
-    return response.data
+    return getAllPages<any>('/meals/recipes', params)
   },
 
   getMealPlan: async (startDate?: string, endDate?: string): Promise<any[]> => {
-    const response = await api.get('/meals/plan', {
-      params: { start_date: startDate, end_date: endDate }
-    })
-    return response.data
+    return getAllPages<any>('/meals/plan', { start_date: startDate, end_date: endDate })
   },
 
   createMealPlan: async (data: {
@@ -214,10 +278,7 @@ export const mealAPI = {
 // Shopping endpoints
 export const shoppingAPI = {
   getLists: async (status?: string): Promise<ShoppingList[]> => {
-    const response = await api.get<ShoppingList[]>('/shopping/lists', {
-      params: { status }
-    })
-    return response.data
+    return getAllPages<ShoppingList>('/shopping/lists', { status })
   },
 
   createList: async (name: string, store?: string): Promise<ShoppingList> => {
@@ -256,9 +317,18 @@ export const analyticsAPI = {
     return response.data
   },
 
-  getSpendingStats: async (days: number = 30): Promise<SpendingStats> => {
+  getSpendingStats: async (
+    days: number = 30,
+    interval: 'day' | 'week' | 'month' = 'day',
+    byCategory: boolean = false
+  ): Promise<SpendingStats> => {
     const response = await api.get<SpendingStats>('/analytics/spending', {
-      params: { days }
+      params: {
+        days,
+        interval,
+        by_category: byCategory,
+        tz: Intl.DateTimeFormat().resolvedOptions().timeZone
+      }
     })
     return response.data
   },
@@ -266,6 +336,45 @@ export const analyticsAPI = {
   getInventorySummary: async (): Promise<any> => {
     const response = await api.get('/analytics/inventory-summary')
     return response.data
+  },
+
+  getProgress: async (): Promise<HouseholdProgress> => {
+    const response = await api.get<HouseholdProgress>('/analytics/progress')
+    return response.data
+  },
+
+  getImpact: async (start?: string, end?: string): Promise<ImpactStats> => {
+    const response = await api.get<ImpactStats>('/analytics/impact', {
+      params: { start, end }
+    })
+    return response.data
+  }
+}
+
+// Undo/Redo endpoints
+export const actionsAPI = {
+  undo: async (): Promise<UserAction> => {
+    const response = await api.post<UserAction>('/actions/undo')
+    return response.data
+  },
+
+  redo: async (): Promise<UserAction> => {
+    const response = await api.post<UserAction>('/actions/redo')
+    return response.data
+  }
+}
+
+// Export endpoints (streamed downloads)
+export const exportAPI = {
+  download: async (
+    kind: 'inventory' | 'receipts' | 'waste-history',
+    format: 'csv' | 'ndjson' = 'csv'
+  ): Promise<Blob> => {
+    const response = await api.get<Blob>(`/export/${kind}`, {
+      params: { format },
+      responseType: 'blob'
+    })
+    return response.data
   }
 }
 
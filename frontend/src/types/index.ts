@@ -1,3 +1,8 @@
+export interface Page<T> {
+  items: T[]
+  next_cursor?: string | null
+}
+
 export interface User {
   id: number
   email: string
@@ -60,6 +65,9 @@ export interface InventoryItem {
   currency?: string
   is_opened: boolean
   is_wasted: boolean
+  is_consumed: boolean
+  consumed_date?: string
+  eat_by?: string
   waste_reason?: string
   wasted_date?: string
   notes?: string
@@ -86,6 +94,55 @@ export interface InventoryItemCreate {
   store?: string
 }
 
+export interface InventoryBatchOperation {
+  op: 'use' | 'waste' | 'update' | 'move' | 'delete'
+  item_id: number
+  quantity_used?: number
+  waste_reason?: string
+  location_id?: number
+  changes?: Partial<InventoryItemCreate>
+}
+
+export interface InventoryBatchResult {
+  op: InventoryBatchOperation['op']
+  item_id: number
+  status_code: number
+  detail?: string
+  item?: InventoryItem
+}
+
+export interface EatFirstItem extends InventoryItem {
+  days_left?: number
+}
+
+export interface ConsumeProduct {
+  barcode?: string
+  name?: string
+  quantity: number
+  unit: UnitType
+}
+
+export interface ConsumedLot {
+  item_id: number
+  quantity_used: number
+  unit: UnitType
+  remaining_quantity: number
+  depleted: boolean
+}
+
+export interface ImportJob {
+  id: number
+  filename?: string
+  status: 'pending' | 'processing' | 'completed' | 'failed'
+  rows_processed: number
+  rows_imported: number
+  rows_failed: number
+  row_errors?: { row: number; error: string }[]
+  error?: string
+  created_at: string
+  finished_at?: string
+}
+
 export interface Receipt {
   id: number
   uploaded_by_id: number
@@ -190,6 +247,42 @@ export interface WasteStats {
   }>
 }
 
+export interface Badge {
+  code: string
+  name: string
+  description: string
+  target: number
+  progress: number
+  earned_at?: string
+}
+
+export interface HouseholdProgress {
+  current_streak: number
+  longest_streak: number
+  last_waste_day?: string
+  items_added: number
+  items_consumed: number
+  items_wasted: number
+  badges: Badge[]
+}
+
+export interface ImpactTotals {
+  mass_kg: number
+  co2e_kg: number
+  water_l: number
+  value: number
+}
+
+export interface ImpactStats {
+  start: string
+  end: string
+  money_saved: number
+  co2e_saved_kg: number
+  water_saved_l: number
+  consumed: ImpactTotals
+  wasted: ImpactTotals
+}
+
 export interface SpendingStats {
   total_spent: number
   spending_by_category: Array<{
@@ -200,5 +293,15 @@ export interface SpendingStats {
   spending_timeline: Array<{
     date: string
     total: number
+    categories?: Record<string, number>
   }>
 }
+
+export interface UserAction {
+  id: number
+  action_type: string
+  entity_type: string
+  entity_ids: number[]
+  is_undone: boolean
+  created_at: string
+}